@@ -0,0 +1,114 @@
+"""Бенчмарк полезной пропускной способности (goodput) под перегрузкой.
+
+Эндпоинт занимает одно из `--pool` соединений на `--service-ms` мс, как
+запрос к БД через пул SQLAlchemy. Запросы приходят с постоянной частотой
+(открытая модель нагрузки) в `--overload` раз выше пропускной способности
+пула. Клиент ждёт ответ не дольше `--deadline` секунд: ответы позже этого
+не считаются полезными, хотя сервер на них уже потратил ресурсы.
+
+Сравниваются приложение без контроля допуска и с AdmissionMiddleware.
+
+Запуск: python -m benchmarks.admission [--overload 10] [--seconds 3]
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message
+
+from src.core.admission import AdaptiveLimit
+from src.middleware import AdmissionMiddleware
+
+
+def make_app(pool: int, service: float) -> FastAPI:
+    app = FastAPI()
+    connections = asyncio.Semaphore(pool)
+
+    @app.get("/posts/")
+    async def read() -> dict[str, bool]:
+        async with connections:
+            await asyncio.sleep(service)
+        return {"ok": True}
+
+    return app
+
+
+async def call(app: ASGIApp) -> tuple[int, float]:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/posts/",
+        "raw_path": b"/posts/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+    }
+    status_code = 0
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    return status_code, time.perf_counter() - started
+
+
+async def run(app: ASGIApp, rate: float, seconds: float) -> list[tuple[int, float]]:
+    tasks = []
+    started = time.perf_counter()
+    for i in range(int(rate * seconds)):
+        delay = started + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(call(app)))
+    return await asyncio.gather(*tasks)
+
+
+def report(
+    name: str, results: list[tuple[int, float]], seconds: float, deadline: float
+) -> None:
+    good = [latency for status, latency in results if status == 200]
+    in_time = sorted(latency for latency in good if latency <= deadline)
+    shed = sum(1 for status, _ in results if status == 503)
+    p99 = sorted(good)[int(len(good) * 0.99) - 1] if good else 0.0
+    print(
+        f"{name:<10} goodput {len(in_time) / seconds:7.0f} запросов/с, "
+        f"200: {len(good):6}, 503: {shed:6}, p99 200: {p99 * 1000:7.0f} мс"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pool", type=int, default=15)
+    parser.add_argument("--service-ms", type=float, default=20.0)
+    parser.add_argument("--overload", type=float, default=10.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--deadline", type=float, default=1.0)
+    args = parser.parse_args()
+
+    service = args.service_ms / 1000
+    capacity = args.pool / service
+    rate = capacity * args.overload
+    print(f"Пропускная способность {capacity:.0f} запросов/с, нагрузка {rate:.0f}")
+
+    apps = {
+        "off": make_app(args.pool, service),
+        "admission": AdmissionMiddleware(
+            make_app(args.pool, service),
+            {"read": AdaptiveLimit("read", max_limit=4 * args.pool, target=0.25)},
+        ),
+    }
+    for name, app in apps.items():
+        results = await run(app, rate, args.seconds)
+        report(name, results, args.seconds, args.deadline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
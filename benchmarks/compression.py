@@ -0,0 +1,76 @@
+"""Бенчмарк сжатия страниц GET /posts/: CPU против сэкономленных байтов.
+
+Для реалистичной страницы постов (JSON, как отдаёт ModelResponse) измеряет
+время сжатия и размер для gzip разных уровней и brotli (если установлен),
+а также стоимость попадания в кэш сжатых тел.
+
+Запуск: python -m benchmarks.compression [--items 100] [--repeat 50]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.json_response import make_posts
+
+from src.api.posts import POSTS_ADAPTER
+from src.api.responses import ModelResponse
+from src.middleware import CompressionMiddleware, brotli
+
+WORDS = (
+    "пост текст сервер база запрос ответ клиент данные страница кэш "
+    "latency bandwidth python fastapi postgres json"
+).split()
+
+
+def make_page(items: int) -> bytes:
+    rng = random.Random(0)
+    posts = make_posts(items)
+    for post in posts:
+        post.content = " ".join(rng.choice(WORDS) for _ in range(200))
+    return ModelResponse(POSTS_ADAPTER, posts).body
+
+
+def measure(
+    middleware: CompressionMiddleware, body: bytes, encoding: str, repeat: int
+) -> tuple[float, int]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        compressed = middleware.compress(body, encoding)
+    return (time.perf_counter() - started) / repeat * 1000, len(compressed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    body = make_page(args.items)
+    print(f"исходный размер: {len(body)} байт")
+    configs = [("gzip", level, None) for level in (1, 6, 9)]
+    if brotli is not None:
+        configs += [("br", None, quality) for quality in (1, 5, 11)]
+    for encoding, level, quality in configs:
+        middleware = CompressionMiddleware(
+            None, gzip_level=level or 6, brotli_quality=quality or 5
+        )
+        ms, size = measure(middleware, body, encoding, args.repeat)
+        name = f"{encoding}-{level or quality}"
+        print(
+            f"{name:<8} {ms:8.2f} мс  {size:8d} байт  "
+            f"сэкономлено {1 - size / len(body):6.1%}  "
+            f"{(len(body) - size) / 1024 / ms:8.1f} КБ/мс CPU"
+        )
+
+    middleware = CompressionMiddleware(None)
+    middleware.compress_cached(body, "gzip")
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        middleware.compress_cached(body, "gzip")
+    ms = (time.perf_counter() - started) / args.repeat * 1000
+    print(f"{'cache hit':<8} {ms:8.2f} мс  (blake2b от тела и поиск в LRU)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Бенчмарк рендеринга писем.
+
+Сравнивает прежнюю схему (новое окружение Jinja2 и разбор шаблона на каждое
+письмо) с реестром EmailTemplates: одиночный рендер и пакетный build_many.
+
+Запуск: python -m benchmarks.email_render [--iterations 2000]
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
+
+from starlette.templating import Jinja2Templates
+
+from src.auth.templates import EmailTemplates
+from src.dtos.emails import EmailDTO
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+TEMPLATE = "confirmation_email.html"
+SENDER = "noreply@example.com"
+SUBJECT = "Подтверждение регистрации"
+CONTEXT = {"confirmation_url": "http://localhost/auth/verify?token=abc"}
+
+
+def build_inline(to_email: str) -> MIMEMultipart:
+    templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+    html = templates.get_template(name=TEMPLATE).render(**CONTEXT)
+    message = MIMEMultipart("alternative")
+    message["From"] = SENDER
+    message["To"] = to_email
+    message["Subject"] = SUBJECT
+    message.attach(MIMEText(html, "html", "utf-8"))
+    return message
+
+
+def per_second(fn: Callable[[int], object], iterations: int) -> float:
+    """Писем в секунду; fn(n) собирает n писем."""
+    fn(1)
+    started = time.perf_counter()
+    fn(iterations)
+    return iterations / (time.perf_counter() - started)
+
+
+def run(iterations: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = EmailTemplates(TEMPLATES_DIR, SENDER, cache_dir=Path(tmp))
+        recipients = [(f"user{i}@example.com", CONTEXT) for i in range(iterations)]
+
+        def inline(n: int) -> None:
+            for to_email, _ in recipients[:n]:
+                build_inline(to_email).as_bytes()
+
+        def cached(n: int) -> None:
+            for to_email, context in recipients[:n]:
+                dto = EmailDTO(to_email, SUBJECT, TEMPLATE, context)
+                registry.build(dto).as_bytes()
+
+        def batch(n: int) -> None:
+            for message in registry.build_many(TEMPLATE, SUBJECT, recipients[:n]):
+                message.as_bytes()
+
+        return {
+            "inline": per_second(inline, iterations),
+            "registry": per_second(cached, iterations),
+            "registry_batch": per_second(batch, iterations),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    for name, value in run(args.iterations).items():
+        print(f"{name:<16} {value:10.0f} писем/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,489 @@
+"""Нагрузочный бенчмарк HTTP API на смешанной нагрузке.
+
+Сценарии (вес — доля запросов): вход, регистрация, /users/me, список и
+страница поста, создание поста, администрирование пользователей. База —
+SQLite во временном каталоге (или --database-url, например PostgreSQL),
+заполняется пользователями и постами перед запуском.
+
+Режимы:
+- asgi: приложение в том же процессе через httpx.ASGITransport — стоимость
+  кода приложения без сети и HTTP-парсера;
+- uvicorn: отдельный процесс uvicorn (uvloop, httptools) и реальные сокеты.
+
+Нагрузка закрытая: `--concurrency` клиентов шлют запросы друг за другом.
+Результат — JSON с пропускной способностью и p50/p95/p99 по сценариям.
+С сохранённым baseline (benchmarks/baselines/http_load.json) сравнивается
+пропускная способность и p95; при регрессии больше `--tolerance` код
+возврата 1. Baseline снят на конкретной машине: после смены железа его
+нужно пересохранить (--save-baseline).
+
+Запуск: python -m benchmarks.http_load [--mode asgi|uvicorn] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import httpx
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+BASELINE = Path(__file__).parent / "baselines" / "http_load.json"
+PASSWORD = "bench-password"
+ADMIN_EMAIL = "admin@bench.example.com"
+MIN_REQUESTS = 50
+ERROR_RATE_MARGIN = 0.02
+
+# Обязательные настройки приложения, если они не заданы в окружении
+BENCH_ENV = {
+    "SECRET": "bench-secret-bench-secret-bench-secret",
+    "ACCESS_TOKEN_EXPIRE_SECOND": "3600",
+    "MAIL_SERVER": "localhost",
+    "MAIL_PORT": "25",
+    "MAIL_USERNAME": "bench@example.com",
+    "MAIL_PASSWORD": "bench",
+    "FRONTEND_URL": "http://localhost",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "bench",
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "LOG_LEVEL": "WARNING",
+}
+
+# Сценарий: (вес, функция запроса)
+Scenario = Callable[[httpx.AsyncClient, "Context"], Awaitable[httpx.Response]]
+
+
+@dataclass
+class Context:
+    users: int
+    posts: int
+    user_tokens: list[str]
+    admin_token: str
+    rng: random.Random = field(default_factory=random.Random)
+    counter: itertools.count = field(default_factory=itertools.count)
+
+    def user_email(self) -> str:
+        return f"user{self.rng.randrange(self.users)}@bench.example.com"
+
+    def user_headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.rng.choice(self.user_tokens)}"}
+
+    def admin_headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.admin_token}"}
+
+
+async def login(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.post(
+        "/auth/login", data={"username": ctx.user_email(), "password": PASSWORD}
+    )
+
+
+async def register(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    email = f"new{os.getpid()}-{next(ctx.counter)}@bench.example.com"
+    return await client.post(
+        "/users/register", json={"email": email, "password": PASSWORD}
+    )
+
+
+async def me(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get("/users/me", headers=ctx.user_headers())
+
+
+async def post_list(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get("/posts/")
+
+
+async def post_detail(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get(f"/posts/{ctx.rng.randrange(1, ctx.posts + 1)}")
+
+
+async def post_create(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.post(
+        "/posts/",
+        params={"author_id": ctx.rng.randrange(2, ctx.users + 2)},
+        json={"title": "Benchmark", "content": "Текст поста " * 20},
+    )
+
+
+async def admin_list(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get("/users/", headers=ctx.admin_headers())
+
+
+async def admin_update(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.patch(
+        f"/users/{ctx.rng.randrange(2, ctx.users + 2)}",
+        json={"first_name": f"Name{next(ctx.counter)}"},
+        headers=ctx.admin_headers(),
+    )
+
+
+SCENARIOS: dict[str, tuple[int, Scenario]] = {
+    "login": (5, login),
+    "register": (2, register),
+    "users_me": (25, me),
+    "post_list": (15, post_list),
+    "post_detail": (35, post_detail),
+    "post_create": (8, post_create),
+    "admin_list": (2, admin_list),
+    "admin_update": (8, admin_update),
+}
+
+
+def setup_env() -> None:
+    for key, value in BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+
+
+def make_engine(url: str) -> AsyncEngine:
+    from src.db.database import engine_options
+    from src.db.timeouts import enable_statement_timeouts
+
+    engine = create_async_engine(url, **engine_options(url))
+    enable_statement_timeouts(engine)
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def sqlite_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.close()
+
+    return engine
+
+
+async def seed(url: str, users: int, posts: int) -> None:
+    from src.auth.hashing_password import PasswordHelper
+    from src.models.base import Base
+    from src.models.posts import Post
+    from src.models.users import User
+
+    engine = make_engine(url)
+    hashed = PasswordHelper().hash(PASSWORD)
+    rng = random.Random(0)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(User),
+            [
+                {
+                    "email": email,
+                    "hashed_password": hashed,
+                    "is_superuser": email == ADMIN_EMAIL,
+                    "is_verified": True,
+                }
+                for email in [ADMIN_EMAIL]
+                + [f"user{i}@bench.example.com" for i in range(users)]
+            ],
+        )
+        await conn.execute(
+            insert(Post),
+            [
+                {
+                    "title": f"Пост {i}",
+                    "content": "Текст поста " * 50,
+                    "author_id": rng.randrange(2, users + 2),
+                }
+                for i in range(posts)
+            ],
+        )
+    await engine.dispose()
+
+
+def use_database(app: Any, url: str) -> AsyncEngine:
+    """Подменяет get_db приложения сессиями на базе бенчмарка."""
+    from src.db.database import get_db
+
+    engine = make_engine(url)
+    sessions = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def get_bench_db() -> AsyncGenerator[AsyncSession, None]:
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_bench_db
+    return engine
+
+
+def make_context(users: int, posts: int) -> Context:
+    from src.auth.jwt import create_access_token
+
+    def token(email: str) -> str:
+        return create_access_token({"sub": email}, timedelta(hours=1))
+
+    return Context(
+        users=users,
+        posts=posts,
+        user_tokens=[token(f"user{i}@bench.example.com") for i in range(users)],
+        admin_token=token(ADMIN_EMAIL),
+        rng=random.Random(1),
+    )
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    ctx: Context,
+    concurrency: int,
+    seconds: float,
+    warmup: float,
+) -> dict[str, list[tuple[int, float]]]:
+    """Закрытая нагрузка; возвращает {сценарий: [(статус, задержка)]}."""
+    names = list(SCENARIOS)
+    weights = [SCENARIOS[name][0] for name in names]
+    results: dict[str, list[tuple[int, float]]] = defaultdict(list)
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + seconds
+
+    async def worker() -> None:
+        while (now := time.perf_counter()) < deadline:
+            name = ctx.rng.choices(names, weights)[0]
+            try:
+                response = await SCENARIOS[name][1](client, ctx)
+                status_code = response.status_code
+            except httpx.HTTPError:
+                status_code = 0
+            if now >= measure_from:
+                results[name].append((status_code, time.perf_counter() - now))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+def summarize(samples: list[tuple[int, float]], seconds: float) -> dict[str, float]:
+    latencies = sorted(latency for _, latency in samples)
+    # Статус 0 — ошибка соединения
+    errors = Counter(
+        str(status_code) for status_code, _ in samples if not 200 <= status_code < 300
+    )
+    return {
+        "requests": len(samples),
+        "errors": sum(errors.values()),
+        "error_statuses": dict(errors),
+        "rps": round(len(samples) / seconds, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def report(
+    results: dict[str, list[tuple[int, float]]], seconds: float, **meta: Any
+) -> dict[str, Any]:
+    return {
+        **meta,
+        "seconds": seconds,
+        "total": summarize(list(itertools.chain(*results.values())), seconds),
+        "scenarios": {
+            name: summarize(results[name], seconds)
+            for name in SCENARIOS
+            if results.get(name)
+        },
+    }
+
+
+def error_rate(stats: dict[str, Any]) -> float:
+    return stats["errors"] / stats["requests"] if stats["requests"] else 0.0
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """
+    Регрессии относительно baseline: падение rps или рост p95 больше tolerance,
+    рост доли ошибок больше чем на ERROR_RATE_MARGIN. Сценарии с малым числом
+    запросов (меньше MIN_REQUESTS) не сравниваются — их разброс больше допуска.
+    """
+    regressions = []
+    pairs = [("total", current["total"], baseline.get("total"))] + [
+        (name, stats, baseline.get("scenarios", {}).get(name))
+        for name, stats in current["scenarios"].items()
+        if stats["requests"] >= MIN_REQUESTS
+    ]
+    for name, stats, base in pairs:
+        if not base:
+            continue
+        if stats["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {stats['rps']} < {base['rps']}")
+        # Разница меньше миллисекунды — шум, не регрессия
+        if (
+            stats["p95_ms"] > base["p95_ms"] * (1 + tolerance)
+            and stats["p95_ms"] - base["p95_ms"] > 1.0
+        ):
+            regressions.append(f"{name}: p95 {stats['p95_ms']}ms > {base['p95_ms']}ms")
+        if error_rate(stats) > error_rate(base) + ERROR_RATE_MARGIN:
+            regressions.append(f"{name}: errors {stats['error_statuses']}")
+    return regressions
+
+
+async def run_asgi(args: argparse.Namespace, url: str) -> dict[str, Any]:
+    from src.main import app
+
+    engine = use_database(app, url)
+    transport = httpx.ASGITransport(app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            results = await drive(
+                client,
+                make_context(args.users, args.posts),
+                args.concurrency,
+                args.seconds,
+                args.warmup,
+            )
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+    return report(results, args.seconds, mode="asgi")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/metrics")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def run_uvicorn(args: argparse.Namespace, url: str, workdir: str) -> dict:
+    port = free_port()
+    # cwd — временный каталог: lifespan прогревает пул движка по умолчанию
+    # (db.sqlite3 в текущем каталоге)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.http_load", "--serve", str(port)]
+        + ["--database-url", url],
+        cwd=workdir,
+        env={**os.environ, "PYTHONPATH": str(Path(__file__).parent.parent)},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        await wait_ready(base_url)
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+            results = await drive(
+                client,
+                make_context(args.users, args.posts),
+                args.concurrency,
+                args.seconds,
+                args.warmup,
+            )
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+    return report(results, args.seconds, mode="uvicorn")
+
+
+def serve(port: int, url: str) -> None:
+    import uvicorn
+
+    from src.main import app
+
+    use_database(app, url)
+    uvicorn.run(
+        app,
+        host="127.0.0.1",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+    )
+
+
+async def bench(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as workdir:
+        url = args.database_url or f"sqlite+aiosqlite:///{workdir}/bench.sqlite3"
+        await seed(url, args.users, args.posts)
+        if args.mode == "asgi":
+            result = await run_asgi(args, url)
+        else:
+            result = await run_uvicorn(args, url, workdir)
+    result["database"] = url.split(":", 1)[0]
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--database-url", help="по умолчанию временная SQLite")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    setup_env()
+    if args.serve:
+        serve(args.serve, args.database_url)
+        return 0
+
+    result = asyncio.run(bench(args))
+
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+
+    # Baseline хранит по результату на режим и базу
+    key = f"{result['mode']}/{result['database']}"
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.save_baseline:
+        baselines[key] = result
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baselines, indent=2, ensure_ascii=False))
+        return 0
+    if key not in baselines:
+        return 0
+    regressions = compare(result, baselines[key], args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Время импорта модулей приложения по данным `python -X importtime`.
+
+Запуск: python -m benchmarks.import_time [src.main ...] [--runs 5] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass(slots=True)
+class ImportProfile:
+    module: str
+    total_us: int
+    # модуль -> (собственное время, кумулятивное время), мкс
+    entries: dict[str, tuple[int, int]]
+    loaded: frozenset[str]
+
+
+def measure_import(module: str, env: dict[str, str] | None = None) -> ImportProfile:
+    """Импортирует модуль в чистом интерпретаторе и разбирает вывод importtime."""
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env={"PATH": os.environ.get("PATH", ""), "PYTHONPATH": str(ROOT)}
+        if env is None
+        else env,
+        check=True,
+    )
+    entries: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries[name.strip()] = (int(self_us), int(cumulative_us))
+    return ImportProfile(
+        module=module,
+        total_us=entries[module][1],
+        entries=entries,
+        loaded=frozenset(proc.stdout.split()),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=["src.main"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    for module in args.modules:
+        profiles = [measure_import(module) for _ in range(args.runs)]
+        totals = [p.total_us / 1000 for p in profiles]
+        print(
+            f"{module}: median {statistics.median(totals):.1f} ms, "
+            f"min {min(totals):.1f} ms ({args.runs} runs)"
+        )
+        last = profiles[-1]
+        heaviest = sorted(last.entries.items(), key=lambda e: e[1][1], reverse=True)
+        for name, (self_us, cumulative_us) in heaviest[: args.top]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Бенчмарк сериализации страниц list[PostRead].
+
+Одна и та же страница из `--items` постов отдаётся тремя способами:
+- json: response_model + стандартный JSONResponse (json.dumps);
+- fast: response_model + FastJSONResponse (класс по умолчанию приложения);
+- model: ModelResponse, TypeAdapter.dump_json за один проход.
+
+Запуск: python -m benchmarks.json_response [--items 1000] [--requests 200]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, date, datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message
+
+from src.api.posts import POSTS_ADAPTER
+from src.api.responses import FastJSONResponse, ModelResponse
+from src.models.posts import Post
+from src.models.users import User
+from src.schemas.posts import PostRead
+
+
+def make_posts(count: int) -> list[Post]:
+    author = User(
+        id=1,
+        email="author@example.com",
+        first_name="Иван",
+        last_name="Петров",
+        birth_date=date(1990, 5, 17),
+        is_active=True,
+        is_superuser=False,
+        is_verified=True,
+    )
+    started = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        Post(
+            id=i,
+            title=f"Заголовок {i}",
+            content="Текст поста с «кавычками» и \"escape\"\n" * 4,
+            pub_date=started + timedelta(seconds=i, microseconds=i),
+            author=author,
+        )
+        for i in range(count)
+    ]
+
+
+def make_app(posts: list[Post]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/json", response_model=list[PostRead], response_class=JSONResponse)
+    async def as_json():
+        return posts
+
+    @app.get("/fast", response_model=list[PostRead], response_class=FastJSONResponse)
+    async def as_fast():
+        return posts
+
+    @app.get("/model", response_model=list[PostRead])
+    async def as_model():
+        return ModelResponse(POSTS_ADAPTER, posts)
+
+    return app
+
+
+async def call(app: ASGIApp, path: str) -> bytes:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+    }
+    body = bytearray()
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return bytes(body)
+
+
+async def run(items: int, requests: int) -> dict[str, float]:
+    app = make_app(make_posts(items))
+    bodies = {path: await call(app, path) for path in ("/json", "/fast", "/model")}
+    assert len(set(bodies.values())) == 1, "ответы различаются"
+    results = {}
+    for path in bodies:
+        started = time.perf_counter()
+        for _ in range(requests):
+            await call(app, path)
+        results[path.strip("/")] = (time.perf_counter() - started) / requests * 1000
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    for name, value in asyncio.run(run(args.items, args.requests)).items():
+        print(f"{name:<8} {value:8.2f} мс/страница")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Бенчмарк пропускной способности приложения с включённым логированием.
+
+Эндпоинт пишет несколько INFO-записей на запрос (как echo SQL-запросов).
+Сравниваются:
+- off: логирование ниже WARNING отключено;
+- blocking: прежняя схема, StreamHandler пишет из event loop;
+- queue: configure_logging, JSON форматируется в потоке QueueListener;
+- queue_sampled: то же с сэмплированием 10% записей.
+Для queue* также показано значение с учётом времени дописывания очереди
+(*_drained): event loop свободен раньше, но вывод отстаёт.
+
+Вывод идёт в поток, каждая запись в который занимает `--write-us` мкс
+(медленный потребитель stdout: docker logs, pipe).
+
+Запуск: python -m benchmarks.logging_throughput [--requests 2000] [--write-us 50]
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import time
+
+from benchmarks.json_response import call
+from fastapi import FastAPI
+
+from src.core.log import configure_logging, stop_logging
+
+RECORDS_PER_REQUEST = 5
+
+
+class SlowStream(io.StringIO):
+    """Поток, запись в который блокирует на `delay` секунд."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, s: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        self.lines += 1
+        return len(s)
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    sql_logger = logging.getLogger("sqlalchemy.engine.Engine")
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        for i in range(RECORDS_PER_REQUEST):
+            sql_logger.info("SELECT users.id FROM users WHERE users.id = %s", i)
+        return {"status": "ok"}
+
+    return app
+
+
+def configure_blocking(stream: SlowStream) -> None:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(
+        logging.Formatter(
+            "[%(asctime)s.%(msecs)03d] %(module)s:%(lineno)s %(levelname)s - "
+            "%(message)s"
+        )
+    )
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    logging.getLogger("sqlalchemy").setLevel(logging.INFO)
+
+
+async def requests_per_second(app: FastAPI, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        await call(app, "/ping")
+    return count / (time.perf_counter() - started)
+
+
+async def run(count: int, write_us: float) -> dict[str, float]:
+    app = make_app()
+    results = {}
+    delay = write_us / 1e6
+
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+    results["off"] = await requests_per_second(app, count)
+
+    configure_blocking(SlowStream(delay))
+    results["blocking"] = await requests_per_second(app, count)
+
+    for name, sampling in (("queue", None), ("queue_sampled", {"sqlalchemy": 0.1})):
+        configure_logging(
+            sampling=sampling, sql=True, queue_size=1_000_000, stream=SlowStream(delay)
+        )
+        started = time.perf_counter()
+        results[name] = await requests_per_second(app, count)
+        # С учётом времени, пока поток вывода дописывает очередь
+        stop_logging()
+        results[f"{name}_drained"] = count / (time.perf_counter() - started)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--write-us", type=float, default=50)
+    args = parser.parse_args()
+    for name, value in asyncio.run(run(args.requests, args.write_us)).items():
+        print(f"{name:<22} {value:10.0f} запросов/с")
+
+
+if __name__ == "__main__":
+    main()
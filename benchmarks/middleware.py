@@ -0,0 +1,100 @@
+"""Бенчмарк накладных расходов ExceptionMiddleware.
+
+Сравнивает прежнюю реализацию на BaseHTTPMiddleware с чистой ASGI-версией на
+тривиальном эндпоинте. Приложение вызывается напрямую, без сети и сервера,
+поэтому разница — только стоимость middleware и маршрутизации.
+
+Запуск: python -m benchmarks.middleware [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message
+
+from src.middleware import ExceptionMiddleware, error_response
+
+
+class BaseHTTPExceptionMiddleware(BaseHTTPMiddleware):
+    """Прежняя реализация (для сравнения)."""
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        try:
+            return await call_next(request)
+        except Exception as e:
+            return error_response(e)
+
+
+def make_app(middleware: type | None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/ping",
+    "raw_path": b"/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"bench")],
+    "client": ("127.0.0.1", 1234),
+    "server": ("bench", 80),
+}
+
+
+async def request(app: ASGIApp) -> None:
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        pass
+
+    await app(dict(SCOPE), receive, send)
+
+
+async def requests_per_second(app: ASGIApp, count: int) -> float:
+    for _ in range(100):
+        await request(app)
+    started = time.perf_counter()
+    for _ in range(count):
+        await request(app)
+    return count / (time.perf_counter() - started)
+
+
+async def run(count: int) -> dict[str, float]:
+    return {
+        "no_middleware": await requests_per_second(make_app(None), count),
+        "base_http": await requests_per_second(
+            make_app(BaseHTTPExceptionMiddleware), count
+        ),
+        "pure_asgi": await requests_per_second(make_app(ExceptionMiddleware), count),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    for name, value in asyncio.run(run(args.requests)).items():
+        print(f"{name:<16} {value:10.0f} запросов/с")
+
+
+if __name__ == "__main__":
+    main()
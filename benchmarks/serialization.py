@@ -0,0 +1,266 @@
+"""Микробенчмарк преобразований User/Post на пути к JSON-ответу.
+
+Путь response_model: ORM User -> UserService.to_dto -> UserReadDTO ->
+валидация UserRead (from_attributes) -> dump в JSON-типы -> рендер ответа.
+Чтение пользователей в src.api.users: строка выборки -> UserReadDTO -> JSON
+за один dump без валидации. Пост: ORM Post -> PostRead с вложенным UserRead.
+
+Каждый шаг и альтернативы (переиспользование TypeAdapter против создания на
+каждый вызов, model_construct без валидации, ORM сразу в TypeAdapter)
+замеряются на одном объекте и на списке из `--items`. Как в
+pytest-benchmark: число вызовов в раунде подбирается timeit.autorange,
+результат — медиана по `--rounds` раундам.
+
+Запуск: python -m benchmarks.serialization [--items 1000] [--rounds 5] [-k post]
+"""
+
+import argparse
+import dataclasses
+import statistics
+import timeit
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from src.api import users as users_api
+from src.api.responses import DTOResponse, dump_model
+from src.dtos.users import UserReadDTO
+from src.models.posts import Post
+from src.models.users import User
+from src.schemas.posts import PostRead
+from src.schemas.users import UserRead
+from src.services.user_service import UserService
+
+USER_ADAPTER = TypeAdapter(UserRead)
+USERS_ADAPTER = TypeAdapter(list[UserRead])
+POSTS_ADAPTER = TypeAdapter(list[PostRead])
+USER_FIELD = create_model_field("UserRead", UserRead)
+USERS_FIELD = create_model_field("UserRead", list[UserRead])
+POSTS_FIELD = create_model_field("PostRead", list[PostRead])
+USER_FIELDS = tuple(UserRead.model_fields)
+
+
+def make_users(count: int) -> list[User]:
+    created = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        User(
+            id=i,
+            email=f"user{i}@example.com",
+            first_name="Иван",
+            last_name="Петров",
+            birth_date=date(1990, 5, 17),
+            is_active=True,
+            is_superuser=False,
+            is_verified=True,
+            create_at=created + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def make_posts(count: int, authors: list[User]) -> list[Post]:
+    started = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        Post(
+            id=i,
+            title=f"Заголовок {i}",
+            content="Текст поста с «кавычками» и \"escape\"\n" * 4,
+            pub_date=started + timedelta(seconds=i, microseconds=i),
+            # Авторы повторяются, как на странице ленты
+            author=authors[i % 50],
+        )
+        for i in range(count)
+    ]
+
+
+def construct(dto: Any) -> UserRead:
+    fields = {name: getattr(dto, name) for name in USER_FIELDS}
+    return UserRead.model_construct(**fields)
+
+
+def construct_post(post: Post) -> PostRead:
+    return PostRead.model_construct(
+        id=post.id,
+        title=post.title,
+        content=post.content,
+        pub_date=post.pub_date,
+        author=construct(post.author),
+    )
+
+
+def run_sync(coro: Any) -> Any:
+    # serialize_response не ждёт ввода-вывода: корутина завершается за один шаг
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+def fastapi_serialize(field: Any, content: Any) -> Any:
+    """Путь response_model FastAPI: подготовка, валидация, dump в JSON-типы."""
+    return run_sync(serialize_response(field=field, response_content=content))
+
+
+def each(fn: Callable[[Any], Any]) -> Callable[[list], list]:
+    return lambda items: [fn(item) for item in items]
+
+
+# Сценарий: (вход, функция для одного объекта, функция для списка)
+Case = tuple[str, Callable[[Any], Any], Callable[[list], Any]]
+
+
+def cases(users: list[User]) -> dict[str, Case]:
+    dtos = [UserService.to_dto(user) for user in users]
+    # Строки выборки UserRepository.list_read (row._mapping)
+    rows = [dataclasses.asdict(dto) for dto in dtos]
+    models = USERS_ADAPTER.validate_python(dtos, from_attributes=True)
+    return {
+        # Шаги текущего пути пользователя
+        "user.orm_to_dto": ("orm", UserService.to_dto, each(UserService.to_dto)),
+        "user.validate_dto": (
+            "dto",
+            lambda dto: USER_FIELD.validate(dto, {}, loc=("response",)),
+            lambda items: USERS_FIELD.validate(items, {}, loc=("response",)),
+        ),
+        "user.dump_python": (
+            "model",
+            lambda model: model.model_dump(mode="json"),
+            lambda items: USERS_ADAPTER.dump_python(items, mode="json"),
+        ),
+        "user.render": ("jsonable", to_json, to_json),
+        "user.fastapi_total": (
+            "dto",
+            lambda dto: to_json(fastapi_serialize(USER_FIELD, dto)),
+            lambda items: to_json(fastapi_serialize(USERS_FIELD, items)),
+        ),
+        # Альтернативы
+        "user.row_to_dto": (
+            "row",
+            lambda row: UserReadDTO(**row),
+            each(lambda row: UserReadDTO(**row)),
+        ),
+        "user.dto_dump_direct": (
+            "dto",
+            lambda dto: DTOResponse(
+                users_api.USER_ADAPTER, dto, exclude=users_api.USER_EXCLUDE
+            ).body,
+            lambda items: DTOResponse(
+                users_api.USERS_ADAPTER, items, exclude=users_api.USERS_EXCLUDE
+            ).body,
+        ),
+        "user.adapter_new": (
+            "dto",
+            lambda dto: TypeAdapter(UserRead).validate_python(
+                dto, from_attributes=True
+            ),
+            lambda items: TypeAdapter(list[UserRead]).validate_python(
+                items, from_attributes=True
+            ),
+        ),
+        "user.adapter_reuse": (
+            "dto",
+            lambda dto: USER_ADAPTER.validate_python(dto, from_attributes=True),
+            lambda items: USERS_ADAPTER.validate_python(items, from_attributes=True),
+        ),
+        "user.model_construct": ("dto", construct, each(construct)),
+        "user.dto_dump_json": (
+            "dto",
+            lambda dto: dump_model(USER_ADAPTER, dto),
+            lambda items: dump_model(USERS_ADAPTER, items),
+        ),
+        "user.orm_dump_json": (
+            "orm",
+            lambda user: dump_model(USER_ADAPTER, user),
+            lambda items: dump_model(USERS_ADAPTER, items),
+        ),
+        "user.construct_dump_json": (
+            "dto",
+            lambda dto: construct(dto).model_dump_json(),
+            lambda items: USERS_ADAPTER.dump_json([construct(i) for i in items]),
+        ),
+        # Пост с вложенным автором
+        "post.fastapi_total": (
+            "post",
+            lambda post: to_json(fastapi_serialize(POSTS_FIELD, [post])),
+            lambda items: to_json(fastapi_serialize(POSTS_FIELD, items)),
+        ),
+        "post.validate_orm": (
+            "post",
+            lambda post: PostRead.model_validate(post, from_attributes=True),
+            lambda items: POSTS_ADAPTER.validate_python(items, from_attributes=True),
+        ),
+        "post.model_construct": ("post", construct_post, each(construct_post)),
+        "post.orm_dump_json": (
+            "post",
+            lambda post: dump_model(POSTS_ADAPTER, [post]),
+            lambda items: dump_model(POSTS_ADAPTER, items),
+        ),
+        "post.construct_dump_json": (
+            "post",
+            lambda post: PostRead.model_dump_json(construct_post(post)),
+            lambda items: POSTS_ADAPTER.dump_json([construct_post(i) for i in items]),
+        ),
+    }, {
+        "orm": users,
+        "dto": dtos,
+        "row": rows,
+        "model": models,
+        "jsonable": USERS_ADAPTER.dump_python(models, mode="json"),
+    }
+
+
+def check(inputs: dict[str, list]) -> None:
+    """Все варианты, выдающие JSON, должны выдавать одно и то же."""
+    dtos, posts = inputs["dto"], inputs["post"]
+    users = {
+        to_json(fastapi_serialize(USERS_FIELD, dtos)),
+        dump_model(USERS_ADAPTER, dtos),
+        dump_model(USERS_ADAPTER, inputs["orm"]),
+        USERS_ADAPTER.dump_json([construct(dto) for dto in dtos]),
+        users_api.USERS_ADAPTER.dump_json(dtos, exclude=users_api.USERS_EXCLUDE),
+    }
+    posts_json = {
+        to_json(fastapi_serialize(POSTS_FIELD, posts)),
+        dump_model(POSTS_ADAPTER, posts),
+        POSTS_ADAPTER.dump_json([construct_post(post) for post in posts]),
+    }
+    assert len(users) == 1 and len(posts_json) == 1, "ответы различаются"
+
+
+def measure(fn: Callable[[], Any], rounds: int) -> float:
+    """Медиана секунд на вызов по `rounds` раундам."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return statistics.median(t / number for t in timer.repeat(rounds, number))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("-k", dest="keyword", default="", help="фильтр по имени")
+    args = parser.parse_args()
+
+    users = make_users(args.items)
+    table, inputs = cases(users)
+    inputs["post"] = make_posts(args.items, users)
+    check(inputs)
+
+    print(f"{'case':<28} {'объект, мкс':>12} {f'{args.items} шт., мс':>14}")
+    for name, (source, one, many) in table.items():
+        if args.keyword not in name:
+            continue
+        items = inputs[source]
+        per_object = measure(lambda: one(items[0]), args.rounds)
+        per_list = measure(lambda: many(items), args.rounds)
+        print(f"{name:<28} {per_object * 1e6:12.2f} {per_list * 1e3:14.2f}")
+
+
+if __name__ == "__main__":
+    main()
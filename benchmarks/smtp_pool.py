@@ -0,0 +1,75 @@
+"""Пропускная способность отправки писем: соединение на письмо против пула.
+
+Поднимает локальный aiosmtpd-сервер (без TLS) и отправляет одинаковые письма
+через aiosmtplib.send и через SMTPPool. Задержку рукопожатия реального
+сервера имитирует --handshake-ms (пауза в ответе на EHLO).
+
+Запуск: python -m benchmarks.smtp_pool [--messages 500] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiosmtplib
+from tests.utils.smtp_server import SinkHandler, local_smtp_server, make_message
+
+from src.auth.smtp import SMTPPool
+
+
+class SlowHandshakeHandler(SinkHandler):
+    def __init__(self, handshake_ms: float) -> None:
+        super().__init__()
+        self.handshake = handshake_ms / 1000
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.handshake)
+        return await super().handle_EHLO(server, session, envelope, hostname, responses)
+
+
+async def send_direct(port: int, messages: int, concurrency: int) -> float:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def send_one(i: int) -> None:
+        async with limit:
+            await aiosmtplib.send(
+                make_message(f"user{i}@example.com"),
+                hostname="127.0.0.1",
+                port=port,
+                start_tls=False,
+            )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send_one(i) for i in range(messages)))
+    return messages / (time.perf_counter() - started)
+
+
+async def send_pooled(port: int, messages: int, concurrency: int) -> float:
+    pool = SMTPPool(
+        lambda: aiosmtplib.SMTP(hostname="127.0.0.1", port=port, start_tls=False),
+        max_size=concurrency,
+    )
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(pool.send(make_message(f"user{i}@example.com")) for i in range(messages))
+    )
+    rate = messages / (time.perf_counter() - started)
+    await pool.close()
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    for name, bench in (("direct", send_direct), ("pooled", send_pooled)):
+        handler = SlowHandshakeHandler(args.handshake_ms)
+        with local_smtp_server(handler) as (handler, port):
+            rate = asyncio.run(bench(port, args.messages, args.concurrency))
+        print(f"{name:<7} {rate:8.0f} писем/с, SMTP-сессий: {handler.sessions}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Микробенчмарк Python-накладных расходов горячих запросов UserRepository.
+
+Сравнивает сборку запроса на каждый вызов (как было раньше) с заранее
+собранными выражениями на bind-параметрах.
+
+Запуск: python -m benchmarks.user_repo [--iterations 5000]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.db.database import engine_options
+from src.models.base import Base
+from src.models.users import User
+from src.repositories.user_repo import GET_BY_EMAIL, GET_BY_ID, exists_stmt
+
+EMAIL = "bench@example.com"
+
+
+def build_inline() -> None:
+    select(User).where(User.id == 1)._generate_cache_key()
+    select(User).where(User.email == EMAIL)._generate_cache_key()
+    select(
+        exists().where(*(getattr(User, k) == v for k, v in {"email": EMAIL}.items()))
+    )._generate_cache_key()
+
+
+def build_cached() -> None:
+    GET_BY_ID._generate_cache_key()
+    GET_BY_EMAIL._generate_cache_key()
+    exists_stmt(("email",))._generate_cache_key()
+
+
+async def queries_inline(session: AsyncSession, user_id: int) -> None:
+    await session.execute(select(User).where(User.id == user_id))
+    await session.execute(select(User).where(User.email == EMAIL))
+    await session.execute(
+        select(
+            exists().where(
+                *(getattr(User, k) == v for k, v in {"email": EMAIL}.items())
+            )
+        )
+    )
+
+
+async def queries_cached(session: AsyncSession, user_id: int) -> None:
+    await session.execute(GET_BY_ID, {"id": user_id})
+    await session.execute(GET_BY_EMAIL, {"email": EMAIL})
+    filters = {"email": EMAIL}
+    await session.execute(exists_stmt(tuple(sorted(filters))), filters)
+
+
+def bench_sync(fn: Callable[[], None], iterations: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / (iterations * 3) * 1e6
+
+
+async def bench_async(
+    fn: Callable[[AsyncSession, int], Awaitable[None]],
+    session: AsyncSession,
+    user_id: int,
+    iterations: int,
+) -> float:
+    await fn(session, user_id)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await fn(session, user_id)
+    return (time.perf_counter() - started) / (iterations * 3) * 1e6
+
+
+async def run(iterations: int) -> dict[str, Any]:
+    results = {
+        "build_inline_us": bench_sync(build_inline, iterations),
+        "build_cached_us": bench_sync(build_cached, iterations),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.sqlite3'}"
+        engine = create_async_engine(url, **engine_options(url))
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as session:
+            user = User(email=EMAIL, hashed_password="x")
+            session.add(user)
+            await session.commit()
+            results["query_inline_us"] = await bench_async(
+                queries_inline, session, user.id, iterations
+            )
+            results["query_cached_us"] = await bench_async(
+                queries_cached, session, user.id, iterations
+            )
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.iterations))
+    for name, value in results.items():
+        print(f"{name:<20} {value:8.1f} мкс/запрос")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Бенчмарк масштабирования src.server от 1 до N воркеров.
+
+Сервер запускается с тестовым приложением этого модуля: эндпоинт
+сериализует страницу постов (CPU-нагрузка, как у GET /posts/ без БД).
+Нагрузку дают `--clients` процессов с keep-alive соединениями на сырых
+сокетах, чтобы генератор нагрузки не упёрся в CPU раньше сервера.
+
+Прирост ограничен числом ядер машины: сервер и клиенты делят одни ядра.
+
+Запуск: python -m benchmarks.workers_scaling [--max-workers 4] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.json_response import make_posts
+from fastapi import FastAPI
+from starlette.responses import Response
+
+from src.api.posts import POSTS_ADAPTER
+from src.api.responses import dump_model
+
+PORT = 18_000
+POSTS = make_posts(100)
+
+app = FastAPI()
+
+
+@app.get("/posts/")
+async def read_posts() -> Response:
+    return Response(dump_model(POSTS_ADAPTER, POSTS), media_type="application/json")
+
+
+async def connection(port: int, deadline: float) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = b"GET /posts/ HTTP/1.1\r\nHost: bench\r\n\r\n"
+    done = 0
+    while time.perf_counter() < deadline:
+        writer.write(request)
+        headers = await reader.readuntil(b"\r\n\r\n")
+        length = next(
+            int(line.split(b":")[1])
+            for line in headers.split(b"\r\n")
+            if line.lower().startswith(b"content-length")
+        )
+        await reader.readexactly(length)
+        done += 1
+    writer.close()
+    return done
+
+
+def client(
+    port: int, connections: int, seconds: float, results: multiprocessing.Queue
+) -> None:
+    async def run() -> int:
+        deadline = time.perf_counter() + seconds
+        counts = await asyncio.gather(
+            *(connection(port, deadline) for _ in range(connections))
+        )
+        return sum(counts)
+
+    results.put(asyncio.run(run()))
+
+
+def wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def measure(workers: int, clients: int, connections: int, seconds: float) -> float:
+    port = PORT + workers
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.server",
+            "--app",
+            "benchmarks.workers_scaling:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port)
+        time.sleep(1.0)  # все воркеры прошли lifespan
+        results: multiprocessing.Queue = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=client, args=(port, connections, seconds, results)
+            )
+            for _ in range(clients)
+        ]
+        for process in processes:
+            process.start()
+        total = sum(results.get() for _ in processes)
+        for process in processes:
+            process.join()
+        return total / seconds
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"CPU: {os.cpu_count()}, клиентских процессов: {args.clients}")
+    # 1, 2, 4, ... и сам максимум
+    counts = {2**i for i in range(args.max_workers.bit_length())}
+    baseline = None
+    for workers in sorted(counts | {args.max_workers}):
+        rps = measure(workers, args.clients, args.connections, args.seconds)
+        baseline = baseline or rps
+        print(f"{workers:3} воркеров: {rps:8.0f} запросов/с (x{rps / baseline:.2f})")
+
+
+if __name__ == "__main__":
+    main()
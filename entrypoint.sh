@@ -1,3 +1,7 @@
 #!/bin/bash
+# С аргументами запускает другую команду образа (например, воркер очереди писем)
+if [ "$#" -gt 0 ]; then
+    exec "$@"
+fi
 python3 src/init_db.py
-uvicorn src.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+exec python3 -m src.server --host 0.0.0.0 --port 8000
@@ -0,0 +1,218 @@
+"""
+Генерация синтетических пользователей и постов для нагрузочных тестов.
+
+Распределения приближены к реальным: число постов на автора — степенной
+закон (немногие авторы пишут большую часть постов, многие — ничего), длина
+текста — логнормальная, даты регистрации смещены к концу периода, посты
+публикуются после регистрации автора. Данные детерминированы seed и --until.
+
+Все пользователи получают один хэш пароля: Argon2 на миллионы записей занял
+бы часы. Хэш --password вычисляется один раз, --hashed-password пропускает и
+его.
+
+Запуск: python -m src.actions.generate_data --users 1000000 --posts 5000000
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.auth.hashing_password import PasswordHelper
+from src.db.database import async_engine
+from src.models.posts import Post
+from src.models.users import User
+
+DEFAULT_UNTIL = datetime(2025, 1, 1, tzinfo=UTC)
+
+FIRST_NAMES = (
+    "Александр", "Мария", "Иван", "Анна", "Дмитрий", "Елена", "Сергей", "Ольга",
+    "Алексей", "Наталья", "Андрей", "Татьяна", "Михаил", "Ирина", "Павел", "Юлия",
+)  # fmt: skip
+LAST_NAMES = (
+    "Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов",
+    "Михайлов", "Новиков", "Фёдоров", "Морозов", "Волков", "Алексеев", "Лебедев",
+)  # fmt: skip
+WORDS = (
+    "система", "данные", "запрос", "сервер", "проект", "время", "работа", "вопрос",
+    "решение", "пример", "задача", "результат", "процесс", "модель", "ответ",
+    "python", "база", "индекс", "кэш", "очередь", "поток", "память", "сеть",
+    "быстро", "медленно", "новый", "старый", "большой", "простой", "важный",
+    "и", "в", "на", "с", "по", "для", "не", "что", "как", "это",
+)  # fmt: skip
+
+
+def power_law_weights(n: int, skew: float) -> list[float]:
+    """Накопленные веса: у автора ранга r вес 1 / r ** skew."""
+    return list(itertools.accumulate(1 / rank**skew for rank in range(1, n + 1)))
+
+
+def words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choices(WORDS, k=count))
+
+
+def registration_dates(
+    rng: random.Random, count: int, since: datetime, until: datetime
+) -> list[datetime]:
+    span = (until - since).total_seconds()
+    # Регистраций больше к концу периода (рост сервиса)
+    return [
+        since + timedelta(seconds=span * rng.random() ** 0.5) for _ in range(count)
+    ]
+
+
+def generate_users(
+    rng: random.Random, joined: list[datetime], hashed_password: str, seed: int
+) -> Iterator[dict[str, Any]]:
+    for i, create_at in enumerate(joined):
+        yield {
+            "email": f"user{seed}-{i}@example.com",
+            "hashed_password": hashed_password,
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES) if rng.random() < 0.8 else None,
+            "birth_date": (
+                date(1950, 1, 1) + timedelta(days=rng.randrange(55 * 365))
+                if rng.random() < 0.5
+                else None
+            ),
+            "is_active": rng.random() < 0.98,
+            "is_superuser": False,
+            "is_verified": rng.random() < 0.9,
+            "create_at": create_at,
+        }
+
+
+def generate_posts(
+    rng: random.Random,
+    count: int,
+    authors: list[tuple[int, datetime]],
+    skew: float,
+    until: datetime,
+) -> Iterator[dict[str, Any]]:
+    # Ранги авторов случайны, иначе самые активные — первые по id
+    ranked = authors[:]
+    rng.shuffle(ranked)
+    cum_weights = power_law_weights(len(ranked), skew)
+    for _ in range(count):
+        author_id, joined = rng.choices(ranked, cum_weights=cum_weights)[0]
+        length = min(3000, max(5, round(rng.lognormvariate(4.0, 0.9))))
+        yield {
+            "title": words(rng, rng.randint(2, 10)).capitalize()[:150],
+            "content": words(rng, length),
+            "author_id": author_id,
+            "pub_date": joined + (until - joined) * rng.random(),
+        }
+
+
+async def insert_batches(
+    engine: AsyncEngine,
+    model: type[User] | type[Post],
+    rows: Iterator[dict[str, Any]],
+    batch_size: int,
+    total: int,
+    returning: bool = False,
+) -> list[int]:
+    """
+    Вставляет строки пачками по транзакции на пачку. С returning возвращает
+    id в порядке строк (executemany без RETURNING быстрее).
+    """
+    ids: list[int] = []
+    statement = insert(model)
+    if returning:
+        statement = statement.returning(model.id, sort_by_parameter_order=True)
+    inserted = 0
+    started = time.perf_counter()
+    while batch := list(itertools.islice(rows, batch_size)):
+        async with engine.begin() as conn:
+            result = await conn.execute(statement, batch)
+            if returning:
+                ids.extend(result.scalars())
+        inserted += len(batch)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{model.__tablename__}: {inserted}/{total} "
+            f"({inserted / elapsed:.0f} rows/s)",
+            flush=True,
+        )
+    return ids
+
+
+async def generate_data(
+    engine: AsyncEngine,
+    users: int,
+    posts: int,
+    hashed_password: str,
+    seed: int = 0,
+    skew: float = 1.0,
+    days: int = 3 * 365,
+    until: datetime = DEFAULT_UNTIL,
+    batch_size: int = 10_000,
+) -> None:
+    rng = random.Random(seed)
+    joined = registration_dates(rng, users, until - timedelta(days=days), until)
+    user_ids = await insert_batches(
+        engine,
+        User,
+        generate_users(rng, joined, hashed_password, seed),
+        batch_size,
+        users,
+        returning=True,
+    )
+    authors = list(zip(user_ids, joined))
+    if authors:
+        await insert_batches(
+            engine,
+            Post,
+            generate_posts(rng, posts, authors, skew, until),
+            batch_size,
+            posts,
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--skew", type=float, default=1.0, help="показатель степенного закона"
+    )
+    parser.add_argument("--days", type=int, default=3 * 365)
+    parser.add_argument(
+        "--until",
+        type=datetime.fromisoformat,
+        default=DEFAULT_UNTIL,
+        help="конец периода, ISO-дата",
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--hashed-password", help="готовый хэш вместо --password")
+    args = parser.parse_args()
+
+    until = args.until if args.until.tzinfo else args.until.replace(tzinfo=UTC)
+    hashed_password = args.hashed_password or PasswordHelper().hash(args.password)
+    try:
+        await generate_data(
+            async_engine,
+            args.users,
+            args.posts,
+            hashed_password,
+            seed=args.seed,
+            skew=args.skew,
+            days=args.days,
+            until=until,
+            batch_size=args.batch_size,
+        )
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,12 @@
 from fastapi import APIRouter
 
-from src.api import auth, posts, users
+from src.api import auth, broadcasts, metrics, posts, profiling, users
 
 router = APIRouter()
 
 router.include_router(auth.router, prefix="/auth", tags=["auth"])
 router.include_router(users.router, prefix="/users", tags=["users"])
 router.include_router(posts.router, prefix="/posts", tags=["posts"])
+router.include_router(broadcasts.router, prefix="/broadcasts", tags=["broadcasts"])
+router.include_router(profiling.router, prefix="/profiling", tags=["profiling"])
+router.include_router(metrics.router, tags=["metrics"])
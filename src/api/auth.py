@@ -1,10 +1,23 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from src.api.dependencies import AuthServiceDeps
-from src.schemas.users import Token
+from src.exceptions.users import (
+    InvalidRefreshToken,
+    InvalidResetPasswordToken,
+    InvalidVerifyToken,
+    UserAlreadyVerified,
+)
+from src.schemas.users import (
+    EmailRequest,
+    RefreshRequest,
+    ResetPasswordRequest,
+    Token,
+    UserRead,
+    VerifyRequest,
+)
 
 router = APIRouter()
 
@@ -15,3 +28,57 @@ async def login(
     credentials: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Token:
     return await service.login(credentials.username, credentials.password)
+
+
+@router.post("/refresh", response_model=Token, summary="Обновление токенов")
+async def refresh(body: RefreshRequest, service: AuthServiceDeps) -> Token:
+    try:
+        return await service.refresh(body.refresh_token)
+    except InvalidRefreshToken:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="REFRESH_BAD_TOKEN"
+        ) from None
+
+
+@router.post(
+    "/request-verify-token",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Запрос письма для подтверждения email",
+)
+async def request_verify_token(body: EmailRequest, service: AuthServiceDeps) -> None:
+    await service.request_verify(body.email)
+
+
+@router.post("/verify", response_model=UserRead, summary="Подтверждение email")
+async def verify(body: VerifyRequest, service: AuthServiceDeps) -> UserRead:
+    try:
+        return await service.verify(body.token)
+    except InvalidVerifyToken:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="VERIFY_USER_BAD_TOKEN"
+        ) from None
+    except UserAlreadyVerified:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="VERIFY_USER_ALREADY_VERIFIED",
+        ) from None
+
+
+@router.post(
+    "/forgot-password",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Запрос письма для сброса пароля",
+)
+async def forgot_password(body: EmailRequest, service: AuthServiceDeps) -> None:
+    await service.forgot_password(body.email)
+
+
+@router.post("/reset-password", summary="Сброс пароля")
+async def reset_password(body: ResetPasswordRequest, service: AuthServiceDeps) -> None:
+    try:
+        await service.reset_password(body.token, body.password)
+    except InvalidResetPasswordToken:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="RESET_PASSWORD_BAD_TOKEN",
+        ) from None
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+
+from src.api.dependencies import BroadcastServiceDeps, get_superuser
+from src.exceptions.emails import EmailTemplateNotExists
+from src.schemas.emails import BroadcastCreate, BroadcastRead
+
+router = APIRouter(dependencies=[Depends(get_superuser)])
+
+
+@router.post(
+    "/",
+    response_model=BroadcastRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Запуск рассылки пользователям",
+)
+async def create_broadcast(
+    broadcast_create: BroadcastCreate,
+    service: BroadcastServiceDeps,
+    background_tasks: BackgroundTasks,
+) -> BroadcastRead:
+    try:
+        broadcast = await service.create_broadcast(
+            broadcast_create.template_name,
+            broadcast_create.subject,
+            broadcast_create.context,
+            broadcast_create.filter.model_dump(exclude_none=True),
+        )
+    except EmailTemplateNotExists:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Template not exists"
+        ) from None
+    background_tasks.add_task(service.run_broadcast, broadcast.id)
+    return BroadcastRead.model_validate(broadcast, from_attributes=True)
+
+
+@router.get("/{id}", response_model=BroadcastRead, summary="Прогресс рассылки")
+async def get_broadcast(id: int, service: BroadcastServiceDeps) -> BroadcastRead:
+    broadcast = await service.get_broadcast(id)
+    if broadcast is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Broadcast not found"
+        )
+    return BroadcastRead.model_validate(broadcast, from_attributes=True)
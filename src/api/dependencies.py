@@ -1,18 +1,28 @@
+import asyncio
+import logging
 import uuid
 from collections.abc import AsyncGenerator
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.database import get_db
+from src.db.database import AsyncSessionLocal, get_db
+from src.db.timeouts import (
+    clear_query_deadline,
+    interrupt_queries,
+    set_query_deadline,
+)
 from src.exceptions.users import InvalidVerifyToken, UserNotExists
 from src.models.users import User
 from src.repositories.user_repo import UserRepository
 from src.services.auth_service import AuthService
+from src.services.broadcast_service import BroadcastService
 from src.services.user_service import UserService
 
+logger = logging.getLogger(__name__)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 TokenDeps = Annotated[OAuth2PasswordBearer, Depends(oauth2_scheme)]
 
@@ -20,6 +30,45 @@ TokenDeps = Annotated[OAuth2PasswordBearer, Depends(oauth2_scheme)]
 SessionDeps = Annotated[AsyncSession, Depends(get_db)]
 
 
+class StatementTimeout:
+    """
+    Ограничивает время SQL-запросов маршрута и прерывает их, если клиент
+    отключился. Указывается первой в `dependencies` маршрута: таймаут
+    применяется при начале транзакции сессии.
+    """
+
+    def __init__(self, seconds: float, poll_interval: float = 0.1) -> None:
+        self.seconds = seconds
+        self.poll_interval = poll_interval
+
+    async def __call__(
+        self, request: Request, session: SessionDeps
+    ) -> AsyncGenerator[None, None]:
+        set_query_deadline(session, self.seconds)
+        watcher = asyncio.create_task(self.watch_disconnect(request, session))
+        try:
+            yield
+        finally:
+            watcher.cancel()
+            try:
+                await watcher
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                # Например, ошибка pg_cancel_backend: иначе её увидит только GC
+                logger.exception("Interrupting queries on disconnect failed")
+            clear_query_deadline(session)
+
+    async def watch_disconnect(self, request: Request, session: AsyncSession) -> None:
+        while not await request.is_disconnected():
+            await asyncio.sleep(self.poll_interval)
+        await interrupt_queries(session)
+
+
+# Тяжёлые выборки списков не должны держать соединение дольше этого времени
+list_query_timeout = StatementTimeout(seconds=5.0)
+
+
 async def get_user_service(session: SessionDeps) -> AsyncGenerator[UserService, None]:
     yield UserService(session, UserRepository(session))
 
@@ -28,8 +77,15 @@ async def get_auth_service(session: SessionDeps) -> AsyncGenerator[AuthService,
     yield AuthService(session, UserRepository(session))
 
 
+async def get_broadcast_service(
+    session: SessionDeps,
+) -> AsyncGenerator[BroadcastService, None]:
+    yield BroadcastService(session, UserRepository(session))
+
+
 UserServiceDeps = Annotated[UserService, Depends(get_user_service)]
 AuthServiceDeps = Annotated[AuthService, Depends(get_auth_service)]
+BroadcastServiceDeps = Annotated[BroadcastService, Depends(get_broadcast_service)]
 
 
 async def get_current_user(token: TokenDeps, service: AuthServiceDeps) -> User:
@@ -52,6 +108,17 @@ async def get_superuser(user: CurrentUser) -> User:
     return user
 
 
+async def is_superuser_token(token: str) -> bool:
+    """Проверка токена вне зависимостей FastAPI (ProfilingMiddleware)."""
+    async with AsyncSessionLocal() as session:
+        service = AuthService(session, UserRepository(session))
+        try:
+            user = await service.get_current_user(token)
+        except (UserNotExists, InvalidVerifyToken):
+            return False
+    return user.is_superuser
+
+
 async def get_active_user(user: Annotated[User, Depends(get_current_user)]) -> User:
     if not user.is_active:
         raise HTTPException(
@@ -1,21 +1,46 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
 
+from src.api.dependencies import list_query_timeout
+from src.api.responses import dump_model
+from src.core.singleflight import SingleFlight
 from src.db.database import get_db
+from src.db.timeouts import is_query_timeout
 from src.managers.post_manager import PostManager
 from src.schemas.posts import PostCreate, PostRead
 
 router = APIRouter()
 
+POSTS_ADAPTER = TypeAdapter(list[PostRead])
+POST_ADAPTER = TypeAdapter(PostRead)
 
-@router.get("/", response_model=list[PostRead])
+
+def is_interrupted(exc: BaseException) -> bool:
+    return isinstance(exc, DBAPIError) and is_query_timeout(exc)
+
+
+# Одновременные одинаковые чтения делят один запрос в БД и готовый JSON.
+# Запрос первого читателя прерывается при его отключении или дедлайне
+# (list_query_timeout) — тогда ожидающие выполняют выборку сами.
+posts_flight = SingleFlight("posts", retry_if=is_interrupted)
+
+
+@router.get(
+    "/", response_model=list[PostRead], dependencies=[Depends(list_query_timeout)]
+)
 async def read_posts(
     db: Annotated[AsyncSession, Depends(get_db)], email: str | None = None
 ):
-    manager = PostManager(db)
-    return await manager.get_posts(email=email)
+    async def fetch() -> bytes:
+        return dump_model(POSTS_ADAPTER, await PostManager(db).get_posts(email=email))
+
+    body = await posts_flight.do(("list", email or None), fetch)
+    return Response(body, media_type="application/json")
 
 
 @router.post("/", response_model=PostRead)
@@ -30,8 +55,16 @@ async def create_post(
 
 @router.get("/{id}", response_model=PostRead)
 async def read_post(id: int, db: Annotated[AsyncSession, Depends(get_db)]):
-    manager = PostManager(db)
-    return await manager.get_post(id)
+    async def fetch() -> bytes | None:
+        post = await PostManager(db).get_post(id)
+        return None if post is None else dump_model(POST_ADAPTER, post)
+
+    body = await posts_flight.do(("detail", id), fetch)
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Post not exists"
+        )
+    return Response(body, media_type="application/json")
 
 
 @router.delete("/{id}", status_code=204)
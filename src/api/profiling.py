@@ -0,0 +1,47 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi.responses import PlainTextResponse
+
+from src.api.dependencies import get_superuser
+from src.core.profiling import get_profile_store
+
+router = APIRouter(dependencies=[Depends(get_superuser)])
+
+ProfileId = Path(pattern=r"^[A-Za-z0-9._-]{1,64}$")
+# Сколько последних отчётов показывать в списке
+LIST_LIMIT = 50
+
+
+def load_report(profile_id: str) -> dict[str, Any]:
+    report = get_profile_store().load(profile_id)
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not exists"
+        )
+    return report
+
+
+@router.get("/", summary="Последние отчёты профилирования")
+def list_profiles() -> list[dict[str, Any]]:
+    store = get_profile_store()
+    reports = (store.load(path.stem) for path in store.list()[:LIST_LIMIT])
+    return [
+        {key: value for key, value in report.items() if key != "collapsed"}
+        for report in reports
+        if report is not None
+    ]
+
+
+@router.get("/{profile_id}", summary="Отчёт: время по категориям и стеки")
+def get_profile(profile_id: str = ProfileId) -> dict[str, Any]:
+    return load_report(profile_id)
+
+
+@router.get(
+    "/{profile_id}/collapsed",
+    response_class=PlainTextResponse,
+    summary="Стеки в формате collapsed для flamegraph",
+)
+def get_collapsed(profile_id: str = ProfileId) -> PlainTextResponse:
+    return PlainTextResponse(load_report(profile_id)["collapsed"])
@@ -0,0 +1,70 @@
+from typing import Any
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, Response
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse с сериализацией в pydantic-core вместо json.dumps. Вывод тот
+    же: компактный, не-ASCII символы не экранируются. Класс ответа по умолчанию
+    для приложения; маршрут может вернуть обычный JSONResponse явно.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def dump_model(adapter: TypeAdapter, content: Any) -> bytes:
+    """JSON-представление `content` в формате response_model адаптера."""
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+class ModelResponse(Response):
+    """
+    Ответ, сериализуемый через TypeAdapter.dump_json за один проход: без
+    промежуточных dict и jsonable_encoder. Для больших списков моделей;
+    формат дат и EmailStr тот же, что у response_model.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        adapter: TypeAdapter,
+        content: Any,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        super().__init__(
+            dump_model(adapter, content), status_code, headers, background=background
+        )
+
+
+class DTOResponse(Response):
+    """
+    Ответ из уже проверенных данных (DTO из БД): TypeAdapter.dump_json без
+    валидации. Адаптер строится по DTO, `exclude` убирает поля, которых нет
+    в схеме ответа, — вывод должен совпадать с response_model маршрута.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        adapter: TypeAdapter,
+        content: Any,
+        exclude: Any = None,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        super().__init__(
+            adapter.dump_json(content, exclude=exclude),
+            status_code,
+            headers,
+            background=background,
+        )
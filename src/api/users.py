@@ -1,26 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from pydantic import TypeAdapter
 
 from src.api.dependencies import (
     CurrentUser,
     UserServiceDeps,
     get_superuser,
+    list_query_timeout,
 )
-from src.dtos.users import UserUpdateDTO
+from src.api.responses import DTOResponse
+from src.dtos.users import UserReadDTO, UserUpdateDTO
 from src.exceptions.users import UserAlreadyExists, UserNotExists
-from src.schemas.users import UserCreate, UserRead, UserUpdate
+from src.schemas.users import UserCreate, UserDeletionRead, UserRead, UserUpdate
+from src.services.user_service import UserService
 
 router = APIRouter()
 
+# Ответы чтения сериализуются прямо из DTO за один проход: данные из БД, и
+# повторная валидация в UserRead (с EmailStr) не нужна. Вывод совпадает с
+# UserRead: те же поля в том же порядке, без created_at
+USER_ADAPTER = TypeAdapter(UserReadDTO)
+USERS_ADAPTER = TypeAdapter(list[UserReadDTO])
+USER_EXCLUDE = {"created_at"}
+USERS_EXCLUDE = {"__all__": USER_EXCLUDE}
+
 
 @router.get(
     "/",
     response_model=list[UserRead],
-    dependencies=[Depends(get_superuser)],
+    dependencies=[Depends(list_query_timeout), Depends(get_superuser)],
     summary="Список пользователей",
 )
-async def get_users(user_service: UserServiceDeps) -> list[UserRead]:
+async def get_users(user_service: UserServiceDeps) -> DTOResponse:
     users = await user_service.get_users()
-    return users
+    return DTOResponse(USERS_ADAPTER, users, exclude=USERS_EXCLUDE)
 
 
 @router.post(
@@ -41,8 +53,8 @@ async def register(user_create: UserCreate, user_service: UserServiceDeps) -> Us
 
 
 @router.get("/me", response_model=UserRead, summary="Профиль пользователя")
-async def me(user: CurrentUser) -> UserRead:
-    return user
+async def me(user: CurrentUser) -> DTOResponse:
+    return DTOResponse(USER_ADAPTER, UserService.to_dto(user), exclude=USER_EXCLUDE)
 
 
 @router.patch("/me", response_model=UserRead, summary="Обновление профиля")
@@ -59,13 +71,14 @@ async def update_me(
     dependencies=[Depends(get_superuser)],
     summary="Получение пользователя по id",
 )
-async def get_user(id: int, user_service: UserServiceDeps) -> UserRead:
+async def get_user(id: int, user_service: UserServiceDeps) -> DTOResponse:
     try:
-        return await user_service.get_user(id)
+        user = await user_service.get_user(id)
     except UserNotExists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not exists"
         ) from None
+    return DTOResponse(USER_ADAPTER, user, exclude=USER_EXCLUDE)
 
 
 @router.patch(
@@ -92,10 +105,28 @@ async def update_user(
     dependencies=[Depends(get_superuser)],
     summary="Удаление пользователя",
 )
-async def delete_user(id: int, service: UserServiceDeps) -> None:
+async def delete_user(
+    id: int, service: UserServiceDeps, background_tasks: BackgroundTasks
+) -> None:
     try:
         await service.delete_user(id)
     except UserNotExists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not exists"
         ) from None
+    background_tasks.add_task(service.purge_user, id)
+
+
+@router.get(
+    "/{id}/deletion",
+    response_model=UserDeletionRead,
+    dependencies=[Depends(get_superuser)],
+    summary="Прогресс удаления пользователя",
+)
+async def get_user_deletion(id: int, service: UserServiceDeps) -> UserDeletionRead:
+    deletion = await service.get_deletion(id)
+    if deletion is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Deletion not found"
+        )
+    return deletion
@@ -1,74 +1,75 @@
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-
-import aiosmtplib
-from starlette.templating import Jinja2Templates
-
-from core.config import settings
-
-TEMPLATE_DIR = settings.BASE_DIR / "templates"
-
-
-async def send_verification_email1(to_email: str, token: str) -> None:
-    confirmation_url = f"{settings.FRONTEND_URL}/auth/verify?token=${token}"
-    templates = Jinja2Templates(directory=TEMPLATE_DIR)
-    template = templates.get_template(name="confirmation_email.html")
-    html_content = template.render(confirmation_url=confirmation_url)
-
-    message = MIMEMultipart("alternative")
-    message["From"] = settings.MAIL_USERNAME
-    message["To"] = to_email
-    message["Subject"] = "Подтверждение регистрации"
-    html_message = MIMEText(html_content, "html", "utf-8")
-    message.attach(html_message)
-
-    await aiosmtplib.send(
-        message,
-        hostname=settings.MAIL_SERVER,
-        port=settings.MAIL_PORT,
-        use_tls=True,
-        username=settings.MAIL_USERNAME,
-        password=settings.MAIL_PASSWORD,
-        timeout=5.0,
+import asyncio
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from src.core.config import settings
+from src.dtos.emails import EmailDTO
+
+if TYPE_CHECKING:
+    from src.auth.smtp import SMTPPool
+    from src.auth.templates import EmailTemplates
+
+# Создаётся при первой отправке: aiosmtplib не загружается, пока писем нет
+_smtp_pool: "SMTPPool | None" = None
+
+
+@lru_cache
+def get_email_templates() -> "EmailTemplates":
+    """Реестр шаблонов процесса; jinja2 загружается при первом письме."""
+    from src.auth.templates import EmailTemplates
+
+    return EmailTemplates(
+        settings.MAIL_TEMPLATES_DIR,
+        sender=settings.MAIL_USERNAME,
+        cache_dir=settings.MAIL_TEMPLATE_CACHE_DIR,
     )
 
 
+def get_smtp_pool() -> "SMTPPool":
+    global _smtp_pool
+    if _smtp_pool is None:
+        from src.auth.smtp import SMTPPool
+
+        _smtp_pool = SMTPPool.from_settings(settings)
+    return _smtp_pool
+
+
+async def close_smtp_pool() -> None:
+    global _smtp_pool
+    if _smtp_pool is not None:
+        await _smtp_pool.close()
+        _smtp_pool = None
+
+
 async def send_email(
     to_email: str, subject: str, template_name: str, context: dict
 ) -> None:
-    templates = Jinja2Templates(directory=TEMPLATE_DIR)
-    template = templates.get_template(name=template_name)
-    html_content = template.render(**context)
-
-    message = MIMEMultipart("alternative")
-    message["From"] = settings.MAIL_USERNAME
-    message["To"] = to_email
-    message["Subject"] = subject
-    html_message = MIMEText(html_content, "html", "utf-8")
-    message.attach(html_message)
-
-    await aiosmtplib.send(
-        message,
-        hostname=settings.MAIL_SERVER,
-        port=settings.MAIL_PORT,
-        use_tls=True,
-        username=settings.MAIL_USERNAME,
-        password=settings.MAIL_PASSWORD,
-        timeout=5.0,
-    )
+    await deliver(EmailDTO(to_email, subject, template_name, context))
 
 
-async def send_verification_email(to_email: str, token: str) -> None:
-    confirmation_url = f"{settings.FRONTEND_URL}/auth/verify?token=${token}"
+async def deliver(email: EmailDTO) -> None:
+    """Отправка письма из очереди (см. src/workers/email_outbox.py)."""
+    # Первый рендеринг шаблона включает компиляцию: не в потоке event loop
+    message = await asyncio.to_thread(get_email_templates().build, email)
+    await get_smtp_pool().send(message)
+
+
+def verification_email(to_email: str, token: str) -> EmailDTO:
+    confirmation_url = f"{settings.FRONTEND_URL}/auth/verify?token={token}"
     context = {"confirmation_url": confirmation_url}
-    await send_email(
-        to_email,
-        "Подтверждение регистрации",
-        "confirmation_email.html",
-        context,
+    return EmailDTO(
+        to_email, "Подтверждение регистрации", "confirmation_email.html", context
     )
 
 
-async def send_confirmation_reset_password(to_email: str, token: str) -> None:
+def reset_password_email(to_email: str, token: str) -> EmailDTO:
     context = {"token": token}
-    await send_email(to_email, "Сброс пароля", "reset_password.html", context)
+    return EmailDTO(to_email, "Сброс пароля", "reset_password.html", context)
+
+
+async def send_verification_email(to_email: str, token: str) -> None:
+    await deliver(verification_email(to_email, token))
+
+
+async def send_confirmation_reset_password(to_email: str, token: str) -> None:
+    await deliver(reset_password_email(to_email, token))
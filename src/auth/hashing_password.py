@@ -1,14 +1,64 @@
-from pwdlib import PasswordHash
-from pwdlib.hashers.argon2 import Argon2Hasher
-from pwdlib.hashers.bcrypt import BcryptHasher
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, TypeVar
+
+from src.core.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    from pwdlib import PasswordHash
+
+T = TypeVar("T")
+
+# argon2 и bcrypt отпускают GIL: хэширование в пуле потоков не блокирует
+# event loop, а размер пула ограничивает одновременную нагрузку на CPU
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+
+hash_queue_depth = REGISTRY.gauge(
+    "password_hash_queue_depth", "Password hash jobs queued or running"
+)
+
+
+@lru_cache(maxsize=1)
+def get_password_hash() -> "PasswordHash":
+    # pwdlib с бэкендами argon2/bcrypt загружается при первом хэшировании,
+    # а не при импорте приложения или CLI-команды
+    from pwdlib import PasswordHash
+    from pwdlib.hashers.argon2 import Argon2Hasher
+    from pwdlib.hashers.bcrypt import BcryptHasher
+
+    return PasswordHash((Argon2Hasher(), BcryptHasher()))
+
+
+@lru_cache(maxsize=1)
+def get_hash_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(HASH_WORKERS, thread_name_prefix="password-hash")
+
+
+async def run_hashing(fn: Callable[..., T], *args: object) -> T:
+    loop = asyncio.get_running_loop()
+    hash_queue_depth.inc()
+    try:
+        return await loop.run_in_executor(get_hash_executor(), fn, *args)
+    finally:
+        hash_queue_depth.dec()
 
 
 class PasswordHelper:
-    def __init__(self):
-        self.password_hash = PasswordHash((Argon2Hasher(), BcryptHasher()))
+    @property
+    def password_hash(self) -> "PasswordHash":
+        return get_password_hash()
 
     def hash(self, password: str) -> str:
         return self.password_hash.hash(password)
 
     def verify(self, plain_password, hashed_password: str) -> bool:
         return self.password_hash.verify(plain_password, hashed_password)
+
+    async def hash_async(self, password: str) -> str:
+        return await run_hashing(self.hash, password)
+
+    async def verify_async(self, plain_password, hashed_password: str) -> bool:
+        return await run_hashing(self.verify, plain_password, hashed_password)
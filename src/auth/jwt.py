@@ -1,3 +1,6 @@
+import hashlib
+import hmac
+import secrets
 from datetime import UTC, datetime, timedelta
 
 import jwt
@@ -5,6 +8,14 @@ from jwt.exceptions import InvalidTokenError
 
 from src.core.config import settings
 
+# Назначение одноразовых токенов; токен одного вида не принимается вместо другого,
+# а токен с aud не проходит как access-токен
+VERIFY_AUDIENCE = "pubspace:verify"
+RESET_PASSWORD_AUDIENCE = "pubspace:reset-password"
+
+# Верхняя граница id refresh-токена (Integer в PostgreSQL)
+MAX_REFRESH_TOKEN_ID = 2**31 - 1
+
 
 def create_access_token(
     data: dict, expires_delta: timedelta | None = None
@@ -28,3 +39,69 @@ def read_token(token: str) -> dict:
         return payload
     except InvalidTokenError:
         return {}
+
+
+def fingerprint(*values: object) -> str:
+    """
+    HMAC от состояния пользователя, которое меняется после использования
+    токена (is_verified, hashed_password): такой токен становится
+    недействительным без хранения в БД.
+    """
+    message = "\x1f".join(str(v) for v in values).encode()
+    return hmac.new(settings.SECRET.encode(), message, hashlib.sha256).hexdigest()
+
+
+def create_purpose_token(
+    user_id: int, audience: str, fingerprint: str, lifetime_seconds: int
+) -> str:
+    payload = {
+        "sub": str(user_id),
+        "aud": audience,
+        "fgp": fingerprint,
+        "exp": datetime.now(UTC) + timedelta(seconds=lifetime_seconds),
+    }
+    return jwt.encode(payload, settings.SECRET, algorithm=settings.ALGORITHM)
+
+
+def read_purpose_token(token: str, audience: str) -> tuple[int, str] | None:
+    """Возвращает (id пользователя, отпечаток) или None для неверного токена."""
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET,
+            algorithms=[settings.ALGORITHM],
+            audience=audience,
+            options={"require": ["sub", "aud", "exp", "fgp"]},
+        )
+        return int(payload["sub"]), str(payload["fgp"])
+    except (InvalidTokenError, ValueError):
+        return None
+
+
+def fingerprint_matches(token_fingerprint: str, *values: object) -> bool:
+    return hmac.compare_digest(token_fingerprint, fingerprint(*values))
+
+
+def create_refresh_secret() -> tuple[str, bytes]:
+    """
+    Секрет refresh-токена и его HMAC для хранения в БД. В секрете 256 бит
+    случайности, поэтому медленный хэш (как для паролей) не нужен.
+    """
+    secret = secrets.token_urlsafe(32)
+    return secret, refresh_digest(secret)
+
+
+def refresh_digest(secret: str) -> bytes:
+    return hmac.new(settings.SECRET.encode(), secret.encode(), hashlib.sha256).digest()
+
+
+def read_refresh_token(token: str) -> tuple[int, str] | None:
+    """Разбирает "<id>.<секрет>"; None для токена неверного формата."""
+    token_id, _, secret = token.partition(".")
+    # isdigit() без isascii() пропускает "²" и другие цифры Unicode
+    if not (token_id.isascii() and token_id.isdigit()) or not secret:
+        return None
+    id = int(token_id)
+    if id > MAX_REFRESH_TOKEN_ID:
+        return None
+    return id, secret
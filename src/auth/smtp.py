@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from email.message import Message
+
+import aiosmtplib
+
+from src.core.config import Setting
+
+logger = logging.getLogger(__name__)
+
+# Ошибки, после которых соединение нельзя возвращать в пул
+CONNECTION_ERRORS = (aiosmtplib.SMTPServerDisconnected, ConnectionError, OSError)
+
+
+class SMTPPool:
+    """
+    Пул долгоживущих SMTP-соединений: TCP/TLS-рукопожатие и AUTH выполняются
+    один раз на соединение, а не на каждое письмо. Число одновременных
+    соединений ограничено `max_size`.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], aiosmtplib.SMTP],
+        max_size: int = 4,
+        keepalive: float = 30.0,
+        connect_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+    ) -> None:
+        self.factory = factory
+        self.max_size = max_size
+        self.keepalive = keepalive
+        self.connect_attempts = connect_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._slots = asyncio.Semaphore(max_size)
+        # (соединение, время последнего использования по loop.time())
+        self._idle: deque[tuple[aiosmtplib.SMTP, float]] = deque()
+
+    @classmethod
+    def from_settings(cls, settings: Setting) -> "SMTPPool":
+        def factory() -> aiosmtplib.SMTP:
+            return aiosmtplib.SMTP(
+                hostname=settings.MAIL_SERVER,
+                port=settings.MAIL_PORT,
+                username=settings.MAIL_USERNAME,
+                password=settings.MAIL_PASSWORD,
+                use_tls=settings.MAIL_USE_TLS,
+                timeout=settings.MAIL_TIMEOUT_SECONDS,
+            )
+
+        return cls(
+            factory,
+            max_size=settings.MAIL_POOL_SIZE,
+            keepalive=settings.MAIL_KEEPALIVE_SECONDS,
+        )
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        delay = self.backoff
+        for attempt in range(1, self.connect_attempts + 1):
+            client = self.factory()
+            try:
+                await client.connect()
+                return client
+            except (aiosmtplib.SMTPException, OSError) as e:
+                if attempt == self.connect_attempts:
+                    raise
+                logger.warning(
+                    "SMTP connect failed (attempt %s): %s, retry in %.1fs",
+                    attempt,
+                    e,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+        raise AssertionError("unreachable")
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        now = asyncio.get_running_loop().time()
+        while self._idle:
+            # LIFO: последнее использованное соединение вероятнее всего живо
+            client, last_used = self._idle.pop()
+            if not client.is_connected:
+                continue
+            if now - last_used > self.keepalive:
+                try:
+                    await client.noop()
+                except (aiosmtplib.SMTPException, *CONNECTION_ERRORS):
+                    client.close()
+                    continue
+            return client
+        return await self._connect()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        async with self._slots:
+            client = await self._acquire()
+            try:
+                yield client
+            except aiosmtplib.SMTPResponseException:
+                # Сервер отклонил письмо, но соединение исправно
+                await self._reset(client)
+                raise
+            except BaseException:
+                client.close()
+                raise
+            else:
+                self._release(client)
+
+    def _release(self, client: aiosmtplib.SMTP) -> None:
+        if client.is_connected:
+            self._idle.append((client, asyncio.get_running_loop().time()))
+
+    async def _reset(self, client: aiosmtplib.SMTP) -> None:
+        try:
+            await client.rset()
+        except (aiosmtplib.SMTPException, *CONNECTION_ERRORS):
+            client.close()
+        else:
+            self._release(client)
+
+    async def send(self, message: Message) -> None:
+        """Отправляет письмо. Обрыв простаивавшего соединения повторяется один раз."""
+        try:
+            async with self.connection() as client:
+                await client.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            async with self.connection() as client:
+                await client.send_message(message)
+
+    async def close(self) -> None:
+        while self._idle:
+            client, _ = self._idle.pop()
+            try:
+                await client.quit()
+            except (aiosmtplib.SMTPException, *CONNECTION_ERRORS):
+                client.close()
@@ -0,0 +1,105 @@
+from collections.abc import Iterable
+from email.charset import BASE64, Charset
+from email.message import Message
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
+from typing import Any
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    TemplateNotFound,
+    select_autoescape,
+)
+
+from src.dtos.emails import EmailDTO
+
+# Кодировка тела письма; Charset создаётся один раз на процесс
+UTF8 = Charset("utf-8")
+UTF8.body_encoding = BASE64
+
+
+class EmailTemplates:
+    """
+    Реестр шаблонов писем процесса. Шаблон компилируется при первом обращении
+    и далее берётся из памяти; скомпилированный байткод кэшируется на диске и
+    переживает перезапуск процесса.
+    """
+
+    def __init__(
+        self, directory: Path, sender: str, cache_dir: Path | None = None
+    ) -> None:
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        self.env = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=select_autoescape(),
+            bytecode_cache=FileSystemBytecodeCache(
+                str(cache_dir) if cache_dir else None
+            ),
+            # Шаблоны не меняются во время работы: без stat() на каждый вызов
+            auto_reload=False,
+        )
+        self.sender = sender
+        self._templates: dict[str, Template] = {}
+
+    def get(self, name: str) -> Template:
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.env.get_template(name)
+        return template
+
+    def exists(self, name: str) -> bool:
+        try:
+            self.get(name)
+        except TemplateNotFound:
+            return False
+        return True
+
+    def render(self, name: str, context: dict[str, Any]) -> str:
+        return self.get(name).render(context)
+
+    def render_many(self, name: str, contexts: Iterable[dict[str, Any]]) -> list[str]:
+        """Рендерит один шаблон для набора контекстов."""
+        render = self.get(name).render
+        return [render(context) for context in contexts]
+
+    @staticmethod
+    def html_part(html: str) -> MIMEText:
+        return MIMEText(html, "html", UTF8)
+
+    def message(self, to_email: str, subject: str, part: Message) -> MIMEMultipart:
+        message = MIMEMultipart("alternative")
+        message["From"] = self.sender
+        message["To"] = to_email
+        message["Subject"] = subject
+        message.attach(part)
+        return message
+
+    def build(self, email: EmailDTO) -> MIMEMultipart:
+        html = self.render(email.template_name, email.context)
+        return self.message(email.to_email, email.subject, self.html_part(html))
+
+    def build_many(
+        self,
+        name: str,
+        subject: str,
+        recipients: Iterable[tuple[str, dict[str, Any]]],
+    ) -> list[MIMEMultipart]:
+        """
+        Письма одного шаблона для списка (адрес, контекст). Одинаковое тело
+        кодируется в MIME-часть один раз и разделяется между письмами.
+        """
+        recipients = list(recipients)
+        bodies = self.render_many(name, (context for _, context in recipients))
+        parts: dict[str, MIMEText] = {}
+        messages = []
+        for (to_email, _), html in zip(recipients, bodies):
+            part = parts.get(html)
+            if part is None:
+                part = parts[html] = self.html_part(html)
+            messages.append(self.message(to_email, subject, part))
+        return messages
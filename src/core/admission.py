@@ -0,0 +1,73 @@
+import time
+
+from src.core.metrics import REGISTRY
+
+# Пути без ограничения: метрики и документация нужны и под перегрузкой
+EXEMPT_PATHS = ("/metrics", "/docs", "/redoc", "/openapi.json")
+# Маршруты с хэшированием паролей (CPU, пул HASH_WORKERS). Остальные /auth/*
+# (refresh, verify, письма) — только HMAC и БД, они не делят лимит со входом
+AUTH_PATHS = frozenset({"/auth/login", "/auth/reset-password", "/users/register"})
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+admission_limit = REGISTRY.gauge(
+    "admission_concurrency_limit", "Current adaptive concurrency limit", ("cls",)
+)
+admission_rejected = REGISTRY.counter(
+    "admission_rejected", "Requests shed with 503 by admission control", ("cls",)
+)
+
+
+def route_class(method: str, path: str) -> str | None:
+    """Класс маршрута для ограничения: auth, read или write; None — без ограничения."""
+    if path.startswith(EXEMPT_PATHS):
+        return None
+    if path in AUTH_PATHS:
+        return "auth"
+    return "read" if method in READ_METHODS else "write"
+
+
+class AdaptiveLimit:
+    """
+    Ограничение числа одновременных запросов по AIMD: пока задержка ниже
+    `target`, лимит растёт примерно на 1 за каждые `limit` запросов; при
+    превышении (или 503 от приложения) умножается на `backoff`, но не чаще
+    раза за `target` секунд — иначе один всплеск обрушит лимит до минимума.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        target: float,
+        min_limit: int = 1,
+        backoff: float = 0.9,
+    ) -> None:
+        self.name = name
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.target = target
+        self.backoff = backoff
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        admission_limit.set(self.limit, name)
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            admission_rejected.inc(self.name)
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float, overloaded: bool = False) -> None:
+        self.in_flight -= 1
+        if overloaded or latency > self.target:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.target:
+                self._last_decrease = now
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                admission_limit.set(self.limit, self.name)
+        elif self.in_flight + 1 >= self.limit / 2 and self.limit < self.max_limit:
+            # Растём, только если лимит действительно используется
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            admission_limit.set(self.limit, self.name)
@@ -1,5 +1,6 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
 
 from pydantic import AnyHttpUrl, EmailStr, PostgresDsn, field_validator
 from pydantic_core.core_schema import FieldValidationInfo
@@ -18,8 +19,66 @@ class Setting(BaseSettings):
     MAIL_PORT: int
     MAIL_USERNAME: EmailStr
     MAIL_PASSWORD: str
+    MAIL_USE_TLS: bool = True
+    MAIL_TIMEOUT_SECONDS: float = 5.0
+    MAIL_POOL_SIZE: int = 4
+    MAIL_KEEPALIVE_SECONDS: float = 30.0
+    MAIL_TEMPLATES_DIR: Path = Path(__file__).parent.parent.parent / "templates"
+    # Каталог байткода шаблонов; None — системный временный каталог
+    MAIL_TEMPLATE_CACHE_DIR: Path | None = None
+    # Ограничение скорости рассылок, писем в секунду
+    MAIL_RATE_PER_SECOND: float = 20.0
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_POLL_SECONDS: float = 1.0
     VERIFICATION_TOKEN_LIFETIME_SECONDS: int = 3600  # 1 час
+    RESET_PASSWORD_TOKEN_LIFETIME_SECONDS: int = 3600
+    REFRESH_TOKEN_LIFETIME_SECONDS: int = 30 * 24 * 3600  # 30 дней
     FRONTEND_URL: str
+    # Как часто искать удаления пользователей, брошенные упавшим процессом
+    USER_DELETION_SWEEP_SECONDS: float = 60.0
+    # Как часто искать рассылки, брошенные упавшим процессом
+    BROADCAST_SWEEP_SECONDS: float = 60.0
+
+    # Сжатие ответов: минимальный размер тела, уровни и объём кэша сжатых тел
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CACHE_BYTES: int = 16 * 1024 * 1024
+
+    # Контроль допуска: максимальный лимит одновременных запросов и целевая
+    # задержка по классам маршрутов; класс без лимита не ограничивается
+    ADMISSION_LIMITS: dict[str, int] = {"auth": 8, "read": 32, "write": 16}
+    ADMISSION_TARGET_SECONDS: dict[str, float] = {
+        "auth": 1.0,
+        "read": 0.25,
+        "write": 0.5,
+    }
+
+    # Профилирование запросов: доля случайных запросов (0 — только по
+    # заголовку X-Profile от суперпользователя), частота сэмплов, отчёты
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_SECONDS: float = 0.002
+    # Каталог отчётов, общий для воркеров; None — <tmp>/profiles
+    PROFILE_DIR: Path | None = None
+    PROFILE_KEEP: int = 200
+
+    # Мониторинг event loop: период замера задержки и порог блокировки,
+    # после которого в лог пишется стек блокирующего вызова
+    LOOP_LAG_INTERVAL_SECONDS: float = 0.05
+    LOOP_BLOCK_THRESHOLD_SECONDS: float = 0.1
+
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    # SQL и события пула соединений (раньше echo=True у движка)
+    LOG_SQL: bool = False
+    # Доля сохраняемых записей ниже WARNING по префиксу логгера
+    LOG_SAMPLING: dict[str, float] = {"sqlalchemy": 0.1}
+    LOG_QUEUE_SIZE: int = 10_000
+
+    # Каталог снимков метрик для нескольких воркеров uvicorn; None — один процесс
+    METRICS_MULTIPROC_DIR: Path | None = None
+    METRICS_FLUSH_SECONDS: float = 5.0
 
     POSTGRES_HOST: str
     POSTGRES_PORT: int
@@ -55,4 +114,16 @@ class Setting(BaseSettings):
         raise ValueError(v)
 
 
-settings = Setting()
+@lru_cache(maxsize=1)
+def get_settings() -> Setting:
+    return Setting()
+
+
+class LazySettings:
+    """Откладывает чтение окружения и .env до первого обращения к настройке."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+
+settings = cast(Setting, LazySettings())
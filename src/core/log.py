@@ -0,0 +1,169 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO
+
+from src.core.metrics import REGISTRY
+
+# Идентификатор запроса для корреляции записей (см. RequestIdMiddleware)
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Увеличивается из потока, который пишет в лог, а не только из event loop
+log_records_dropped = REGISTRY.counter(
+    "log_records_dropped",
+    "Log records dropped because the queue was full",
+    locked=True,
+)
+
+_listener: QueueListener | None = None
+
+# Атрибуты LogRecord, которые не попадают в JSON как extra
+RECORD_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Добавляет request_id в запись в потоке, где она создана."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает долю `rate` записей ниже WARNING от шумных логгеров (по
+    префиксу имени). Предупреждения и ошибки проходят всегда.
+    """
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        # Длинные префиксы первыми: `sqlalchemy.engine` важнее `sqlalchemy`
+        self.rates = sorted(rates.items(), key=lambda item: -len(item[0]))
+
+    def rate_for(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRS:
+                data[key] = value
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Кладёт запись в ограниченную очередь и сразу возвращает управление. В
+    потоке приложения только подставляются аргументы сообщения и
+    форматируется traceback; JSON и запись в поток — в потоке QueueListener.
+    При переполнении запись отбрасывается и учитывается в метрике.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
+def configure_logging(
+    level: str | int = logging.INFO,
+    json_format: bool = True,
+    sampling: dict[str, float] | None = None,
+    sql: bool = False,
+    queue_size: int = 10_000,
+    stream: TextIO | None = None,
+) -> QueueListener:
+    """
+    Настраивает корневой логгер: запись в очередь из приложения и вывод в
+    stdout из отдельного потока. Возвращает запущенный QueueListener.
+    """
+    global _listener
+    stop_logging()
+    records: queue.Queue = queue.Queue(queue_size)
+    handler = NonBlockingQueueHandler(records)
+    if sampling:
+        handler.addFilter(SamplingFilter(sampling))
+    handler.addFilter(RequestIdFilter())
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(
+        JsonFormatter()
+        if json_format
+        else logging.Formatter(
+            "[%(asctime)s.%(msecs)03d] %(name)s %(levelname)s "
+            "[%(request_id)s] - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+    )
+    listener = QueueListener(records, output, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    # SQL и события пула идут через ту же очередь вместо echo=True движка
+    logging.getLogger("sqlalchemy.engine").setLevel(
+        logging.INFO if sql else logging.WARNING
+    )
+    logging.getLogger("sqlalchemy.pool").setLevel(
+        logging.INFO if sql else logging.WARNING
+    )
+
+    listener.start()
+    _listener = listener
+    return listener
+
+
+def stop_logging() -> None:
+    """Дописывает оставшиеся в очереди записи и останавливает поток вывода."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,162 @@
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from src.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+event_loop_lag = REGISTRY.histogram(
+    "event_loop_lag_seconds",
+    "Delay of a periodic event loop callback beyond its schedule",
+    buckets=LAG_BUCKETS,
+)
+event_loop_blocked = REGISTRY.counter(
+    "event_loop_blocked", "Callbacks that blocked the event loop over the threshold"
+)
+
+
+@dataclass(slots=True)
+class BlockingCall:
+    duration: float
+    task: str | None
+    stack: str
+
+
+class LoopMonitor:
+    """
+    Задача в event loop раз в `interval` секунд отмечает пульс и измеряет
+    задержку своего пробуждения (lag). Поток-сторож следит за пульсом: если
+    loop не отвечает дольше `threshold`, он снимает стек потока loop — это
+    стек блокирующего вызова — и после восстановления пульса пишет в лог
+    длительность блокировки, имя задачи и этот стек. Блокировку, после
+    которой пульс не успел восстановиться, записывает `stop()`.
+    """
+
+    def __init__(
+        self, interval: float = 0.05, threshold: float = 0.1, keep: int = 100
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.keep = keep
+        self.blocks: list[BlockingCall] = []
+        self._beat = time.monotonic()
+        self._stopped_at = 0.0
+        # Завершённые блокировки от сторожа; записываются в потоке loop
+        self._done: deque[BlockingCall] = deque()
+        self._stop = threading.Event()
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = loop.create_task(self._measure(loop))
+        self._watchdog = threading.Thread(
+            target=self._watch,
+            args=(loop, threading.get_ident()),
+            name="loop-watchdog",
+            daemon=True,
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped_at = time.monotonic()
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        if self._watchdog is not None:
+            self._watchdog.join()
+        self._flush()
+
+    async def _measure(self, loop: asyncio.AbstractEventLoop) -> None:
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            event_loop_lag.observe(max(0.0, loop.time() - scheduled))
+            self._beat = time.monotonic()
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, thread_id: int) -> None:
+        # Проверяем чаще порога, чтобы застать блокирующий вызов
+        period = min(self.interval, self.threshold) / 2
+        blocked_since: float | None = None
+        captured: BlockingCall | None = None
+        while not self._stop.wait(period):
+            beat = self._beat
+            overdue = time.monotonic() - beat - self.interval
+            if overdue > self.threshold:
+                if blocked_since != beat:
+                    blocked_since = beat
+                    captured = self.capture(loop, thread_id)
+            elif captured is not None:
+                captured.duration = beat - blocked_since - self.interval
+                self._done.append(captured)
+                # Метрики и список изменяются только из потока loop
+                loop.call_soon_threadsafe(self._flush)
+                blocked_since = captured = None
+        if captured is not None:
+            # stop() вызван из loop сразу после блокировки, до пульса
+            end = self._beat if self._beat != blocked_since else self._stopped_at
+            captured.duration = end - blocked_since - self.interval
+            self._done.append(captured)
+
+    def _flush(self) -> None:
+        while self._done:
+            self.record(self._done.popleft())
+
+    def capture(self, loop: asyncio.AbstractEventLoop, thread_id: int) -> BlockingCall:
+        frame = sys._current_frames().get(thread_id)
+        task = asyncio.current_task(loop)
+        return BlockingCall(
+            duration=0.0,
+            task=task.get_name() if task is not None else None,
+            stack="".join(traceback.format_stack(frame)) if frame else "",
+        )
+
+    def record(self, block: BlockingCall) -> None:
+        event_loop_blocked.inc()
+        self.blocks.append(block)
+        del self.blocks[:-self.keep]
+        logger.warning(
+            "Event loop blocked for %.3fs in task %s:\n%s",
+            block.duration,
+            block.task,
+            block.stack,
+        )
+
+
+class BlockingDetected(AssertionError):
+    pass
+
+
+@asynccontextmanager
+async def assert_no_blocking(budget: float = 0.05) -> AsyncIterator[LoopMonitor]:
+    """
+    Для тестов: падает, если внутри блока event loop был заблокирован дольше
+    `budget` секунд, и показывает стек блокирующего вызова.
+    """
+    monitor = LoopMonitor(interval=budget / 2, threshold=budget)
+    monitor.start()
+    try:
+        yield monitor
+    finally:
+        await monitor.stop()
+    if monitor.blocks:
+        worst = max(monitor.blocks, key=lambda block: block.duration)
+        raise BlockingDetected(
+            f"Event loop blocked for {worst.duration:.3f}s "
+            f"(budget {budget:.3f}s) in task {worst.task}:\n{worst.stack}"
+        )
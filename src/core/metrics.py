@@ -0,0 +1,268 @@
+import asyncio
+import json
+import math
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+# Метрики изменяются только из потока event loop, поэтому блокировки не нужны
+# (кроме LockedCounter для вызовов из любых потоков): каждый воркер накапливает
+# свои значения, а при нескольких процессах они сводятся при сборе через файлы
+# снимков (см. MetricsRegistry.collect).
+
+Labels = tuple[tuple[str, str], ...]
+# {(имя сэмпла, метки): значение}
+Samples = dict[tuple[str, Labels], float]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+
+    def labels_key(self, labels: tuple[str, ...]) -> Labels:
+        return tuple(zip(self.labelnames, labels))
+
+    def samples(self) -> Samples:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Samples:
+        return {
+            (f"{self.name}_total", self.labels_key(k)): v
+            for k, v in self._values.items()
+        }
+
+
+class LockedCounter(Counter):
+    """Счётчик, который можно увеличивать из любого потока (например, из логгера)."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            super().inc(*labels, amount=amount)
+
+    def samples(self) -> Samples:
+        with self._lock:
+            return super().samples()
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def samples(self) -> Samples:
+        return {(self.name, self.labels_key(k)): v for k, v in self._values.items()}
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = (*buckets, math.inf)
+        # [счётчики по корзинам (не накопительные)..., сумма]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._values.get(labels)
+        if counts is None:
+            counts = self._values[labels] = [0.0] * (len(self.buckets) + 1)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        counts[-1] += value
+
+    def samples(self) -> Samples:
+        samples: Samples = {}
+        for labels, counts in self._values.items():
+            key = self.labels_key(labels)
+            total = 0.0
+            for bound, count in zip(self.buckets, counts):
+                total += count
+                le = "+Inf" if bound == math.inf else repr(bound)
+                samples[(f"{self.name}_bucket", (*key, ("le", le)))] = total
+            samples[(f"{self.name}_sum", key)] = counts[-1]
+            samples[(f"{self.name}_count", key)] = total
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+        # Вызываются перед сбором: обновляют gauge текущим состоянием (пул БД и т.п.)
+        self.collectors: list[Callable[[], None]] = []
+        self.multiprocess_dir: Path | None = None
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        locked: bool = False,
+    ) -> Counter:
+        cls = LockedCounter if locked else Counter
+        return self.register(cls(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: tuple[str, ...] = (), **kwargs
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, **kwargs))
+
+    def snapshot(self) -> dict[str, Samples]:
+        for collect in self.collectors:
+            collect()
+        return {name: metric.samples() for name, metric in self.metrics.items()}
+
+    def write_snapshot(self) -> None:
+        """Сохраняет снимок этого процесса в каталог multiprocess_dir."""
+        if self.multiprocess_dir is None:
+            return
+        data = {
+            name: [[sample, labels, value] for (sample, labels), value in s.items()]
+            for name, s in self.snapshot().items()
+        }
+        fd, tmp = tempfile.mkstemp(dir=self.multiprocess_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        # Атомарная замена: читатель не увидит наполовину записанный файл
+        os.replace(tmp, self.multiprocess_dir / f"{os.getpid()}.json")
+
+    def read_snapshots(self) -> Iterable[tuple[int, dict[str, Samples]]]:
+        for path in self.multiprocess_dir.glob("*.json"):
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            yield int(path.stem), {
+                name: {
+                    (sample, tuple(tuple(label) for label in labels)): value
+                    for sample, labels, value in samples
+                }
+                for name, samples in data.items()
+            }
+
+    def collect(self) -> dict[str, Samples]:
+        """
+        Значения для экспорта. В многопроцессном режиме суммирует снимки всех
+        воркеров; gauge учитываются только для живых процессов.
+        """
+        if self.multiprocess_dir is None:
+            return self.snapshot()
+        self.write_snapshot()
+        merged: dict[str, Samples] = {name: {} for name in self.metrics}
+        for pid, snapshot in self.read_snapshots():
+            alive = pid_alive(pid)
+            for name, samples in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None or (metric.type == "gauge" and not alive):
+                    continue
+                target = merged[name]
+                for key, value in samples.items():
+                    target[key] = target.get(key, 0.0) + value
+        return merged
+
+    def render(self) -> str:
+        """Текстовый формат экспозиции Prometheus."""
+        lines = []
+        for name, samples in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for (sample, labels), value in samples.items():
+                lines.append(f"{sample}{format_labels(labels)} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+async def flush_snapshots(registry: MetricsRegistry, interval: float) -> None:
+    """
+    Периодически сохраняет снимок процесса, чтобы /metrics другого воркера
+    видел свежие значения этого.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        registry.write_snapshot()
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{escape_label(v)}"' for k, v in labels) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+http_requests = REGISTRY.counter(
+    "http_requests", "HTTP requests by route template", ("method", "route", "status")
+)
+http_request_duration = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+http_in_flight = REGISTRY.gauge(
+    "http_requests_in_flight", "HTTP requests being processed", ("method", "route")
+)
+cache_requests = REGISTRY.counter(
+    "cache_requests", "Cache lookups by result (hit/miss)", ("cache", "result")
+)
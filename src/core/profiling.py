@@ -0,0 +1,223 @@
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from src.core.config import settings
+
+# Категории времени запроса (первый элемент каждого стека в отчёте)
+EVENT_LOOP = "event_loop"
+SERIALIZATION = "serialization"
+COMPRESSION = "compression"
+DB_WAIT = "db_wait"
+HASHING = "hashing"
+WAIT = "wait"
+
+DB_MODULES = ("sqlalchemy", "aiosqlite", "asyncpg")
+SERIALIZATION_MODULES = ("pydantic", "json", "fastapi.encoders", "src.api.responses")
+SERIALIZATION_FUNCTIONS = frozenset({"serialize_response"})
+COMPRESSION_MODULES = ("gzip", "brotli")
+COMPRESSION_FUNCTIONS = frozenset({"compress", "compress_cached"})
+HASHING_MODULES = ("src.auth.hashing_password",)
+
+# Глубже этого стек обрезается (сохраняются внутренние кадры)
+MAX_DEPTH = 64
+
+
+def frame_module(frame: FrameType) -> str:
+    return frame.f_globals.get("__name__", "?")
+
+
+def frame_label(frame: FrameType) -> str:
+    return f"{frame_module(frame)}:{frame.f_code.co_qualname}"
+
+
+def thread_stack(frame: FrameType | None) -> list[FrameType]:
+    """Кадры выполняющегося потока от корня к текущему."""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def await_stack(coro: Any) -> list[FrameType]:
+    """
+    Кадры приостановленной корутины по цепочке await от корня задачи до места
+    ожидания (Task.get_stack возвращает только внешний кадр).
+    """
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+def in_modules(
+    frames: Iterable[FrameType],
+    prefixes: tuple[str, ...],
+    functions: frozenset[str] = frozenset(),
+) -> bool:
+    return any(
+        f.f_code.co_name in functions or frame_module(f).startswith(prefixes)
+        for f in frames
+    )
+
+
+def classify(frames: list[FrameType], running: bool) -> str:
+    """
+    running — задача запроса выполняется в event loop: сериализация, сжатие
+    или прочая работа в потоке loop (включая ORM). Иначе задача ждёт: БД, пул
+    хэширования паролей или что-то ещё (клиент, занятый другими задачами loop).
+    """
+    if running:
+        if in_modules(frames, SERIALIZATION_MODULES, SERIALIZATION_FUNCTIONS):
+            return SERIALIZATION
+        if in_modules(frames, COMPRESSION_MODULES, COMPRESSION_FUNCTIONS):
+            return COMPRESSION
+        return EVENT_LOOP
+    if in_modules(frames, HASHING_MODULES):
+        return HASHING
+    if in_modules(frames, DB_MODULES):
+        return DB_WAIT
+    return WAIT
+
+
+class RequestProfiler:
+    """
+    Сэмплирующий профилировщик одной задачи asyncio. Поток раз в `interval`
+    секунд смотрит, выполняется ли задача в event loop: если да — берёт стек
+    потока loop, если нет — цепочку await задачи. Каждый сэмпл весит время,
+    прошедшее с предыдущего, поэтому задержки сэмплера из-за GIL не искажают
+    доли категорий. Конкурентные запросы в отчёт не попадают.
+    """
+
+    def __init__(self, interval: float = 0.002) -> None:
+        self.interval = interval
+        # "категория;кадр;...;кадр" -> секунды
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.started = self.duration = 0.0
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(loop, task, threading.get_ident()),
+            name="request-profiler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def sample(
+        self, loop: asyncio.AbstractEventLoop, task: asyncio.Task, thread_id: int
+    ) -> str:
+        running = asyncio.current_task(loop) is task
+        if running:
+            frames = thread_stack(sys._current_frames().get(thread_id))
+        else:
+            frames = await_stack(task.get_coro())
+        category = classify(frames, running)
+        return ";".join([category, *map(frame_label, frames[-MAX_DEPTH:])])
+
+    def _run(
+        self, loop: asyncio.AbstractEventLoop, task: asyncio.Task, thread_id: int
+    ) -> None:
+        last = self.started
+        while not self._stop.wait(self.interval):
+            stack = self.sample(loop, task, thread_id)
+            now = time.perf_counter()
+            self.stacks[stack] += now - last
+            self.samples += 1
+            last = now
+
+    def breakdown(self) -> dict[str, float]:
+        totals: Counter[str] = Counter()
+        for stack, seconds in self.stacks.items():
+            totals[stack.partition(";")[0]] += seconds
+        return dict(totals)
+
+    def collapsed(self) -> str:
+        """
+        Формат collapsed stacks (flamegraph.pl, speedscope): вес — микросекунды.
+        """
+        return "".join(
+            f"{stack} {round(seconds * 1_000_000)}\n"
+            for stack, seconds in self.stacks.most_common()
+        )
+
+    def report(self, **meta: Any) -> dict[str, Any]:
+        return {
+            **meta,
+            "duration": self.duration,
+            "interval": self.interval,
+            "samples": self.samples,
+            "breakdown": self.breakdown(),
+            "collapsed": self.collapsed(),
+        }
+
+
+class ProfileStore:
+    """
+    Отчёты в каталоге, общем для воркеров src.server: отчёт читается любым
+    воркером, а не только тем, что обработал запрос. Хранятся последние `keep`.
+    """
+
+    def __init__(self, directory: Path, keep: int = 200) -> None:
+        self.directory = directory
+        self.keep = keep
+
+    def path(self, profile_id: str) -> Path:
+        return self.directory / f"{profile_id}.json"
+
+    def save(self, profile_id: str, report: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f"{profile_id}.tmp"
+        tmp.write_text(json.dumps(report))
+        tmp.replace(self.path(profile_id))
+        for old in self.list()[self.keep:]:
+            old.unlink(missing_ok=True)
+
+    def list(self) -> list[Path]:
+        """Отчёты от новых к старым."""
+        reports = []
+        for path in self.directory.glob("*.json"):
+            try:
+                reports.append((path.stat().st_mtime, path))
+            except FileNotFoundError:  # удалён другим воркером
+                continue
+        return [path for _, path in sorted(reports, reverse=True)]
+
+    def load(self, profile_id: str) -> dict[str, Any] | None:
+        try:
+            return json.loads(self.path(profile_id).read_text())
+        except (OSError, ValueError):
+            return None
+
+
+@lru_cache(maxsize=1)
+def get_profile_store() -> ProfileStore:
+    directory = settings.PROFILE_DIR or Path(tempfile.gettempdir()) / "profiles"
+    return ProfileStore(directory, settings.PROFILE_KEEP)
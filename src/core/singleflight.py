@@ -0,0 +1,70 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from src.core.metrics import REGISTRY
+
+T = TypeVar("T")
+
+singleflight_requests = REGISTRY.counter(
+    "singleflight_requests",
+    "Reads by role: leader ran the fetch, coalesced awaited its result",
+    ("flight", "result"),
+)
+
+
+class SingleFlight:
+    """
+    Объединяет одновременные одинаковые чтения: первый запрос по ключу
+    выполняет `fetch`, остальные ждут его результат (или ошибку). Результаты
+    не кэшируются — после завершения следующий запрос снова идёт в БД.
+    Если первый запрос отменён или его ошибка отмечена `retry_if` (запрос
+    прерван из-за отключения клиента или его дедлайна), ожидающие повторяют
+    попытку, и один из них выполняет `fetch` сам.
+    """
+
+    def __init__(
+        self, name: str, retry_if: Callable[[BaseException], bool] | None = None
+    ) -> None:
+        self.name = name
+        self.retry_if = retry_if
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[T]]) -> T:
+        while (future := self._calls.get(key)) is not None:
+            try:
+                # shield: отмена ожидающего не должна отменять общий результат
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue
+                raise
+            singleflight_requests.inc(self.name, "coalesced")
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        singleflight_requests.inc(self.name, "leader")
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            if self.retry_if is not None and self.retry_if(exc):
+                # Ошибка касается только первого запроса, не общего результата
+                future.cancel()
+                raise
+            future.set_exception(exc)
+            # Помечаем исключение полученным, даже если ожидающих не было
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
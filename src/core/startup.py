@@ -0,0 +1,28 @@
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class StartupReport:
+    """Длительность фаз запуска приложения, выводится одной строкой в лог."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: list[tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - started) * 1000))
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def log(self, logger: logging.Logger) -> None:
+        phases = ", ".join(f"{name}={ms:.1f}ms" for name, ms in self.phases)
+        logger.info("Startup finished in %.1f ms (%s)", self.total_ms, phases)
@@ -1,20 +1,75 @@
+import os
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy import event
+from sqlalchemy import URL, event, make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import QueuePool
+
+from src.core.metrics import REGISTRY
+from src.db.timeouts import enable_statement_timeouts
+
+DATABASE_URL = "sqlite+aiosqlite:///db.sqlite3"
+
+# Размер пула на процесс. При нескольких воркерах задаётся src.server так,
+# чтобы сумма по воркерам не превышала DB_MAX_CONNECTIONS
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+
+# Размер кэша скомпилированных SQL-выражений SQLAlchemy (на движок)
+QUERY_CACHE_SIZE = 1200
+# Размер кэша prepared statements asyncpg (на каждое соединение пула)
+PREPARED_STATEMENT_CACHE_SIZE = 256
+
+
+def engine_options(url: str | URL) -> dict[str, Any]:
+    """Общие параметры движка, зависящие от драйвера БД."""
+    options: dict[str, Any] = {"query_cache_size": QUERY_CACHE_SIZE}
+    if make_url(url).get_driver_name() == "asyncpg":
+        # Повторные запросы с тем же SQL исполняются без повторного PREPARE
+        options["connect_args"] = {
+            "prepared_statement_cache_size": PREPARED_STATEMENT_CACHE_SIZE
+        }
+    return options
+
 
 async_engine = create_async_engine(
-    "sqlite+aiosqlite:///db.sqlite3",
-    echo=True,
-    echo_pool=True,
-    pool_size=5,
-    max_overflow=10,
+    DATABASE_URL,
+    # Логи SQL включаются через logging (LOG_SQL), см. src.core.log
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    **engine_options(DATABASE_URL),
+)
+
+enable_statement_timeouts(async_engine)
+
+db_pool_connections = REGISTRY.gauge(
+    "db_pool_connections", "Connections in the SQLAlchemy pool by state", ("state",)
 )
 
+
+def pool_stats_collector(engine: AsyncEngine) -> None:
+    """Обновляет gauge пула соединений перед сбором метрик."""
+
+    def collect() -> None:
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            return
+        db_pool_connections.set(pool.checkedout(), "checked_out")
+        db_pool_connections.set(pool.checkedin(), "idle")
+        db_pool_connections.set(max(pool.overflow(), 0), "overflow")
+        db_pool_connections.set(pool.size(), "size")
+
+    REGISTRY.collectors.append(collect)
+
+
+pool_stats_collector(async_engine)
+
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
     autoflush=False,
@@ -0,0 +1,118 @@
+import sqlite3
+import time
+
+from sqlalchemy import Connection, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from src.core.metrics import REGISTRY
+
+DEADLINE_KEY = "query_deadline"
+# Как часто (в инструкциях VM) SQLite вызывает обработчик прогресса
+SQLITE_PROGRESS_STEPS = 1000
+# SQLSTATE query_canceled в PostgreSQL
+PG_QUERY_CANCELED = "57014"
+
+query_timeouts = REGISTRY.counter(
+    "db_query_timeouts", "Queries interrupted by statement timeout", ("route",)
+)
+
+
+class QueryDeadline:
+    """Момент (по time.monotonic), после которого запросы сессии прерываются."""
+
+    __slots__ = ("expires_at", "backend_pid")
+
+    def __init__(self, expires_at: float) -> None:
+        self.expires_at = expires_at
+        # PID серверного процесса PostgreSQL, пока соединение занято сессией
+        self.backend_pid: int | None = None
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def expire(self) -> None:
+        self.expires_at = 0.0
+
+
+def set_query_deadline(session: AsyncSession, seconds: float) -> QueryDeadline:
+    """Ограничивает время SQL-запросов сессии. Применяется при начале транзакции."""
+    deadline = QueryDeadline(time.monotonic() + seconds)
+    session.info[DEADLINE_KEY] = deadline
+    return deadline
+
+
+def clear_query_deadline(session: AsyncSession) -> None:
+    session.info.pop(DEADLINE_KEY, None)
+
+
+async def interrupt_queries(session: AsyncSession) -> None:
+    """Прерывает текущий запрос сессии из другой задачи (при отключении клиента)."""
+    deadline: QueryDeadline | None = session.info.get(DEADLINE_KEY)
+    if deadline is None:
+        return
+    deadline.expire()
+    if deadline.backend_pid is not None:
+        async with session.bind.connect() as conn:
+            await conn.execute(
+                text("SELECT pg_cancel_backend(:pid)"), {"pid": deadline.backend_pid}
+            )
+
+
+def is_query_timeout(exc: DBAPIError) -> bool:
+    orig = exc.orig
+    if isinstance(orig, sqlite3.OperationalError):
+        return str(orig) == "interrupted"
+    return getattr(orig, "sqlstate", None) == PG_QUERY_CANCELED
+
+
+@event.listens_for(Session, "after_begin")
+def apply_query_deadline(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    deadline: QueryDeadline | None = session.info.get(DEADLINE_KEY)
+    if deadline is None:
+        return
+    # Снимается при возврате соединения в пул (см. enable_statement_timeouts)
+    connection.connection.info[DEADLINE_KEY] = deadline
+    if connection.dialect.name == "postgresql":
+        deadline.backend_pid = connection.connection.driver_connection.get_server_pid()
+        # SET LOCAL: таймаут сбрасывается вместе с транзакцией
+        timeout_ms = max(1, int(deadline.remaining() * 1000))
+        connection.execute(
+            text("SELECT set_config('statement_timeout', :ms, true)"),
+            {"ms": str(timeout_ms)},
+        )
+
+
+def enable_statement_timeouts(engine: AsyncEngine) -> None:
+    """
+    Отвязывает дедлайн от соединения при возврате в пул. Для SQLite также
+    ставит на каждое соединение обработчик прогресса, который прерывает запрос
+    после дедлайна; PostgreSQL использует statement_timeout.
+    """
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def release_deadline(dbapi_connection, connection_record) -> None:
+        deadline = connection_record.info.pop(DEADLINE_KEY, None)
+        if deadline is not None:
+            deadline.backend_pid = None
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def install_interrupt(dbapi_connection, connection_record) -> None:
+        info = connection_record.info
+
+        def interrupt() -> bool:
+            deadline = info.get(DEADLINE_KEY)
+            return deadline is not None and deadline.expired()
+
+        dbapi_connection.run_async(
+            lambda conn: conn.set_progress_handler(interrupt, SQLITE_PROGRESS_STEPS)
+        )
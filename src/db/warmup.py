@@ -0,0 +1,35 @@
+import asyncio
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Executable
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+WarmupStatements = Sequence[tuple[Executable, dict[str, Any]]]
+
+
+async def _prime(conn: AsyncConnection, statements: WarmupStatements) -> None:
+    # Через сессию, чтобы ключи кэша совпали с ключами запросов репозиториев
+    async with AsyncSession(bind=conn) as session:
+        for stmt, params in statements:
+            await session.execute(stmt, params)
+
+
+async def warm_up_pool(
+    engine: AsyncEngine, statements: WarmupStatements, size: int | None = None
+) -> int:
+    """
+    Открывает `size` соединений пула (по умолчанию pool_size) и прогоняет на
+    каждом горячие запросы: SQLAlchemy кэширует компиляцию, а asyncpg
+    подготавливает statements заранее. Возвращает число открытых соединений.
+    """
+    if size is None:
+        size = engine.pool.size()
+    connections = await asyncio.gather(
+        *(engine.connect().start() for _ in range(size))
+    )
+    try:
+        await asyncio.gather(*(_prime(conn, statements) for conn in connections))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in connections))
+    return len(connections)
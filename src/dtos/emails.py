@@ -0,0 +1,53 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+
+@dataclass(slots=True)
+class EmailDTO:
+    to_email: str
+    subject: str
+    template_name: str
+    context: dict[str, Any] = field(default_factory=dict)
+
+    def dedupe_key(self) -> str:
+        """Ключ по умолчанию: такое же неотправленное письмо не ставится дважды."""
+        payload = json.dumps(
+            [self.to_email, self.subject, self.template_name, self.context],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class BroadcastDTO:
+    id: int
+    template_name: str
+    subject: str
+    context: dict[str, Any] = field(default_factory=dict)
+    filters: dict[str, Any] = field(default_factory=dict)
+    status: str = "pending"
+    total: int = 0
+    sent: int = 0
+    failed: int = 0
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.status == "running"
+
+    @property
+    def finished(self) -> bool:
+        return self.status == "finished"
+
+    @property
+    def sends_per_second(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        finished_at = self.finished_at or datetime.now(UTC)
+        elapsed = (finished_at - self.started_at).total_seconds()
+        return self.sent / elapsed if elapsed > 0 else 0.0
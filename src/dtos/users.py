@@ -28,7 +28,9 @@ class UserUpdateDTO:
     is_verified: bool | None = None
 
 
-@dataclass
+# slots: компактнее и быстрее создаётся, списки пользователей строятся из
+# строк выборки и сериализуются в ответ без промежуточных моделей
+@dataclass(slots=True)
 class UserReadDTO:
     id: int
     email: str
@@ -39,3 +41,19 @@ class UserReadDTO:
     is_active: bool = True
     is_superuser: bool = False
     is_verified: bool = False
+
+
+@dataclass
+class UserDeletionDTO:
+    user_id: int
+    status: str = "pending"
+    total_posts: int = 0
+    deleted_posts: int = 0
+
+    @property
+    def running(self) -> bool:
+        return self.status == "running"
+
+    @property
+    def finished(self) -> bool:
+        return self.status == "finished"
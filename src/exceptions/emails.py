@@ -0,0 +1,5 @@
+from src.exceptions.base import FastAPIUsersException
+
+
+class EmailTemplateNotExists(FastAPIUsersException):
+    pass
@@ -21,5 +21,9 @@ class InvalidResetPasswordToken(FastAPIUsersException):
     pass
 
 
+class InvalidRefreshToken(FastAPIUsersException):
+    pass
+
+
 class InvalidPassword(FastAPIUsersException):
     pass
@@ -1,17 +1,81 @@
 import asyncio
+import hashlib
+import logging
+import time
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy.engine.interfaces import Dialect
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from src.db.database import async_engine
 from src.models.base import Base
 
+logger = logging.getLogger(__name__)
+
+# Служебная таблица вне Base.metadata: не участвует в create_all и отпечатке
+schema_state = Table(
+    "schema_state",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def schema_fingerprint(metadata: MetaData, dialect: Dialect) -> str:
+    """SHA-256 от DDL всех таблиц и индексов в диалекте целевой БД."""
+    digest = hashlib.sha256()
+    for table in metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    return digest.hexdigest()
+
+
+def stored_fingerprint(conn: Connection) -> str | None:
+    if not inspect(conn).has_table(schema_state.name):
+        return None
+    return conn.execute(select(schema_state.c.fingerprint)).scalar()
+
 
-async def init_db():
-    async with async_engine.begin() as conn:
+async def init_db(engine: AsyncEngine = async_engine) -> bool:
+    """Создаёт схему, если она изменилась. Возвращает True, если выполнялся DDL."""
+    async with engine.begin() as conn:
+        fingerprint = schema_fingerprint(Base.metadata, conn.dialect)
+        if await conn.run_sync(stored_fingerprint) == fingerprint:
+            return False
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(schema_state.create, checkfirst=True)
+        await conn.execute(delete(schema_state))
+        await conn.execute(insert(schema_state).values(id=1, fingerprint=fingerprint))
+    return True
 
 
 async def main():
-    await init_db()
+    started = time.perf_counter()
+    applied = await init_db()
+    elapsed = (time.perf_counter() - started) * 1000
+    if applied:
+        logger.info("Schema updated in %.1f ms", elapsed)
+    else:
+        logger.info("Schema is current, DDL skipped (%.1f ms)", elapsed)
+    await async_engine.dispose()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
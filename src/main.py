@@ -1,32 +1,118 @@
+import asyncio
+import contextlib
 import logging
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
-from sqlalchemy.exc import DatabaseError
+from sqlalchemy.exc import DBAPIError
 
 from src.api import router as api_v1
-from src.middleware import ExceptionMiddleware
-
-FORMAT = (
-    "[%(asctime)s.%(msecs)03d] %(module)s:%(lineno)s %(levelname)s - "
-    "%(message)s"
+from src.api.dependencies import is_superuser_token
+from src.api.responses import FastJSONResponse
+from src.auth.emails import close_smtp_pool
+from src.core.config import settings
+from src.core.log import configure_logging, stop_logging
+from src.core.loopmonitor import LoopMonitor
+from src.core.metrics import REGISTRY, flush_snapshots
+from src.core.startup import StartupReport
+from src.db.database import AsyncSessionLocal, async_engine
+from src.db.timeouts import is_query_timeout, query_timeouts
+from src.db.warmup import warm_up_pool
+from src.middleware import (
+    AdmissionMiddleware,
+    CompressionMiddleware,
+    ExceptionMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    RequestIdMiddleware,
 )
+from src.repositories.user_repo import WARMUP_STATEMENTS
+from src.services.broadcast_service import sweep_broadcasts
+from src.services.user_service import sweep_user_deletions
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    datefmt="%Y-%m-%d %H:%M:%S",
-    format=FORMAT,
-)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    configure_logging(
+        settings.LOG_LEVEL,
+        json_format=settings.LOG_JSON,
+        sampling=settings.LOG_SAMPLING,
+        sql=settings.LOG_SQL,
+        queue_size=settings.LOG_QUEUE_SIZE,
+    )
+    report = StartupReport()
+    with report.phase("pool_warmup"):
+        try:
+            await warm_up_pool(async_engine, WARMUP_STATEMENTS)
+        except Exception as e:
+            # Недоступная БД не должна мешать запуску: первый запрос сообщит об ошибке
+            logger.warning("Connection pool warm-up failed: %s", e)
+    report.log(logger)
+    loop_monitor = LoopMonitor(
+        interval=settings.LOOP_LAG_INTERVAL_SECONDS,
+        threshold=settings.LOOP_BLOCK_THRESHOLD_SECONDS,
+    )
+    loop_monitor.start()
+    flusher = None
+    if settings.METRICS_MULTIPROC_DIR is not None:
+        # Каждый воркер пишет свой снимок; /metrics суммирует снимки всех
+        settings.METRICS_MULTIPROC_DIR.mkdir(parents=True, exist_ok=True)
+        REGISTRY.multiprocess_dir = settings.METRICS_MULTIPROC_DIR
+        flusher = asyncio.create_task(
+            flush_snapshots(REGISTRY, settings.METRICS_FLUSH_SECONDS)
+        )
+    # Продолжает удаления пользователей, прерванные падением или перезапуском
+    deletion_sweeper = asyncio.create_task(
+        sweep_user_deletions(AsyncSessionLocal, settings.USER_DELETION_SWEEP_SECONDS)
+    )
+    # Отмечает прерванными рассылки, брошенные упавшим процессом
+    broadcast_sweeper = asyncio.create_task(
+        sweep_broadcasts(AsyncSessionLocal, settings.BROADCAST_SWEEP_SECONDS)
+    )
+    yield
+    for sweeper in (deletion_sweeper, broadcast_sweeper):
+        sweeper.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sweeper
+    await loop_monitor.stop()
+    if flusher is not None:
+        flusher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await flusher
+        REGISTRY.write_snapshot()
+    await close_smtp_pool()
+    await async_engine.dispose()
+    stop_logging()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 app.include_router(api_v1)
 app.add_middleware(ExceptionMiddleware)
+app.add_middleware(CompressionMiddleware.from_settings)
+# Внутри MetricsMiddleware: отклонённые запросы тоже попадают в метрики
+app.add_middleware(AdmissionMiddleware.from_settings)
+app.add_middleware(MetricsMiddleware, routes=app.routes)
+app.add_middleware(ProfilingMiddleware.from_settings, authorize=is_superuser_token)
+app.add_middleware(RequestIdMiddleware)
 
 
-@app.exception_handler(DatabaseError)
-def handler_db_error(request: Request, exc: DatabaseError) -> JSONResponse:
-    logging.error("Unhandled database error", exc_info=exc)
+@app.exception_handler(DBAPIError)
+def handler_db_error(request: Request, exc: DBAPIError) -> JSONResponse:
+    if is_query_timeout(exc):
+        route = request.scope.get("route")
+        path = route.path if route else request.url.path
+        query_timeouts.inc(path)
+        logger.warning("Query timed out: %s %s", request.method, path)
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Query timed out"},
+            headers={"Retry-After": "1"},
+        )
+    logger.error("Unhandled database error", exc_info=exc)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
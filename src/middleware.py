@@ -1,55 +1,543 @@
+import asyncio
+import gzip
+import hashlib
 import logging
+import os
+import random
+import re
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
 
-from fastapi import Request, status
+from fastapi import status
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,
-    RequestResponseEndpoint,
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.admission import AdaptiveLimit, route_class
+from src.core.config import settings
+from src.core.log import request_id
+from src.core.metrics import (
+    cache_requests,
+    http_in_flight,
+    http_request_duration,
+    http_requests,
 )
-from starlette.responses import StreamingResponse
+from src.core.profiling import ProfileStore, RequestProfiler, get_profile_store
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli необязателен
+    brotli = None
 
 logger = logging.getLogger(__name__)
 
+UNKNOWN_ERROR = [{"msg": "Unknown", "loc": ["Unknown"], "type": "Unknown"}]
+
+
+def error_response(exc: Exception) -> JSONResponse:
+    if isinstance(exc, ValidationError):
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={"detail": exc.errors()},
+        )
+    if isinstance(exc, ValueError):
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={"detail": UNKNOWN_ERROR},
+        )
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": UNKNOWN_ERROR},
+    )
+
+
+class ExceptionMiddleware:
+    """
+    Преобразует необработанные исключения в JSON-ответы 422/500. Чистый ASGI:
+    сообщения ответа передаются дальше как есть, без промежуточной задачи и
+    буферизации, поэтому потоковые ответы не задерживаются.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-class ExceptionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> StreamingResponse:
         try:
-            response = await call_next(request)
-        except ValidationError as e:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
             logger.exception(e)
-            response = JSONResponse(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                content={"detail": e.errors()},
+            # Заголовки уже отправлены: ответ заменить нельзя
+            if response_started:
+                raise
+            await error_response(e)(scope, receive, send)
+
+
+# Типы содержимого, которые имеет смысл сжимать
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+
+def accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """Разбирает Accept-Encoding в {кодировка: q}."""
+    encodings = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            encodings[name.strip().lower()] = q
+    return encodings
+
+
+class CompressedCache:
+    """
+    LRU сжатых тел по ключу blake2b от исходных байтов: одинаковые ответы
+    (повторные страницы, общие результаты запросов) сжимаются один раз.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: OrderedDict[tuple[bytes, str], bytes] = OrderedDict()
+        # Ключ процесса: подобрать коллизию для чужого ответа невозможно
+        self._key = os.urandom(32)
+
+    def digest(self, body: bytes) -> bytes:
+        return hashlib.blake2b(body, digest_size=16, key=self._key).digest()
+
+    def get(self, digest: bytes, encoding: str) -> bytes | None:
+        key = (digest, encoding)
+        compressed = self._items.get(key)
+        if compressed is None:
+            cache_requests.inc("compression", "miss")
+        else:
+            cache_requests.inc("compression", "hit")
+            self._items.move_to_end(key)
+        return compressed
+
+    def put(self, digest: bytes, encoding: str, compressed: bytes) -> None:
+        if len(compressed) > self.max_bytes:
+            return
+        key = (digest, encoding)
+        if key in self._items:
+            return
+        self._items[key] = compressed
+        self.size += len(compressed)
+        while self.size > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы gzip или brotli (если установлен) по Accept-Encoding.
+    Тела меньше `minimum_size` отдаются как есть; потоковые ответы сжимаются
+    по фрагментам без буферизации.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        cache_bytes: int = 16 * 1024 * 1024,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = CompressedCache(cache_bytes) if cache_bytes else None
+
+    @classmethod
+    def from_settings(cls, app: ASGIApp) -> "CompressionMiddleware":
+        # Настройки читаются при сборке стека middleware, а не при импорте
+        return cls(
+            app,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+            cache_bytes=settings.COMPRESSION_CACHE_BYTES,
+        )
+
+    def choose_encoding(self, scope: Scope) -> str | None:
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        wildcard = encodings.get("*", 0.0)
+        supported = ("br", "gzip") if brotli is not None else ("gzip",)
+        # Наибольший q клиента; при равных br (первый в supported) — он плотнее
+        best = max(supported, key=lambda name: encodings.get(name, wildcard))
+        return best if encodings.get(best, wildcard) > 0 else None
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_cached(self, body: bytes, encoding: str) -> bytes:
+        if self.cache is None:
+            return self.compress(body, encoding)
+        digest = self.cache.digest(body)
+        compressed = self.cache.get(digest, encoding)
+        if compressed is None:
+            compressed = self.compress(body, encoding)
+            self.cache.put(digest, encoding, compressed)
+        return compressed
+
+    def stream_compressor(self, encoding: str) -> Any:
+        if encoding == "br":
+            return brotli.Compressor(quality=self.brotli_quality)
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.choose_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        compressor: Any = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or not content_type.startswith(
+                    COMPRESSIBLE_TYPES
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Заголовки отправляются вместе с первым фрагментом тела
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                if not more_body:
+                    if len(body) >= self.minimum_size:
+                        body = self.compress_cached(body, encoding)
+                        headers["Content-Encoding"] = encoding
+                        headers["Content-Length"] = str(len(body))
+                        headers.add_vary_header("Accept-Encoding")
+                    await send(start)
+                    start = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                compressor = self.stream_compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                del headers["Content-Length"]
+                await send(start)
+                start = None
+
+            if compressor is None:
+                await send(message)
+                return
+            if encoding == "br":
+                chunk = compressor.process(body) + (
+                    compressor.flush() if more_body else compressor.finish()
+                )
+            else:
+                chunk = compressor.compress(body) + compressor.flush(
+                    zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+                )
+            await send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
             )
-        except ValueError as e:
-            logger.exception(e)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def is_final_body(message: Message) -> bool:
+    """
+    Последняя часть тела ответа. Приложение возвращает управление позже —
+    после фоновых задач (BackgroundTasks), которые не должны входить в
+    задержку запроса и держать слот допуска.
+    """
+    return message["type"] == "http.response.body" and not message.get(
+        "more_body", False
+    )
+
+
+class MetricsMiddleware:
+    """
+    Считает запросы, задержку и число выполняющихся запросов по шаблону
+    маршрута (`/users/{id}`, а не конкретный путь), чтобы число рядов метрик
+    не зависело от значений параметров.
+    """
+
+    def __init__(self, app: ASGIApp, routes: list[BaseRoute]) -> None:
+        self.app = app
+        self.routes = routes
+
+    def route_template(self, scope: Scope) -> str:
+        partial = None
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or "<unmatched>"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = self.route_template(scope)
+        status_code = 500
+        finished = False
+
+        def finish() -> None:
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            http_request_duration.observe(time.perf_counter() - started, method, route)
+            http_requests.inc(method, route, str(status_code))
+            http_in_flight.dec(method, route)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if is_final_body(message):
+                finish()
+
+        http_in_flight.inc(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
+
+
+class AdmissionMiddleware:
+    """
+    Контроль допуска: у каждого класса маршрутов (auth, read, write) свой
+    адаптивный лимит одновременных запросов. Сверх лимита запрос сразу
+    получает 503 с Retry-After, а не ждёт в очереди к пулу БД или хэширования,
+    пока не истечёт таймаут у всех.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: dict[str, AdaptiveLimit],
+        retry_after: int = 1,
+    ) -> None:
+        self.app = app
+        self.limits = limits
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_settings(cls, app: ASGIApp) -> "AdmissionMiddleware":
+        targets = settings.ADMISSION_TARGET_SECONDS
+        return cls(
+            app,
+            {
+                name: AdaptiveLimit(name, limit, targets.get(name, 0.5))
+                for name, limit in settings.ADMISSION_LIMITS.items()
+            },
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = self.limits.get(route_class(scope["method"], scope["path"]))
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        if not limit.try_acquire():
             response = JSONResponse(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                content={
-                    "detail": [
-                        {
-                            "msg": "Unknown",
-                            "loc": ["Unknown"],
-                            "type": "Unknown",
-                        }
-                    ]
-                },
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Server overloaded"},
+                headers={"Retry-After": str(self.retry_after)},
             )
-        except Exception as e:
-            logger.exception(e)
-            response = JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={
-                    "detail": [
-                        {
-                            "msg": "Unknown",
-                            "loc": ["Unknown"],
-                            "type": "Unknown",
-                        }
-                    ]
-                },
+            await response(scope, receive, send)
+            return
+
+        overloaded = False
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                limit.release(time.perf_counter() - started, overloaded)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal overloaded
+            if message["type"] == "http.response.start":
+                overloaded = message["status"] == status.HTTP_503_SERVICE_UNAVAILABLE
+            await send(message)
+            if is_final_body(message):
+                release()
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            release()
+
+
+class ProfilingMiddleware:
+    """
+    Профилирует запрос сэмплирующим профилировщиком (RequestProfiler), если
+    пришёл заголовок X-Profile с токеном суперпользователя или запрос попал в
+    случайную выборку `sample_rate`. Отчёт сохраняется в ProfileStore, его
+    идентификатор возвращается в заголовке X-Profile-Id (см. /profiling).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        authorize: Callable[[str], Awaitable[bool]] | None = None,
+        sample_rate: float = 0.0,
+        interval: float = 0.002,
+        max_active: int = 2,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.authorize = authorize
+        self.sample_rate = sample_rate
+        self.interval = interval
+        # Ограничение числа одновременно профилируемых запросов (потоков)
+        self.max_active = max_active
+        self.active = 0
+
+    @classmethod
+    def from_settings(
+        cls, app: ASGIApp, authorize: Callable[[str], Awaitable[bool]]
+    ) -> "ProfilingMiddleware":
+        return cls(
+            app,
+            get_profile_store(),
+            authorize,
+            sample_rate=settings.PROFILE_SAMPLE_RATE,
+            interval=settings.PROFILE_INTERVAL_SECONDS,
+        )
+
+    async def should_profile(self, scope: Scope) -> bool:
+        """При True занимает слот профилирования; его освобождает __call__."""
+        if self.active >= self.max_active:
+            return False
+        # Слот занимается до await authorize: иначе одновременные запросы
+        # пройдут проверку лимита вместе
+        self.active += 1
+        profile = False
+        try:
+            profile = await self.requested(scope)
+        finally:
+            if not profile:
+                self.active -= 1
+        return profile
+
+    async def requested(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        if "x-profile" in headers and self.authorize is not None:
+            scheme, _, token = headers.get("authorization", "").partition(" ")
+            if scheme.lower() == "bearer" and token and await self.authorize(token):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not await self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        # Не X-Request-ID: идентификатор от клиента перезаписал бы чужой отчёт
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        profiler = RequestProfiler(self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            self.active -= 1
+            report = profiler.report(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                status=status_code,
+                timestamp=time.time(),
             )
-        return response
+            await asyncio.to_thread(self.store.save, profile_id, report)
+
+
+# Принимаемые от клиента идентификаторы запроса; остальные заменяются своими
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+
+class RequestIdMiddleware:
+    """
+    Назначает запросу идентификатор (из X-Request-ID или новый), доступный
+    записям лога через contextvar, и возвращает его в заголовке ответа.
+    """
+
+    def __init__(self, app: ASGIApp, header: str = "X-Request-ID") -> None:
+        self.app = app
+        self.header = header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        value = Headers(scope=scope).get(self.header, "")
+        if not REQUEST_ID_PATTERN.fullmatch(value):
+            value = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self.header] = value
+            await send(message)
+
+        token = request_id.set(value)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id.reset(token)
@@ -1,4 +1,15 @@
+from src.models.broadcasts import Broadcast
+from src.models.deletions import UserDeletion
+from src.models.outbox import EmailOutbox
 from src.models.posts import Post
+from src.models.tokens import RefreshToken
 from src.models.users import User
 
-__all__ = ("Post", "User")
+__all__ = (
+    "Broadcast",
+    "EmailOutbox",
+    "Post",
+    "RefreshToken",
+    "User",
+    "UserDeletion",
+)
@@ -0,0 +1,52 @@
+from datetime import UTC, datetime
+from enum import StrEnum
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class BroadcastStatus(StrEnum):
+    PENDING = "pending"
+    # Выполняется; если updated_at давно не обновлялся, процесс упал
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    # Остановлена вместе с процессом (завершение или падение воркера)
+    INTERRUPTED = "interrupted"
+
+
+class Broadcast(Base):
+    """
+    Рассылка и её прогресс. Счётчики обновляет воркер, выполняющий рассылку,
+    поэтому статус виден из любого процесса и переживает перезапуск.
+    """
+
+    __tablename__ = "broadcasts"
+    __table_args__ = (Index("ix_broadcasts_stale", "status", "updated_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    template_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    context: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    filters: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(16), default=BroadcastStatus.PENDING, nullable=False
+    )
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Отметка жизни: обновляется при каждом сохранении прогресса
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(id={self.id})"
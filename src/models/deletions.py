@@ -0,0 +1,42 @@
+from datetime import UTC, datetime
+from enum import StrEnum
+
+from sqlalchemy import DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class DeletionStatus(StrEnum):
+    PENDING = "pending"
+    # Выполняется; если updated_at давно не обновлялся, процесс упал
+    RUNNING = "running"
+    FINISHED = "finished"
+
+
+class UserDeletion(Base):
+    """
+    Фоновое удаление пользователя и его постов. Запись переживает удаление
+    пользователя (без внешнего ключа), чтобы прогресс был виден и после него.
+    """
+
+    __tablename__ = "user_deletions"
+    __table_args__ = (Index("ix_user_deletions_stale", "status", "updated_at"),)
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    status: Mapped[str] = mapped_column(
+        String(16), default=DeletionStatus.PENDING, nullable=False
+    )
+    total_posts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    deleted_posts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    requested_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    # Отметка жизни: обновляется после каждой порции удалённых постов
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(user_id={self.user_id})"
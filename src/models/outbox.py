@@ -0,0 +1,58 @@
+from datetime import UTC, datetime
+from enum import StrEnum
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class OutboxStatus(StrEnum):
+    PENDING = "pending"
+    # Взято воркером; если он упал, письмо снова доступно после next_attempt_at
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"
+
+
+# Письма, ещё ожидающие отправки; условие частичного уникального индекса
+UNSENT = text("status IN ('pending', 'sending')")
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_due", "status", "next_attempt_at"),
+        # Ключ уникален только среди неотправленных: такое же письмо можно
+        # поставить снова, когда предыдущее уже ушло
+        Index(
+            "uq_email_outbox_unsent_dedupe_key",
+            "dedupe_key",
+            unique=True,
+            sqlite_where=UNSENT,
+            postgresql_where=UNSENT,
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    dedupe_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    to_email: Mapped[str] = mapped_column(String(320), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    template_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    context: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(16), default=OutboxStatus.PENDING, nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    last_error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(id={self.id})"
@@ -19,7 +19,7 @@ class Post(Base):
     title: Mapped[str] = mapped_column(String(150), index=True)
     content: Mapped[str] = mapped_column(Text)
     author_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE")
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
     )
     pub_date: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC)
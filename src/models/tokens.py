@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class RefreshToken(Base):
+    """
+    Refresh-токен "<id>.<секрет>": в БД только HMAC секрета. Токены одной
+    цепочки ротации — одно семейство; used — токен уже обменян на новый.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    family_id: Mapped[int] = mapped_column(BigInteger, index=True)
+    digest: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    used: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(id={self.id})"
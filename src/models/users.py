@@ -23,7 +23,14 @@ class User(Base):
         DateTime(timezone=True), default=lambda: datetime.now(UTC)
     )
 
-    posts = relationship("Post", back_populates="author", cascade="all, delete-orphan")
+    # passive_deletes: посты удаляет БД (ON DELETE CASCADE) или
+    # UserService.purge_user порциями, ORM не загружает их при удалении
+    posts = relationship(
+        "Post",
+        back_populates="author",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     def __str__(self) -> str:
         return f"{self.__class__.__name__}(id={self.id})"
@@ -0,0 +1,70 @@
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.broadcasts import Broadcast, BroadcastStatus
+
+
+class BroadcastRepository:
+    """Изменения — в транзакции вызывающего кода (без commit)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def add(
+        self,
+        template_name: str,
+        subject: str,
+        context: dict[str, Any],
+        filters: dict[str, Any],
+    ) -> Broadcast:
+        broadcast = Broadcast(
+            template_name=template_name,
+            subject=subject,
+            context=context,
+            filters=filters,
+        )
+        self.session.add(broadcast)
+        await self.session.flush()
+        return broadcast
+
+    async def get(self, id: int) -> Broadcast | None:
+        # populate_existing: прогресс мог измениться в другой транзакции
+        return await self.session.get(Broadcast, id, populate_existing=True)
+
+    async def claim(self, id: int, now: datetime) -> bool:
+        """Переводит рассылку в RUNNING. False, если её уже запустили."""
+        stmt = (
+            update(Broadcast)
+            .where(Broadcast.id == id, Broadcast.status == BroadcastStatus.PENDING)
+            .values(status=BroadcastStatus.RUNNING, started_at=now, updated_at=now)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount == 1
+
+    async def interrupt_stale(
+        self, now: datetime, stale_before: datetime
+    ) -> Sequence[int]:
+        """
+        Переводит в INTERRUPTED рассылки, которые никто не выполняет
+        (отметка жизни старше `stale_before`). Возвращает их id.
+        """
+        stmt = (
+            update(Broadcast)
+            .where(
+                Broadcast.status == BroadcastStatus.RUNNING,
+                Broadcast.updated_at < stale_before,
+            )
+            .values(
+                status=BroadcastStatus.INTERRUPTED, updated_at=now, finished_at=now
+            )
+            .returning(Broadcast.id)
+        )
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def update(self, id: int, **values: Any) -> None:
+        stmt = update(Broadcast).where(Broadcast.id == id).values(**values)
+        await self.session.execute(stmt)
@@ -0,0 +1,83 @@
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.deletions import DeletionStatus, UserDeletion
+
+
+class UserDeletionRepository:
+    """Изменения — в транзакции вызывающего кода (без commit)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def request(self, user_id: int, now: datetime) -> None:
+        """Ставит удаление в очередь; незавершённое удаление не сбрасывается."""
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        values = {
+            "status": DeletionStatus.PENDING,
+            "total_posts": 0,
+            "deleted_posts": 0,
+            "requested_at": now,
+            "updated_at": now,
+            "finished_at": None,
+        }
+        stmt = (
+            insert(UserDeletion)
+            .values(user_id=user_id, **values)
+            .on_conflict_do_update(
+                index_elements=[UserDeletion.user_id],
+                set_=values,
+                # id удалённого пользователя может достаться новому
+                where=UserDeletion.status == DeletionStatus.FINISHED,
+            )
+        )
+        await self.session.execute(stmt)
+
+    async def get(self, user_id: int) -> UserDeletion | None:
+        return await self.session.get(UserDeletion, user_id, populate_existing=True)
+
+    async def claim(self, user_id: int, now: datetime, stale_before: datetime) -> bool:
+        """
+        Переводит удаление в RUNNING. False, если оно завершено или его
+        выполняет другой процесс (отметка жизни не старше `stale_before`).
+        """
+        stmt = (
+            update(UserDeletion)
+            .where(
+                UserDeletion.user_id == user_id,
+                or_(
+                    UserDeletion.status == DeletionStatus.PENDING,
+                    (UserDeletion.status == DeletionStatus.RUNNING)
+                    & (UserDeletion.updated_at < stale_before),
+                ),
+            )
+            .values(status=DeletionStatus.RUNNING, updated_at=now)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount == 1
+
+    async def list_stale(self, stale_before: datetime) -> Sequence[int]:
+        """Незавершённые удаления, которые никто не выполняет."""
+        stmt = (
+            select(UserDeletion.user_id)
+            .where(
+                UserDeletion.status != DeletionStatus.FINISHED,
+                UserDeletion.updated_at < stale_before,
+            )
+            .order_by(UserDeletion.updated_at)
+        )
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def update(self, user_id: int, **values: Any) -> None:
+        stmt = (
+            update(UserDeletion)
+            .where(UserDeletion.user_id == user_id)
+            .values(**values)
+        )
+        await self.session.execute(stmt)
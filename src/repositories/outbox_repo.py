@@ -0,0 +1,98 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.dtos.emails import EmailDTO
+from src.models.outbox import UNSENT, EmailOutbox, OutboxStatus
+
+
+class OutboxRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def enqueue(self, email: EmailDTO, dedupe_key: str | None = None) -> bool:
+        """
+        Добавляет письмо в текущую транзакцию вызывающего кода (без commit).
+        Возвращает False, если письмо с таким ключом ещё ждёт отправки.
+        """
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = (
+            insert(EmailOutbox)
+            .values(
+                dedupe_key=dedupe_key or email.dedupe_key(),
+                to_email=email.to_email,
+                subject=email.subject,
+                template_name=email.template_name,
+                context=email.context,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[EmailOutbox.dedupe_key], index_where=UNSENT
+            )
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount > 0
+
+    async def claim_batch(
+        self, limit: int, now: datetime, lease_until: datetime
+    ) -> Sequence[EmailOutbox]:
+        """
+        Забирает до `limit` писем, готовых к отправке, и продлевает им аренду
+        до `lease_until`. SKIP LOCKED позволяет нескольким воркерам не мешать
+        друг другу в PostgreSQL.
+        """
+        stmt = (
+            select(EmailOutbox)
+            .where(
+                or_(
+                    EmailOutbox.status == OutboxStatus.PENDING,
+                    EmailOutbox.status == OutboxStatus.SENDING,
+                ),
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        items = (await self.session.execute(stmt)).scalars().all()
+        for item in items:
+            item.status = OutboxStatus.SENDING
+            item.next_attempt_at = lease_until
+        await self.session.commit()
+        return items
+
+    async def mark_sent(self, ids: Sequence[int], now: datetime) -> None:
+        if not ids:
+            return
+        stmt = (
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(ids))
+            .values(status=OutboxStatus.SENT, sent_at=now, last_error=None)
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def mark_failed(
+        self, item: EmailOutbox, error: str, retry_at: datetime | None
+    ) -> None:
+        """Планирует повтор на `retry_at` или, если он None, переводит в DEAD."""
+        item.attempts += 1
+        item.last_error = error
+        if retry_at is None:
+            item.status = OutboxStatus.DEAD
+        else:
+            item.status = OutboxStatus.PENDING
+            item.next_attempt_at = retry_at
+        await self.session.commit()
+
+    async def purge_sent(self, before: datetime) -> int:
+        """Удаляет письма, отправленные раньше `before`. Возвращает их число."""
+        stmt = delete(EmailOutbox).where(
+            EmailOutbox.status == OutboxStatus.SENT, EmailOutbox.sent_at < before
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.rowcount
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from sqlalchemy import Row, bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.tokens import RefreshToken
+from src.models.users import User
+
+# Один поиск по первичному ключу вместе с данными пользователя для access-токена
+GET_ACTIVE = (
+    select(
+        RefreshToken.user_id,
+        RefreshToken.family_id,
+        RefreshToken.digest,
+        RefreshToken.used,
+        User.email,
+        User.is_active,
+    )
+    .join(User, User.id == RefreshToken.user_id)
+    .where(
+        RefreshToken.id == bindparam("token_id"),
+        RefreshToken.expires_at > bindparam("now"),
+    )
+)
+MARK_USED = (
+    update(RefreshToken)
+    .where(RefreshToken.id == bindparam("token_id"), RefreshToken.used.is_(False))
+    .values(used=True)
+)
+
+
+class RefreshTokenRepository:
+    """Изменения — в транзакции вызывающего кода (без commit)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def add(
+        self, user_id: int, family_id: int, digest: bytes, expires_at: datetime
+    ) -> int:
+        stmt = (
+            insert(RefreshToken)
+            .values(
+                user_id=user_id,
+                family_id=family_id,
+                digest=digest,
+                expires_at=expires_at,
+            )
+            .returning(RefreshToken.id)
+        )
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def get_active(self, id: int, now: datetime) -> Row | None:
+        result = await self.session.execute(GET_ACTIVE, {"token_id": id, "now": now})
+        return result.one_or_none()
+
+    async def mark_used(self, id: int) -> bool:
+        """False, если токен уже обменян (в том числе конкурентным запросом)."""
+        result = await self.session.execute(MARK_USED, {"token_id": id})
+        return result.rowcount == 1
+
+    async def delete_family(self, family_id: int) -> None:
+        stmt = delete(RefreshToken).where(RefreshToken.family_id == family_id)
+        await self.session.execute(stmt)
+
+    async def delete_for_user(
+        self, user_id: int, expired_before: datetime | None = None
+    ) -> None:
+        stmt = delete(RefreshToken).where(RefreshToken.user_id == user_id)
+        if expired_before is not None:
+            stmt = stmt.where(RefreshToken.expires_at <= expired_before)
+        await self.session.execute(stmt)
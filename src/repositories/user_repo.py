@@ -1,27 +1,86 @@
+from collections.abc import Sequence
+from functools import lru_cache
 from typing import Any
 
-from sqlalchemy import delete, exists, select, update
+from sqlalchemy import Row, Select, bindparam, delete, exists, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.models.posts import Post
 from src.models.users import User
 
+# Горячие запросы собираются один раз: значения передаются через bind-параметры,
+# поэтому SQL-текст стабилен, а компиляция и prepared statements берутся из кэша.
+GET_BY_ID = select(User).where(User.id == bindparam("id"))
+GET_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+# Только поля UserReadDTO, с его именами: строки без ORM-объектов и identity map
+LIST_READ = select(
+    User.id,
+    User.email,
+    User.create_at.label("created_at"),
+    User.first_name,
+    User.last_name,
+    User.birth_date,
+    User.is_active,
+    User.is_superuser,
+    User.is_verified,
+)
+
+
+@lru_cache(maxsize=32)
+def exists_stmt(fields: tuple[str, ...]) -> Select:
+    return select(
+        exists().where(*(getattr(User, field) == bindparam(field) for field in fields))
+    )
+
+
+# Прогреваются при старте приложения (см. src.db.warmup)
+WARMUP_STATEMENTS = (
+    (GET_BY_ID, {"id": 0}),
+    (GET_BY_EMAIL, {"email": ""}),
+    (exists_stmt(("email",)), {"email": ""}),
+    (exists_stmt(("id",)), {"id": 0}),
+)
+
 
 class UserRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
     async def get_by_id(self, id: int) -> User | None:
-        stmt = select(User).where(User.id == id)
-        return (await self.session.execute(stmt)).scalar_one_or_none()
+        result = await self.session.execute(GET_BY_ID, {"id": id})
+        return result.scalar_one_or_none()
 
     async def get_by_email(self, email: str) -> User | None:
-        stmt = select(User).where(User.email == email)
-        return (await self.session.execute(stmt)).scalar_one_or_none()
+        result = await self.session.execute(GET_BY_EMAIL, {"email": email})
+        return result.scalar_one_or_none()
 
     async def list(self) -> list[User]:
         stmt = select(User)
         return (await self.session.execute(stmt)).scalars().all()
 
+    async def list_read(self) -> Sequence[Row]:
+        return (await self.session.execute(LIST_READ)).all()
+
+    async def count(self, **filters: Any) -> int:
+        stmt = select(func.count()).select_from(User).filter_by(**filters)
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def recipients_page(
+        self, after_id: int, limit: int, **filters: Any
+    ) -> Sequence[Row]:
+        """
+        (id, email) пользователей по фильтру с id > `after_id`: постраничное
+        чтение по первичному ключу не держит транзакцию между страницами.
+        """
+        stmt = (
+            select(User.id, User.email)
+            .filter_by(**filters)
+            .where(User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
+        return (await self.session.execute(stmt)).all()
+
     async def create(self, **create_data: Any) -> User:
         user = User(**create_data)
         self.session.add(user)
@@ -40,9 +99,23 @@ class UserRepository:
         await self.session.execute(stmt)
         await self.session.commit()
 
-    async def exists(self, **filters: Any) -> bool:
-        stmt = select(
-            exists().where(*(getattr(User, k) == v for k, v in filters.items()))
+    async def count_posts(self, id: int) -> int:
+        stmt = select(func.count()).select_from(Post).where(Post.author_id == id)
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def delete_posts_chunk(self, id: int, size: int) -> int:
+        """Удаляет до `size` постов пользователя в отдельной короткой транзакции."""
+        chunk = select(Post.id).where(Post.author_id == id).limit(size)
+        stmt = (
+            delete(Post)
+            .where(Post.id.in_(chunk.scalar_subquery()))
+            .execution_options(synchronize_session=False)
         )
         result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.rowcount
+
+    async def exists(self, **filters: Any) -> bool:
+        stmt = exists_stmt(tuple(sorted(filters)))
+        result = await self.session.execute(stmt, filters)
         return result.scalar()
@@ -0,0 +1,29 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class BroadcastFilter(BaseModel):
+    is_active: bool | None = True
+    is_verified: bool | None = None
+    is_superuser: bool | None = None
+
+
+class BroadcastCreate(BaseModel):
+    template_name: str
+    subject: str = Field(max_length=255)
+    context: dict[str, Any] = {}
+    filter: BroadcastFilter = BroadcastFilter()
+
+
+class BroadcastRead(BaseModel):
+    id: int
+    template_name: str
+    subject: str
+    status: str
+    total: int
+    sent: int
+    failed: int
+    running: bool
+    finished: bool
+    sends_per_second: float
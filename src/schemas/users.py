@@ -1,11 +1,37 @@
 from datetime import date
+from typing import Annotated, Any
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, ValidatorFunctionWrapHandler, WrapValidator
+
+from src.core.metrics import cache_requests
+
+# Адреса в ответах приходят из БД и повторяются (автор на каждом посте), а
+# проверка EmailStr (email-validator, idna) дорогая: результат кэшируется
+EMAIL_CACHE_SIZE = 10_000
+_validated_emails: dict[str, str] = {}
+
+
+def cached_email(value: Any, handler: ValidatorFunctionWrapHandler) -> str:
+    if not isinstance(value, str):
+        return handler(value)
+    email = _validated_emails.get(value)
+    if email is not None:
+        cache_requests.inc("email_validation", "hit")
+    else:
+        cache_requests.inc("email_validation", "miss")
+        email = handler(value)
+        if len(_validated_emails) >= EMAIL_CACHE_SIZE:
+            _validated_emails.clear()
+        _validated_emails[value] = email
+    return email
+
+
+ResponseEmailStr = Annotated[EmailStr, WrapValidator(cached_email)]
 
 
 class UserRead(BaseModel):
     id: int
-    email: EmailStr
+    email: ResponseEmailStr
     first_name: str | None = None
     last_name: str | None = None
     birth_date: date | None = None
@@ -40,6 +66,33 @@ class UserUpdate(BaseModel):
     is_verified: bool | None = None
 
 
+class UserDeletionRead(BaseModel):
+    user_id: int
+    status: str
+    total_posts: int
+    deleted_posts: int
+    running: bool
+    finished: bool
+
+
+class EmailRequest(BaseModel):
+    email: EmailStr
+
+
+class VerifyRequest(BaseModel):
+    token: str
+
+
+class ResetPasswordRequest(BaseModel):
+    token: str
+    password: str
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
@@ -0,0 +1,201 @@
+import argparse
+import contextlib
+import logging
+import os
+import signal
+import socket
+import tempfile
+import time
+from pathlib import Path
+from types import FrameType
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+logger = logging.getLogger(__name__)
+
+# Сколько ждать воркеры сверх timeout_graceful_shutdown перед SIGKILL
+KILL_GRACE_SECONDS = 5
+# Воркер, упавший быстрее этого, перезапускается с паузой (не крутим цикл падений)
+RESPAWN_DELAY_SECONDS = 1.0
+
+
+def pool_sizes(
+    workers: int, max_connections: int, pool_size: int = 5, max_overflow: int = 10
+) -> tuple[int, int]:
+    """
+    pool_size и max_overflow на воркер, чтобы все воркеры вместе открывали не
+    больше `max_connections` соединений. Соотношение постоянных и временных
+    соединений сохраняется; если лимит позволяет, размеры не меняются.
+    """
+    per_worker = max_connections // workers
+    if per_worker < 1:
+        raise ValueError(
+            f"{max_connections} DB connections are not enough for {workers} workers"
+        )
+    total = pool_size + max_overflow
+    if per_worker >= total:
+        return pool_size, max_overflow
+    size = max(1, per_worker * pool_size // total)
+    return size, per_worker - size
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+    """
+    Мастер-процесс: приложение импортируется один раз, воркеры создаются
+    через fork и принимают соединения с общего сокета. Упавший воркер
+    перезапускается. По SIGTERM/SIGINT воркеры получают SIGTERM: uvicorn
+    перестаёт принимать соединения и дожидается текущих запросов не дольше
+    timeout_graceful_shutdown; не успевшие завершиться получают SIGKILL.
+    """
+
+    def __init__(
+        self, config: uvicorn.Config, sock: socket.socket, workers: int
+    ) -> None:
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        # pid воркера -> время запуска по time.monotonic()
+        self.children: dict[int, float] = {}
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGALRM):
+                    signal.signal(sig, signal.SIG_DFL)
+                uvicorn.Server(self.config).run(sockets=[self.sock])
+            except BaseException:
+                logger.exception("Worker %s crashed", os.getpid())
+                code = 1
+            finally:
+                # Без atexit и финализаторов, унаследованных от мастера
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+
+    def signal_children(self, sig: int) -> None:
+        for pid in list(self.children):
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, sig)
+
+    def stop(self, signum: int, frame: FrameType | None) -> None:
+        if self.stopping:
+            # Повторный сигнал — не ждём завершения запросов
+            self.kill(signum, frame)
+            return
+        self.stopping = True
+        logger.info("Stopping %s workers", len(self.children))
+        # Новые соединения больше не ставятся в очередь сокета мастера
+        self.sock.close()
+        self.signal_children(signal.SIGTERM)
+        timeout = self.config.timeout_graceful_shutdown or 0
+        signal.alarm(int(timeout) + KILL_GRACE_SECONDS)
+
+    def kill(self, signum: int, frame: FrameType | None) -> None:
+        self.signal_children(signal.SIGKILL)
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGALRM, self.kill)
+        for _ in range(self.workers):
+            self.spawn()
+        logger.info("Started %s workers", self.workers)
+        while self.children:
+            pid, status = os.wait()
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            logger.error(
+                "Worker %s exited with code %s, restarting",
+                pid,
+                os.waitstatus_to_exitcode(status),
+            )
+            if time.monotonic() - started < RESPAWN_DELAY_SECONDS:
+                time.sleep(RESPAWN_DELAY_SECONDS)
+            if not self.stopping:
+                self.spawn()
+        signal.alarm(0)
+
+
+def prepare_metrics_dir() -> None:
+    """
+    Каталог снимков метрик для /metrics по всем воркерам. Снимки прошлого
+    запуска удаляются, иначе их счётчики прибавятся к новым.
+    """
+    path = os.environ.setdefault(
+        "METRICS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="metrics-")
+    )
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    for snapshot in directory.glob("*.json"):
+        snapshot.unlink()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Production server")
+    parser.add_argument("--app", default="src.main:app")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+    )
+    parser.add_argument(
+        "--db-max-connections",
+        type=int,
+        default=int(os.environ.get("DB_MAX_CONNECTIONS", 90)),
+        help="Connections all workers may open together",
+    )
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--graceful-timeout", type=int, default=30)
+    parser.add_argument("--access-log", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    # До импорта приложения: src.db.database читает размеры пула при импорте
+    pool_size, max_overflow = pool_sizes(args.workers, args.db_max_connections)
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    if args.workers > 1:
+        prepare_metrics_dir()
+
+    # Preload: импорт один раз в мастере, воркеры получают его через fork
+    app = import_from_string(args.app)
+    config = uvicorn.Config(
+        app,
+        loop="uvloop",
+        http="httptools",
+        backlog=args.backlog,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        access_log=args.access_log,
+        # Логирование настраивает lifespan приложения (src.core.log)
+        log_config=None,
+    )
+    sock = bind_socket(args.host, args.port, args.backlog)
+    logger.info(
+        "Listening on %s:%s, %s workers, DB pool %s+%s per worker",
+        args.host,
+        args.port,
+        args.workers,
+        pool_size,
+        max_overflow,
+    )
+    Supervisor(config, sock, args.workers).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,35 @@
-from datetime import timedelta
+import hmac
+import secrets
+from datetime import UTC, datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.auth.emails import reset_password_email, verification_email
 from src.auth.hashing_password import PasswordHelper
-from src.auth.jwt import create_access_token, read_token
+from src.auth.jwt import (
+    RESET_PASSWORD_AUDIENCE,
+    VERIFY_AUDIENCE,
+    create_access_token,
+    create_purpose_token,
+    create_refresh_secret,
+    fingerprint,
+    fingerprint_matches,
+    read_purpose_token,
+    read_refresh_token,
+    read_token,
+    refresh_digest,
+)
 from src.core.config import settings
-from src.exceptions.users import InvalidVerifyToken, UserNotExists
+from src.exceptions.users import (
+    InvalidRefreshToken,
+    InvalidResetPasswordToken,
+    InvalidVerifyToken,
+    UserAlreadyVerified,
+    UserNotExists,
+)
 from src.models.users import User
+from src.repositories.outbox_repo import OutboxRepository
+from src.repositories.token_repo import RefreshTokenRepository
 from src.repositories.user_repo import UserRepository
 from src.schemas.users import Token
 
@@ -16,22 +39,73 @@ class AuthService:
         self.session = session
         self.repo = repo
         self.password_helper = PasswordHelper()
+        self.tokens = RefreshTokenRepository(session)
 
     async def login(self, email: str, password: str) -> Token:
         user = await self.authenticate(email, password)
         if not user:
             raise UserNotExists("User not exists")
+        now = datetime.now(UTC)
+        await self.tokens.delete_for_user(user.id, expired_before=now)
+        # Новый вход — новое семейство refresh-токенов
+        refresh_token = await self.issue_refresh_token(
+            user.id, secrets.randbits(62), now
+        )
+        await self.session.commit()
+        return self.token(user.email, refresh_token)
+
+    async def refresh(self, refresh_token: str) -> Token:
+        """
+        Обменивает refresh-токен на новую пару без проверки пароля: поиск по
+        первичному ключу и HMAC. Использованный токен одноразовый; если его
+        предъявили снова, токен утёк — отзывается всё семейство, и владельцу
+        (или злоумышленнику) придётся войти заново.
+        """
+        claims = read_refresh_token(refresh_token)
+        if claims is None:
+            raise InvalidRefreshToken()
+        token_id, secret = claims
+        now = datetime.now(UTC)
+        record = await self.tokens.get_active(token_id, now)
+        if (
+            record is None
+            or not record.is_active
+            or not hmac.compare_digest(record.digest, refresh_digest(secret))
+        ):
+            raise InvalidRefreshToken()
+        if record.used or not await self.tokens.mark_used(token_id):
+            await self.tokens.delete_family(record.family_id)
+            await self.session.commit()
+            raise InvalidRefreshToken()
+        new_token = await self.issue_refresh_token(
+            record.user_id, record.family_id, now
+        )
+        await self.session.commit()
+        return self.token(record.email, new_token)
+
+    async def issue_refresh_token(
+        self, user_id: int, family_id: int, now: datetime
+    ) -> str:
+        secret, digest = create_refresh_secret()
+        expires_at = now + timedelta(seconds=settings.REFRESH_TOKEN_LIFETIME_SECONDS)
+        token_id = await self.tokens.add(user_id, family_id, digest, expires_at)
+        return f"{token_id}.{secret}"
+
+    @staticmethod
+    def token(email: str, refresh_token: str) -> Token:
         expires_delta = timedelta(seconds=settings.ACCESS_TOKEN_EXPIRE_SECOND)
-        access_token = create_access_token(
-            {"sub": user.email}, expires_delta=expires_delta
+        access_token = create_access_token({"sub": email}, expires_delta=expires_delta)
+        return Token(
+            access_token=access_token,
+            token_type="bearer",
+            refresh_token=refresh_token,
         )
-        return Token(access_token=access_token, token_type="bearer")
 
     async def authenticate(self, email: str, password: str) -> User | None:
         user = await self.repo.get_by_email(email)
         if not user:
             return None
-        if not self.password_helper.verify(password, user.hashed_password):
+        if not await self.password_helper.verify_async(password, user.hashed_password):
             return None
         return user
 
@@ -46,3 +120,78 @@ class AuthService:
         if not user:
             raise UserNotExists("User not exists")
         return user
+
+    # Отпечатки меняются после использования токена, поэтому токены
+    # одноразовые без таблицы токенов. Проверка: поиск по первичному ключу и HMAC.
+    @staticmethod
+    def verify_fingerprint(user: User) -> tuple[object, ...]:
+        return (user.email, user.is_verified)
+
+    @staticmethod
+    def reset_fingerprint(user: User) -> tuple[object, ...]:
+        return (user.email, user.hashed_password)
+
+    async def request_verify(self, email: str) -> None:
+        """Ставит письмо в очередь; о неизвестных адресах не сообщает."""
+        user = await self.repo.get_by_email(email)
+        if not user or not user.is_active or user.is_verified:
+            return
+        token = create_purpose_token(
+            user.id,
+            VERIFY_AUDIENCE,
+            fingerprint(*self.verify_fingerprint(user)),
+            settings.VERIFICATION_TOKEN_LIFETIME_SECONDS,
+        )
+        await OutboxRepository(self.session).enqueue(
+            verification_email(user.email, token)
+        )
+        await self.session.commit()
+
+    async def verify(self, token: str) -> User:
+        claims = read_purpose_token(token, VERIFY_AUDIENCE)
+        if claims is None:
+            raise InvalidVerifyToken("Invalid token")
+        user_id, token_fingerprint = claims
+        user = await self.repo.get_by_id(user_id)
+        if not user:
+            raise InvalidVerifyToken("Invalid token")
+        if user.is_verified:
+            raise UserAlreadyVerified()
+        if not fingerprint_matches(token_fingerprint, *self.verify_fingerprint(user)):
+            raise InvalidVerifyToken("Invalid token")
+        return await self.repo.update(user.id, is_verified=True)
+
+    async def forgot_password(self, email: str) -> None:
+        """Ставит письмо в очередь; о неизвестных адресах не сообщает."""
+        user = await self.repo.get_by_email(email)
+        if not user or not user.is_active:
+            return
+        token = create_purpose_token(
+            user.id,
+            RESET_PASSWORD_AUDIENCE,
+            fingerprint(*self.reset_fingerprint(user)),
+            settings.RESET_PASSWORD_TOKEN_LIFETIME_SECONDS,
+        )
+        await OutboxRepository(self.session).enqueue(
+            reset_password_email(user.email, token)
+        )
+        await self.session.commit()
+
+    async def reset_password(self, token: str, password: str) -> User:
+        claims = read_purpose_token(token, RESET_PASSWORD_AUDIENCE)
+        if claims is None:
+            raise InvalidResetPasswordToken()
+        user_id, token_fingerprint = claims
+        user = await self.repo.get_by_id(user_id)
+        if (
+            not user
+            or not user.is_active
+            or not fingerprint_matches(token_fingerprint, *self.reset_fingerprint(user))
+        ):
+            raise InvalidResetPasswordToken()
+        # Смена пароля завершает все сессии: refresh-токены удаляются в той же
+        # транзакции, что и обновление пароля
+        await self.tokens.delete_for_user(user.id)
+        return await self.repo.update(
+            user.id, hashed_password=await self.password_helper.hash_async(password)
+        )
@@ -0,0 +1,214 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from email.message import Message
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.auth.emails import get_email_templates, get_smtp_pool
+from src.core.config import settings
+from src.core.ratelimit import RateLimiter
+from src.dtos.emails import BroadcastDTO
+from src.exceptions.emails import EmailTemplateNotExists
+from src.models.broadcasts import Broadcast, BroadcastStatus
+from src.repositories.broadcast_repo import BroadcastRepository
+from src.repositories.user_repo import UserRepository
+
+logger = logging.getLogger(__name__)
+
+# Адресов, читаемых одной страницей и рендерящихся за один раз
+BROADCAST_BATCH_SIZE = 500
+# Рассылка без сохранения прогресса дольше этого считается брошенной. Страница
+# из BROADCAST_BATCH_SIZE писем при MAIL_RATE_PER_SECOND уходит десятки секунд
+BROADCAST_LEASE_SECONDS = 300.0
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    # SQLite возвращает DateTime(timezone=True) без часового пояса
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=UTC)
+
+
+class BroadcastService:
+    def __init__(
+        self,
+        session: AsyncSession,
+        repo: UserRepository,
+        send: Callable[[Message], Awaitable[None]] | None = None,
+        concurrency: int | None = None,
+        rate: float | None = None,
+        batch_size: int = BROADCAST_BATCH_SIZE,
+    ) -> None:
+        self.session = session
+        self.repo = repo
+        self.broadcasts = BroadcastRepository(session)
+        self.send = send
+        self.concurrency = concurrency
+        self.rate = rate
+        self.batch_size = batch_size
+
+    async def create_broadcast(
+        self,
+        template_name: str,
+        subject: str,
+        context: dict[str, Any],
+        filters: dict[str, Any],
+    ) -> BroadcastDTO:
+        if not get_email_templates().exists(template_name):
+            raise EmailTemplateNotExists(template_name)
+        broadcast = await self.broadcasts.add(template_name, subject, context, filters)
+        await self.session.commit()
+        return self.to_dto(broadcast)
+
+    async def get_broadcast(self, id: int) -> BroadcastDTO | None:
+        broadcast = await self.broadcasts.get(id)
+        return None if broadcast is None else self.to_dto(broadcast)
+
+    async def run_broadcast(self, id: int) -> None:
+        """
+        Фоновая задача: читает адреса страницами, рендерит письма одним
+        шаблоном и отправляет их через пул SMTP-соединений не более чем
+        `concurrency` одновременно и не быстрее `rate` писем в секунду.
+        Прогресс сохраняется в БД после каждой страницы.
+        """
+        if not await self.broadcasts.claim(id, datetime.now(UTC)):
+            await self.session.close()
+            return
+        await self.session.commit()
+        broadcast = await self.get_broadcast(id)
+        send = self.send or get_smtp_pool().send
+        slots = asyncio.Semaphore(self.concurrency or settings.MAIL_POOL_SIZE)
+        limiter = RateLimiter(self.rate or settings.MAIL_RATE_PER_SECOND)
+        templates = get_email_templates()
+        pending: set[asyncio.Task] = set()
+
+        async def deliver(message: Message) -> None:
+            try:
+                await send(message)
+                broadcast.sent += 1
+            except Exception as e:
+                broadcast.failed += 1
+                logger.warning("Broadcast %s to %s failed: %r", id, message["To"], e)
+            finally:
+                slots.release()
+
+        status = BroadcastStatus.FAILED
+        try:
+            broadcast.total = await self.repo.count(**broadcast.filters)
+            after_id = 0
+            while page := await self.repo.recipients_page(
+                after_id, self.batch_size, **broadcast.filters
+            ):
+                after_id = page[-1].id
+                # Рендеринг страницы — CPU: в потоке, чтобы не блокировать loop
+                messages = await asyncio.to_thread(
+                    templates.build_many,
+                    broadcast.template_name,
+                    broadcast.subject,
+                    [(row.email, broadcast.context) for row in page],
+                )
+                for message in messages:
+                    # Пока все слоты заняты, чтение следующей страницы ждёт
+                    await slots.acquire()
+                    await limiter.acquire()
+                    task = asyncio.create_task(deliver(message))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                await self.save_progress(broadcast)
+            await asyncio.gather(*pending)
+            status = BroadcastStatus.FINISHED
+        except asyncio.CancelledError:
+            status = BroadcastStatus.INTERRUPTED
+            for task in pending:
+                task.cancel()
+            raise
+        except Exception:
+            logger.exception("Broadcast %s failed", id)
+            for task in pending:
+                task.cancel()
+            raise
+        finally:
+            broadcast.status = status
+            broadcast.finished_at = datetime.now(UTC)
+            await self.finish(broadcast)
+
+    async def save_progress(self, broadcast: BroadcastDTO) -> None:
+        await self.broadcasts.update(
+            broadcast.id,
+            status=broadcast.status,
+            total=broadcast.total,
+            sent=broadcast.sent,
+            failed=broadcast.failed,
+            finished_at=broadcast.finished_at,
+            updated_at=datetime.now(UTC),
+        )
+        await self.session.commit()
+
+    async def finish(self, broadcast: BroadcastDTO) -> None:
+        try:
+            # Транзакция могла оборваться на середине запроса
+            await self.session.rollback()
+            await self.save_progress(broadcast)
+        except Exception as e:
+            logger.warning(
+                "Broadcast %s: saving final state failed: %r", broadcast.id, e
+            )
+        finally:
+            await self.session.close()
+        logger.info(
+            "Broadcast %s %s: sent %s, failed %s, %.1f/s",
+            broadcast.id,
+            broadcast.status,
+            broadcast.sent,
+            broadcast.failed,
+            broadcast.sends_per_second,
+        )
+
+    @staticmethod
+    def to_dto(broadcast: Broadcast) -> BroadcastDTO:
+        return BroadcastDTO(
+            id=broadcast.id,
+            template_name=broadcast.template_name,
+            subject=broadcast.subject,
+            context=broadcast.context,
+            filters=broadcast.filters,
+            status=broadcast.status,
+            total=broadcast.total,
+            sent=broadcast.sent,
+            failed=broadcast.failed,
+            started_at=as_utc(broadcast.started_at),
+            finished_at=as_utc(broadcast.finished_at),
+        )
+
+
+async def interrupt_stale_broadcasts(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> list[int]:
+    """
+    Отмечает INTERRUPTED рассылки, брошенные упавшим процессом. Не
+    продолжает их: письма последней несохранённой страницы ушли бы повторно.
+    """
+    now = datetime.now(UTC)
+    stale_before = now - timedelta(seconds=BROADCAST_LEASE_SECONDS)
+    async with session_factory() as session:
+        ids = await BroadcastRepository(session).interrupt_stale(now, stale_before)
+        await session.commit()
+    return list(ids)
+
+
+async def sweep_broadcasts(
+    session_factory: async_sessionmaker[AsyncSession], interval: float
+) -> None:
+    """Проверяет брошенные рассылки при запуске и затем каждые `interval` секунд."""
+    while True:
+        try:
+            interrupted = await interrupt_stale_broadcasts(session_factory)
+        except Exception:
+            logger.exception("Interrupting stale broadcasts failed")
+        else:
+            if interrupted:
+                logger.warning("Interrupted stale broadcasts: %s", interrupted)
+        await asyncio.sleep(interval)
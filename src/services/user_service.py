@@ -1,18 +1,42 @@
+import asyncio
+import contextlib
+import logging
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.auth.hashing_password import PasswordHelper
-from src.dtos.users import UserCreateDTO, UserReadDTO, UserUpdateDTO
+from src.dtos.users import (
+    UserCreateDTO,
+    UserDeletionDTO,
+    UserReadDTO,
+    UserUpdateDTO,
+)
 from src.exceptions.users import UserAlreadyExists, UserNotExists
+from src.models.deletions import DeletionStatus, UserDeletion
 from src.models.users import User
+from src.repositories.deletion_repo import UserDeletionRepository
 from src.repositories.user_repo import UserRepository
 
+logger = logging.getLogger(__name__)
+
+# Постов за одну транзакцию при фоновом удалении пользователя
+DELETE_CHUNK_SIZE = 500
+# Удаление без отметки жизни дольше этого времени считается брошенным
+DELETION_LEASE_SECONDS = 60.0
+
 
 class UserService:
-    def __init__(self, session: AsyncSession, repo: UserRepository) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        repo: UserRepository,
+        deletions: UserDeletionRepository | None = None,
+    ) -> None:
         self.session = session
         self.repo = repo
+        self.deletions = deletions or UserDeletionRepository(session)
         self.password_helper = PasswordHelper()
 
     async def create_user(self, create_user: UserCreateDTO) -> UserReadDTO:
@@ -21,13 +45,13 @@ class UserService:
             raise UserAlreadyExists()
         new_user = await self.repo.create(
             email=create_user.email,
-            hashed_password=self.password_helper.hash(create_user.password),
+            hashed_password=await self.password_helper.hash_async(create_user.password),
         )
         return self.to_dto(new_user)
 
     async def get_users(self) -> list[UserReadDTO]:
-        users = await self.repo.list()
-        return [self.to_dto(u) for u in users]
+        rows = await self.repo.list_read()
+        return [UserReadDTO(**row._mapping) for row in rows]
 
     async def get_user(self, id: int) -> UserReadDTO:
         user = await self.repo.get_by_id(id)
@@ -43,10 +67,61 @@ class UserService:
         return self.to_dto(updated_user)
 
     async def delete_user(self, id: int) -> None:
+        """
+        Деактивирует пользователя и записывает удаление в БД. Посты и сама
+        запись удаляются позже в purge_user, поэтому время запроса не зависит
+        от числа постов.
+        """
         exists = await self.repo.exists(id=id)
         if not exists:
             raise UserNotExists()
-        await self.repo.delete(id)
+        await self.deletions.request(id, datetime.now(UTC))
+        # Коммитит и запись об удалении
+        await self.repo.update(id, is_active=False)
+
+    async def purge_user(self, id: int, chunk_size: int = DELETE_CHUNK_SIZE) -> None:
+        """
+        Фоновая задача: удаляет посты порциями, затем запись пользователя.
+        Прогресс сохраняется после каждой порции; если процесс упал, удаление
+        продолжит resume_user_deletions.
+        """
+        now = datetime.now(UTC)
+        stale_before = now - timedelta(seconds=DELETION_LEASE_SECONDS)
+        try:
+            if not await self.deletions.claim(id, now, stale_before):
+                return
+            await self.session.commit()
+            progress = await self.deletions.get(id)
+            deleted = progress.deleted_posts
+            total = deleted + await self.repo.count_posts(id)
+            await self.deletions.update(id, total_posts=total)
+            while True:
+                count = await self.repo.delete_posts_chunk(id, chunk_size)
+                deleted += count
+                await self.deletions.update(
+                    id, deleted_posts=deleted, updated_at=datetime.now(UTC)
+                )
+                await self.session.commit()
+                if count < chunk_size:
+                    break
+            finished_at = datetime.now(UTC)
+            await self.deletions.update(
+                id,
+                status=DeletionStatus.FINISHED,
+                updated_at=finished_at,
+                finished_at=finished_at,
+            )
+            # Коммитит и отметку о завершении
+            await self.repo.delete(id)
+        except Exception:
+            logger.exception("Deletion of user %s failed", id)
+            raise
+        finally:
+            await self.session.close()
+
+    async def get_deletion(self, id: int) -> UserDeletionDTO | None:
+        deletion = await self.deletions.get(id)
+        return None if deletion is None else self.deletion_to_dto(deletion)
 
     @staticmethod
     def to_dto(user: User) -> UserReadDTO:
@@ -62,6 +137,46 @@ class UserService:
             created_at=user.create_at,
         )
 
+    @staticmethod
+    def deletion_to_dto(deletion: UserDeletion) -> UserDeletionDTO:
+        return UserDeletionDTO(
+            user_id=deletion.user_id,
+            status=deletion.status,
+            total_posts=deletion.total_posts,
+            deleted_posts=deletion.deleted_posts,
+        )
+
     @staticmethod
     def from_dto(user_dto: UserUpdateDTO) -> dict[str, Any]:
         return {k: v for k, v in user_dto.__dict__.items() if v is not None}
+
+
+async def resume_user_deletions(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> list[int]:
+    """Продолжает удаления, брошенные упавшим процессом. Возвращает их id."""
+    stale_before = datetime.now(UTC) - timedelta(seconds=DELETION_LEASE_SECONDS)
+    async with session_factory() as session:
+        ids = await UserDeletionRepository(session).list_stale(stale_before)
+    for id in ids:
+        async with session_factory() as session:
+            service = UserService(session, UserRepository(session))
+            # Ошибка уже записана в purge_user; повтор — на следующем проходе
+            with contextlib.suppress(Exception):
+                await service.purge_user(id)
+    return list(ids)
+
+
+async def sweep_user_deletions(
+    session_factory: async_sessionmaker[AsyncSession], interval: float
+) -> None:
+    """Проверяет брошенные удаления при запуске и затем каждые `interval` секунд."""
+    while True:
+        try:
+            resumed = await resume_user_deletions(session_factory)
+        except Exception:
+            logger.exception("Resuming user deletions failed")
+        else:
+            if resumed:
+                logger.info("Resumed user deletions: %s", resumed)
+        await asyncio.sleep(interval)
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import signal
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.dtos.emails import EmailDTO
+from src.models.outbox import EmailOutbox
+from src.repositories.outbox_repo import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxWorker:
+    """
+    Разбирает таблицу email_outbox порциями и отправляет письма вне запросов.
+    Неудачная отправка повторяется с экспоненциальной задержкой, после
+    `max_attempts` попыток письмо переводится в DEAD. Отправленные письма
+    удаляются через `retention` секунд.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        send: Callable[[EmailDTO], Awaitable[None]],
+        batch_size: int = 50,
+        concurrency: int = 4,
+        max_attempts: int = 8,
+        backoff: float = 5.0,
+        max_backoff: float = 3600.0,
+        lease: float = 300.0,
+        poll_interval: float = 1.0,
+        retention: float = 7 * 24 * 3600.0,
+        purge_interval: float = 3600.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.send = send
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.purge_interval = purge_interval
+
+    def retry_delay(self, attempts: int) -> float:
+        """Задержка перед следующей попыткой; attempts — число уже неудачных."""
+        return min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+
+    async def _send(
+        self, item: EmailOutbox, slots: asyncio.Semaphore
+    ) -> Exception | None:
+        email = EmailDTO(item.to_email, item.subject, item.template_name, item.context)
+        async with slots:
+            try:
+                await self.send(email)
+            except Exception as e:
+                return e
+        return None
+
+    async def run_once(self) -> int:
+        """Отправляет одну порцию писем. Возвращает число взятых из очереди."""
+        now = datetime.now(UTC)
+        async with self.session_factory() as session:
+            repo = OutboxRepository(session)
+            items = await repo.claim_batch(
+                self.batch_size, now, now + timedelta(seconds=self.lease)
+            )
+            if not items:
+                return 0
+            slots = asyncio.Semaphore(self.concurrency)
+            errors = await asyncio.gather(*(self._send(i, slots) for i in items))
+            done = datetime.now(UTC)
+            await repo.mark_sent(
+                [i.id for i, e in zip(items, errors) if e is None], done
+            )
+            for item, error in zip(items, errors):
+                if error is None:
+                    continue
+                attempts = item.attempts + 1
+                retry_at = None
+                if attempts < self.max_attempts:
+                    retry_at = done + timedelta(seconds=self.retry_delay(attempts))
+                    logger.warning(
+                        "Email %s failed: %r, retry at %s", item.id, error, retry_at
+                    )
+                else:
+                    logger.error("Email %s moved to dead letters: %r", item.id, error)
+                await repo.mark_failed(item, repr(error), retry_at)
+            return len(items)
+
+    async def purge(self) -> int:
+        """Удаляет отправленные письма старше `retention`."""
+        before = datetime.now(UTC) - timedelta(seconds=self.retention)
+        async with self.session_factory() as session:
+            return await OutboxRepository(session).purge_sent(before)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Работает до установки `stop`; полная порция забирается без паузы."""
+        purged_at = 0.0
+        while not stop.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Outbox batch failed")
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue
+            if time.monotonic() - purged_at >= self.purge_interval:
+                purged_at = time.monotonic()
+                try:
+                    await self.purge()
+                except Exception:
+                    logger.exception("Outbox purge failed")
+            try:
+                await asyncio.wait_for(stop.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+
+async def main() -> None:
+    from src.auth.emails import close_smtp_pool, deliver
+    from src.core.config import settings
+    from src.db.database import AsyncSessionLocal, async_engine
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    worker = EmailOutboxWorker(
+        AsyncSessionLocal,
+        deliver,
+        batch_size=settings.OUTBOX_BATCH_SIZE,
+        concurrency=settings.MAIL_POOL_SIZE,
+        max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+        poll_interval=settings.OUTBOX_POLL_SECONDS,
+    )
+    try:
+        await worker.run(stop)
+    finally:
+        await close_smtp_pool()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -7,7 +7,8 @@ from sqlalchemy.orm import sessionmaker
 
 from src.auth.hashing_password import PasswordHelper
 from src.auth.jwt import create_access_token
-from src.db.database import get_db
+from src.db.database import engine_options, get_db
+from src.db.timeouts import enable_statement_timeouts
 from src.main import app
 from src.models.base import Base
 from src.models.users import User
@@ -20,7 +21,10 @@ TEST_DATABASE_URL = (
 
 @pytest_asyncio.fixture
 async def test_engine() -> AsyncGenerator[AsyncEngine, None]:
-    async_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    async_engine = create_async_engine(
+        TEST_DATABASE_URL, echo=False, **engine_options(TEST_DATABASE_URL)
+    )
+    enable_statement_timeouts(async_engine)
     async with async_engine.begin() as conn:
         # Создаём все таблицы
         await conn.run_sync(Base.metadata.create_all)
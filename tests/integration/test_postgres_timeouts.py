@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.timeouts import (
+    clear_query_deadline,
+    interrupt_queries,
+    is_query_timeout,
+    set_query_deadline,
+)
+
+
+@pytest.mark.integration
+class TestStatementTimeout:
+    async def test_statement_timeout(self, db_session: AsyncSession) -> None:
+        """Проверяем statement_timeout PostgreSQL по дедлайну сессии"""
+        set_query_deadline(db_session, 0.1)
+        with pytest.raises(DBAPIError) as exc_info:
+            await db_session.execute(text("SELECT pg_sleep(5)"))
+        assert is_query_timeout(exc_info.value)
+        await db_session.rollback()
+        clear_query_deadline(db_session)
+
+    async def test_interrupt_running_query(self, db_session: AsyncSession) -> None:
+        """Проверяем отмену выполняющегося запроса через pg_cancel_backend"""
+        set_query_deadline(db_session, 60)
+        query = asyncio.create_task(db_session.execute(text("SELECT pg_sleep(5)")))
+        await asyncio.sleep(0.3)
+        await interrupt_queries(db_session)
+        with pytest.raises(DBAPIError) as exc_info:
+            await query
+        assert is_query_timeout(exc_info.value)
+        await db_session.rollback()
+        clear_query_deadline(db_session)
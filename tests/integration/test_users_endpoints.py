@@ -5,6 +5,7 @@ from fastapi import status
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.models.posts import Post
 from src.models.users import User
 from src.repositories.user_repo import UserRepository
 
@@ -128,6 +129,26 @@ class TestUserAPI:
         response = await superuser_client.delete(f"/users/{user_db.id}")
         assert response.status_code == status.HTTP_204_NO_CONTENT
 
+    async def test_delete_user_with_posts(
+        self, superuser_client: AsyncClient, user_db: User, db_session: AsyncSession
+    ) -> None:
+        """Проверяем фоновое удаление постов и пользователя"""
+        db_session.add_all(
+            Post(title=f"post {i}", content="content", author_id=user_db.id)
+            for i in range(3)
+        )
+        await db_session.commit()
+        response = await superuser_client.delete(f"/users/{user_db.id}")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = await superuser_client.get(f"/users/{user_db.id}/deletion")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["deleted_posts"] == 3
+        assert response.json()["finished"] is True
+        repo = UserRepository(db_session)
+        assert await repo.get_by_id(user_db.id) is None
+        assert await repo.count_posts(user_db.id) == 0
+
     @pytest.mark.parametrize(
         "url, method, data",
         (
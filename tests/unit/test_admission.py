@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+from fastapi import BackgroundTasks, FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from src.core.admission import AdaptiveLimit, admission_rejected, route_class
+from src.middleware import AdmissionMiddleware
+
+
+@pytest.mark.unit
+class TestAdaptiveLimit:
+    @pytest.mark.parametrize(
+        "method, path, expected",
+        (
+            ("POST", "/auth/login", "auth"),
+            ("POST", "/users/register", "auth"),
+            ("POST", "/auth/reset-password", "auth"),
+            ("POST", "/auth/refresh", "write"),
+            ("POST", "/auth/verify", "write"),
+            ("POST", "/auth/request-verify-token", "write"),
+            ("GET", "/posts/7", "read"),
+            ("HEAD", "/users/", "read"),
+            ("PATCH", "/users/me", "write"),
+            ("GET", "/metrics", None),
+        ),
+    )
+    def test_route_class(self, method: str, path: str, expected: str | None) -> None:
+        """Проверяем классификацию маршрутов"""
+        assert route_class(method, path) == expected
+
+    def test_rejects_over_limit(self) -> None:
+        """Проверяем отказ сверх лимита"""
+        limit = AdaptiveLimit("test_reject", max_limit=2, target=1.0)
+        before = admission_rejected.get("test_reject")
+
+        assert limit.try_acquire()
+        assert limit.try_acquire()
+        assert not limit.try_acquire()
+        assert admission_rejected.get("test_reject") == before + 1
+
+        limit.release(0.01)
+        assert limit.try_acquire()
+
+    def test_slow_responses_decrease_limit(self) -> None:
+        """Проверяем мультипликативное уменьшение не чаще раза за target"""
+        limit = AdaptiveLimit("test_decrease", max_limit=10, target=60.0)
+        for _ in range(3):
+            limit.try_acquire()
+            limit.release(120.0)
+        assert limit.limit == pytest.approx(9.0)
+
+        limit._last_decrease = 0.0
+        limit.try_acquire()
+        limit.release(0.0, overloaded=True)
+        assert limit.limit == pytest.approx(8.1)
+
+    def test_limit_recovers(self) -> None:
+        """Проверяем аддитивный рост до максимума при быстрых ответах"""
+        limit = AdaptiveLimit("test_increase", max_limit=4, target=0.1, min_limit=2)
+        limit.limit = 2.0
+        # Один долгий запрос держит лимит занятым наполовину и больше
+        limit.try_acquire()
+        for _ in range(20):
+            limit.try_acquire()
+            limit.release(0.01)
+        assert limit.limit == 4
+
+    def test_no_growth_when_idle(self) -> None:
+        """Проверяем, что неиспользуемый лимит не растёт"""
+        limit = AdaptiveLimit("test_idle", max_limit=100, target=0.1)
+        limit.limit = 40.0
+        limit.try_acquire()
+        limit.release(0.01)
+        assert limit.limit == 40.0
+
+
+@pytest.mark.unit
+class TestAdmissionMiddleware:
+    async def test_sheds_with_retry_after(self) -> None:
+        """Проверяем 503 с Retry-After сверх лимита и обход для /metrics"""
+        app = FastAPI()
+        release = asyncio.Event()
+
+        @app.get("/slow")
+        async def slow() -> dict[str, bool]:
+            await release.wait()
+            return {"ok": True}
+
+        @app.get("/metrics")
+        async def metrics() -> dict[str, bool]:
+            return {"ok": True}
+
+        limit = AdaptiveLimit("read", max_limit=1, target=10.0)
+        transport = ASGITransport(AdmissionMiddleware(app, {"read": limit}))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.get("/slow"))
+            while limit.in_flight == 0:
+                await asyncio.sleep(0)
+            shed = await client.get("/slow")
+            exempt = await client.get("/metrics")
+            release.set()
+            admitted = await first
+
+        assert shed.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert shed.headers["retry-after"] == "1"
+        assert exempt.status_code == status.HTTP_200_OK
+        assert admitted.status_code == status.HTTP_200_OK
+        assert limit.in_flight == 0
+
+    async def test_background_task_releases_slot(self) -> None:
+        """Проверяем освобождение слота до выполнения фоновой задачи"""
+        app = FastAPI()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def background() -> None:
+            started.set()
+            await release.wait()
+
+        @app.get("/background")
+        async def endpoint(tasks: BackgroundTasks) -> dict[str, bool]:
+            tasks.add_task(background)
+            return {"ok": True}
+
+        limit = AdaptiveLimit("read", max_limit=1, target=10.0)
+        transport = ASGITransport(AdmissionMiddleware(app, {"read": limit}))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            request = asyncio.create_task(client.get("/background"))
+            await started.wait()
+            in_flight = limit.in_flight
+            release.set()
+            response = await request
+
+        assert response.status_code == status.HTTP_200_OK
+        assert in_flight == 0
+        assert limit.in_flight == 0
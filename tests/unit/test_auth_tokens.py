@@ -0,0 +1,267 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from unittest.mock import AsyncMock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.api.dependencies import get_auth_service
+from src.auth.hashing_password import PasswordHelper
+from src.auth.jwt import VERIFY_AUDIENCE, create_purpose_token, read_token
+from src.core.config import settings
+from src.exceptions.users import (
+    InvalidRefreshToken,
+    InvalidResetPasswordToken,
+    InvalidVerifyToken,
+    UserAlreadyVerified,
+)
+from src.init_db import init_db
+from src.main import app
+from src.models.outbox import EmailOutbox
+from src.models.users import User
+from src.repositories.user_repo import UserRepository
+from src.services.auth_service import AuthService
+
+EMAIL = "user@example.com"
+
+
+@pytest_asyncio.fixture
+async def auth_service(tmp_path: Path) -> AsyncGenerator[AuthService, None]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+    await init_db(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(User(email=EMAIL, hashed_password=PasswordHelper().hash("old")))
+        await session.commit()
+        yield AuthService(session, UserRepository(session))
+    await engine.dispose()
+
+
+async def queued_context(service: AuthService) -> dict:
+    result = await service.session.execute(
+        select(EmailOutbox).order_by(EmailOutbox.id.desc())
+    )
+    return result.scalars().first().context
+
+
+@pytest.mark.unit
+class TestAuthTokens:
+    async def test_verify_flow(self, auth_service: AuthService) -> None:
+        """Проверяем подтверждение email одноразовым токеном из письма"""
+        await auth_service.request_verify(EMAIL)
+        url = (await queued_context(auth_service))["confirmation_url"]
+        token = parse_qs(urlparse(url).query)["token"][0]
+
+        user = await auth_service.verify(token)
+        assert user.is_verified
+
+        with pytest.raises(UserAlreadyVerified):
+            await auth_service.verify(token)
+
+    async def test_verify_token_invalid_after_email_change(
+        self, auth_service: AuthService
+    ) -> None:
+        """Проверяем, что смена email делает токен подтверждения недействительным"""
+        await auth_service.request_verify(EMAIL)
+        url = (await queued_context(auth_service))["confirmation_url"]
+        token = parse_qs(urlparse(url).query)["token"][0]
+        user = await auth_service.repo.get_by_email(EMAIL)
+        await auth_service.repo.update(user.id, email="new@example.com")
+
+        with pytest.raises(InvalidVerifyToken):
+            await auth_service.verify(token)
+
+    async def test_reset_password_flow(self, auth_service: AuthService) -> None:
+        """Проверяем сброс пароля и повторное использование токена"""
+        await auth_service.forgot_password(EMAIL)
+        token = (await queued_context(auth_service))["token"]
+
+        await auth_service.reset_password(token, "new")
+        assert await auth_service.authenticate(EMAIL, "new")
+
+        with pytest.raises(InvalidResetPasswordToken):
+            await auth_service.reset_password(token, "other")
+
+    async def test_tokens_are_not_interchangeable(
+        self, auth_service: AuthService
+    ) -> None:
+        """Проверяем, что токен подтверждения не годится для сброса пароля и входа"""
+        user = await auth_service.repo.get_by_email(EMAIL)
+        token = create_purpose_token(user.id, VERIFY_AUDIENCE, "x", 60)
+        with pytest.raises(InvalidResetPasswordToken):
+            await auth_service.reset_password(token, "new")
+        assert read_token(token) == {}
+
+    async def test_expired_token(self, auth_service: AuthService) -> None:
+        """Проверяем отказ для просроченного токена"""
+        user = await auth_service.repo.get_by_email(EMAIL)
+        token = create_purpose_token(user.id, VERIFY_AUDIENCE, "x", -1)
+        with pytest.raises(InvalidVerifyToken):
+            await auth_service.verify(token)
+
+    async def test_unknown_email_is_silent(self, auth_service: AuthService) -> None:
+        """Проверяем, что запрос для неизвестного адреса не ставит письмо"""
+        await auth_service.forgot_password("missing@example.com")
+        await auth_service.request_verify("missing@example.com")
+        result = await auth_service.session.execute(select(EmailOutbox))
+        assert result.scalars().all() == []
+
+
+@pytest.mark.unit
+class TestRefreshTokens:
+    async def test_login_and_rotation(self, auth_service: AuthService) -> None:
+        """Проверяем выдачу refresh-токена при входе и его обмен на новую пару"""
+        token = await auth_service.login(EMAIL, "old")
+        assert token.refresh_token
+
+        refreshed = await auth_service.refresh(token.refresh_token)
+
+        assert read_token(refreshed.access_token)["sub"] == EMAIL
+        assert refreshed.refresh_token not in (None, token.refresh_token)
+        assert await auth_service.refresh(refreshed.refresh_token)
+
+    async def test_refresh_without_password_verify(
+        self, auth_service: AuthService, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Проверяем, что обмен токена не проверяет пароль"""
+        token = await auth_service.login(EMAIL, "old")
+        verify = AsyncMock()
+        monkeypatch.setattr(auth_service.password_helper, "verify_async", verify)
+
+        await auth_service.refresh(token.refresh_token)
+
+        verify.assert_not_awaited()
+
+    async def test_reuse_revokes_family(self, auth_service: AuthService) -> None:
+        """Проверяем, что повторное использование токена отзывает всю цепочку"""
+        first = await auth_service.login(EMAIL, "old")
+        second = await auth_service.refresh(first.refresh_token)
+        other_session = await auth_service.login(EMAIL, "old")
+
+        with pytest.raises(InvalidRefreshToken):
+            await auth_service.refresh(first.refresh_token)
+        with pytest.raises(InvalidRefreshToken):
+            await auth_service.refresh(second.refresh_token)
+        assert await auth_service.refresh(other_session.refresh_token)
+
+    @pytest.mark.parametrize(
+        "tamper",
+        (
+            lambda token: token + "x",
+            lambda token: "999." + token.partition(".")[2],
+            lambda token: token.partition(".")[2],
+            lambda token: "²." + token.partition(".")[2],
+            lambda token: f"{2**31}." + token.partition(".")[2],
+            lambda token: "",
+        ),
+    )
+    async def test_invalid_token(self, auth_service: AuthService, tamper) -> None:
+        """Проверяем отказ для подделанного или неверного токена"""
+        token = await auth_service.login(EMAIL, "old")
+
+        with pytest.raises(InvalidRefreshToken):
+            await auth_service.refresh(tamper(token.refresh_token))
+        assert await auth_service.refresh(token.refresh_token)
+
+    async def test_expired(
+        self, auth_service: AuthService, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Проверяем отказ для просроченного токена"""
+        monkeypatch.setattr(settings, "REFRESH_TOKEN_LIFETIME_SECONDS", -1)
+        token = await auth_service.login(EMAIL, "old")
+
+        with pytest.raises(InvalidRefreshToken):
+            await auth_service.refresh(token.refresh_token)
+
+    async def test_reset_password_revokes(self, auth_service: AuthService) -> None:
+        """Проверяем, что сброс пароля отзывает refresh-токены"""
+        token = await auth_service.login(EMAIL, "old")
+        await auth_service.forgot_password(EMAIL)
+        reset = (await queued_context(auth_service))["token"]
+
+        await auth_service.reset_password(reset, "new")
+
+        with pytest.raises(InvalidRefreshToken):
+            await auth_service.refresh(token.refresh_token)
+
+
+@pytest_asyncio.fixture
+async def auth_client() -> AsyncGenerator[tuple[AsyncClient, AsyncMock], None]:
+    service = AsyncMock(spec=AuthService)
+    app.dependency_overrides[get_auth_service] = lambda: service
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://test"
+    ) as client:
+        yield client, service
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.unit
+class TestAuthTokensAPI:
+    async def test_request_verify_token(
+        self, auth_client: tuple[AsyncClient, AsyncMock]
+    ) -> None:
+        """Проверяем постановку письма подтверждения в очередь"""
+        client, service = auth_client
+        response = await client.post("/auth/request-verify-token", json={"email": EMAIL})
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        service.request_verify.assert_awaited_once_with(EMAIL)
+
+    @pytest.mark.parametrize(
+        "error, detail",
+        (
+            (InvalidVerifyToken(), "VERIFY_USER_BAD_TOKEN"),
+            (UserAlreadyVerified(), "VERIFY_USER_ALREADY_VERIFIED"),
+        ),
+    )
+    async def test_verify_errors(
+        self, auth_client: tuple[AsyncClient, AsyncMock], error: Exception, detail: str
+    ) -> None:
+        """Проверяем ответы на неверный токен подтверждения"""
+        client, service = auth_client
+        service.verify.side_effect = error
+        response = await client.post("/auth/verify", json={"token": "t"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == detail
+
+    async def test_refresh_bad_token(
+        self, auth_client: tuple[AsyncClient, AsyncMock]
+    ) -> None:
+        """Проверяем ответ на неверный refresh-токен"""
+        client, service = auth_client
+        service.refresh.side_effect = InvalidRefreshToken()
+        response = await client.post("/auth/refresh", json={"refresh_token": "t"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "REFRESH_BAD_TOKEN"
+        service.refresh.assert_awaited_once_with("t")
+
+    async def test_refresh_malformed_token_id(self, auth_service: AuthService) -> None:
+        """Проверяем 400 для id токена с цифрами Unicode и вне диапазона Integer"""
+        app.dependency_overrides[get_auth_service] = lambda: auth_service
+        async with AsyncClient(
+            transport=ASGITransport(app), base_url="http://test"
+        ) as client:
+            responses = [
+                await client.post("/auth/refresh", json={"refresh_token": token})
+                for token in ("².abc", f"{2**31}.abc")
+            ]
+        app.dependency_overrides.clear()
+        for response in responses:
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert response.json()["detail"] == "REFRESH_BAD_TOKEN"
+
+    async def test_reset_password_bad_token(
+        self, auth_client: tuple[AsyncClient, AsyncMock]
+    ) -> None:
+        """Проверяем ответ на неверный токен сброса пароля"""
+        client, service = auth_client
+        service.reset_password.side_effect = InvalidResetPasswordToken()
+        response = await client.post(
+            "/auth/reset-password", json={"token": "t", "password": "new"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "RESET_PASSWORD_BAD_TOKEN"
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime, timedelta
+from email.message import Message
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.core.ratelimit import RateLimiter
+from src.exceptions.emails import EmailTemplateNotExists
+from src.init_db import init_db
+from src.models.users import User
+from src.repositories.broadcast_repo import BroadcastRepository
+from src.repositories.user_repo import UserRepository
+from src.services.broadcast_service import (
+    BROADCAST_LEASE_SECONDS,
+    BroadcastService,
+    interrupt_stale_broadcasts,
+)
+
+
+@pytest_asyncio.fixture
+async def users_engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+    await init_db(engine)
+    session_factory = async_sessionmaker(engine)
+    async with session_factory() as session:
+        session.add_all(
+            User(
+                email=f"user{i}@example.com",
+                hashed_password="x",
+                is_verified=i % 2 == 0,
+            )
+            for i in range(25)
+        )
+        await session.commit()
+    yield engine
+    await engine.dispose()
+
+
+class FakeSender:
+    def __init__(self, delay: float = 0.0, fail: set[str] | None = None) -> None:
+        self.delay = delay
+        self.fail = fail or set()
+        self.sent: list[Message] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, message: Message) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if message["To"] in self.fail:
+                raise ConnectionError("rejected")
+            self.sent.append(message)
+        finally:
+            self.in_flight -= 1
+
+
+def make_service(
+    engine: AsyncEngine, send: FakeSender, **kwargs
+) -> BroadcastService:
+    session = AsyncSession(engine, expire_on_commit=False)
+    return BroadcastService(session, UserRepository(session), send=send, **kwargs)
+
+
+@pytest.mark.unit
+class TestBroadcastService:
+    async def test_broadcast_to_filtered_users(self, users_engine: AsyncEngine) -> None:
+        """Проверяем рассылку неподтверждённым пользователям и прогресс"""
+        sender = FakeSender(delay=0.005)
+        service = make_service(
+            users_engine, sender, concurrency=3, rate=10_000, batch_size=4
+        )
+        created = await service.create_broadcast(
+            "reset_password.html", "Тема", {"token": "t"}, {"is_verified": False}
+        )
+        assert created.status == "pending"
+        await service.run_broadcast(created.id)
+
+        # Прогресс читается из БД другим процессом
+        broadcast = await make_service(users_engine, sender).get_broadcast(created.id)
+        assert broadcast.finished and not broadcast.running
+        assert broadcast.total == broadcast.sent == 12
+        assert broadcast.failed == 0
+        assert broadcast.sends_per_second > 0
+        assert {m["To"] for m in sender.sent} == {
+            f"user{i}@example.com" for i in range(1, 25, 2)
+        }
+        assert sender.max_in_flight == 3
+
+    async def test_failed_sends_are_counted(self, users_engine: AsyncEngine) -> None:
+        """Проверяем, что ошибка отправки одному адресату не прерывает рассылку"""
+        sender = FakeSender(fail={"user0@example.com"})
+        service = make_service(users_engine, sender, rate=10_000)
+        created = await service.create_broadcast("reset_password.html", "Тема", {}, {})
+        await service.run_broadcast(created.id)
+        broadcast = await service.get_broadcast(created.id)
+        assert broadcast.sent == 24
+        assert broadcast.failed == 1
+        assert broadcast.finished
+
+    async def test_unknown_template(self, users_engine: AsyncEngine) -> None:
+        """Проверяем отказ для несуществующего шаблона"""
+        service = make_service(users_engine, FakeSender())
+        with pytest.raises(EmailTemplateNotExists):
+            await service.create_broadcast("missing.html", "Тема", {}, {})
+
+    async def test_broadcast_runs_once(self, users_engine: AsyncEngine) -> None:
+        """Проверяем, что повторный запуск рассылки ничего не отправляет"""
+        sender = FakeSender()
+        service = make_service(users_engine, sender, rate=10_000)
+        created = await service.create_broadcast("reset_password.html", "Тема", {}, {})
+        await service.run_broadcast(created.id)
+        await make_service(users_engine, sender).run_broadcast(created.id)
+        assert len(sender.sent) == 25
+
+    async def test_cancelled_broadcast_interrupted(
+        self, users_engine: AsyncEngine
+    ) -> None:
+        """Проверяем сохранение прогресса при остановке воркера"""
+        sender = FakeSender(delay=0.01)
+        service = make_service(
+            users_engine, sender, concurrency=1, rate=10_000, batch_size=4
+        )
+        created = await service.create_broadcast("reset_password.html", "Тема", {}, {})
+        task = asyncio.create_task(service.run_broadcast(created.id))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        broadcast = await make_service(users_engine, sender).get_broadcast(created.id)
+        assert broadcast.status == "interrupted"
+        assert 0 < broadcast.sent < 25
+        assert broadcast.total == 25
+
+    async def test_stale_broadcast_interrupted(self, users_engine: AsyncEngine) -> None:
+        """Проверяем, что рассылка упавшего воркера отмечается прерванной"""
+        service = make_service(users_engine, FakeSender())
+        stale = await service.create_broadcast("reset_password.html", "Тема", {}, {})
+        alive = await service.create_broadcast("reset_password.html", "Тема", {}, {})
+        now = datetime.now(UTC)
+        lease = timedelta(seconds=BROADCAST_LEASE_SECONDS)
+        # Воркер взял рассылку и упал, не обновив отметку жизни
+        await service.broadcasts.claim(stale.id, now - 2 * lease)
+        await service.broadcasts.claim(alive.id, now)
+        await service.session.commit()
+        await service.session.close()
+
+        interrupted = await interrupt_stale_broadcasts(async_sessionmaker(users_engine))
+
+        assert interrupted == [stale.id]
+        async with AsyncSession(users_engine) as session:
+            repo = BroadcastRepository(session)
+            assert (await repo.get(stale.id)).status == "interrupted"
+            assert (await repo.get(alive.id)).status == "running"
+
+    async def test_rate_limiter(self) -> None:
+        """Проверяем, что лимитер не пропускает больше rate операций в секунду"""
+        limiter = RateLimiter(rate=100)
+        started = time.monotonic()
+        for _ in range(11):
+            await limiter.acquire()
+        assert time.monotonic() - started >= 0.09
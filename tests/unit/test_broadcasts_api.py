@@ -0,0 +1,99 @@
+from collections.abc import AsyncGenerator
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from tests.utils.fake_user import fake_superuser, fake_user
+
+from src.api.dependencies import get_broadcast_service, get_current_user
+from src.dtos.emails import BroadcastDTO
+from src.exceptions.emails import EmailTemplateNotExists
+from src.main import app
+from src.services.broadcast_service import BroadcastService
+
+
+@pytest.fixture
+def mock_broadcast_service() -> MagicMock:
+    return MagicMock(spec=BroadcastService)
+
+
+@pytest_asyncio.fixture
+async def broadcast_client(
+    mock_broadcast_service: MagicMock,
+) -> AsyncGenerator[AsyncClient, None]:
+    app.dependency_overrides[get_broadcast_service] = lambda: mock_broadcast_service
+    app.dependency_overrides[get_current_user] = fake_superuser
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://test"
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+def fake_broadcast() -> BroadcastDTO:
+    return BroadcastDTO(id=1, template_name="reset_password.html", subject="Тема")
+
+
+@pytest.mark.unit
+class TestBroadcastsAPI:
+    async def test_create_broadcast(
+        self, broadcast_client: AsyncClient, mock_broadcast_service: MagicMock
+    ) -> None:
+        """Проверяем запуск рассылки в фоне"""
+        mock_broadcast_service.create_broadcast.return_value = fake_broadcast()
+
+        response = await broadcast_client.post(
+            "/broadcasts/",
+            json={
+                "template_name": "reset_password.html",
+                "subject": "Тема",
+                "filter": {"is_verified": False},
+            },
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()["id"] == 1
+        mock_broadcast_service.create_broadcast.assert_called_once_with(
+            "reset_password.html", "Тема", {}, {"is_active": True, "is_verified": False}
+        )
+        mock_broadcast_service.run_broadcast.assert_awaited_once_with(1)
+
+    async def test_create_broadcast_unknown_template(
+        self, broadcast_client: AsyncClient, mock_broadcast_service: MagicMock
+    ) -> None:
+        """Проверяем ответ 400 для несуществующего шаблона"""
+        mock_broadcast_service.create_broadcast.side_effect = EmailTemplateNotExists()
+
+        response = await broadcast_client.post(
+            "/broadcasts/", json={"template_name": "missing.html", "subject": "Тема"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        mock_broadcast_service.run_broadcast.assert_not_called()
+
+    async def test_get_broadcast(
+        self, broadcast_client: AsyncClient, mock_broadcast_service: MagicMock
+    ) -> None:
+        """Проверяем получение прогресса рассылки"""
+        mock_broadcast_service.get_broadcast.return_value = fake_broadcast()
+        response = await broadcast_client.get("/broadcasts/1")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["sends_per_second"] == 0.0
+
+    async def test_get_broadcast_not_found(
+        self, broadcast_client: AsyncClient, mock_broadcast_service: MagicMock
+    ) -> None:
+        """Проверяем 404 для неизвестной рассылки"""
+        mock_broadcast_service.get_broadcast.return_value = None
+        response = await broadcast_client.get("/broadcasts/2")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_broadcast_requires_superuser(
+        self, broadcast_client: AsyncClient
+    ) -> None:
+        """Проверяем, что рассылки доступны только суперпользователю"""
+        app.dependency_overrides[get_current_user] = fake_user
+        response = await broadcast_client.get("/broadcasts/1")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,143 @@
+import gzip
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
+from src.middleware import CompressionMiddleware, accepted_encodings, brotli
+
+BODY = "Текст поста " * 500
+
+
+def make_app(**kwargs) -> tuple[FastAPI, CompressionMiddleware]:
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large() -> dict[str, str]:
+        return {"content": BODY}
+
+    @app.get("/small")
+    async def small() -> dict[str, str]:
+        return {"content": "short"}
+
+    @app.get("/image")
+    async def image() -> Response:
+        return Response(b"\x00" * 4096, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[str]:
+            for _ in range(3):
+                yield BODY
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/encoded")
+    async def encoded() -> Response:
+        return PlainTextResponse(
+            gzip.compress(BODY.encode()), headers={"Content-Encoding": "gzip"}
+        )
+
+    middleware = CompressionMiddleware(app, **kwargs)
+    return app, middleware
+
+
+async def get(middleware: CompressionMiddleware, path: str, accept: str = "gzip"):
+    transport = ASGITransport(middleware)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers={"Accept-Encoding": accept})
+
+
+@pytest.mark.unit
+class TestCompressionMiddleware:
+    async def test_large_json_gzipped(self) -> None:
+        """Проверяем сжатие большого JSON-ответа"""
+        _, middleware = make_app()
+        response = await get(middleware, "/large")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(BODY.encode())
+        assert response.json() == {"content": BODY}
+
+    @pytest.mark.parametrize(
+        "path, accept",
+        (
+            ("/small", "gzip"),
+            ("/large", "identity"),
+            ("/large", "gzip;q=0"),
+            ("/image", "gzip"),
+        ),
+    )
+    async def test_not_compressed(self, path: str, accept: str) -> None:
+        """Проверяем, что малые тела, бинарные типы и отказ клиента не сжимаются"""
+        _, middleware = make_app()
+        response = await get(middleware, path, accept)
+        assert "content-encoding" not in response.headers
+
+    async def test_already_encoded_passthrough(self) -> None:
+        """Проверяем, что уже сжатый ответ не сжимается повторно"""
+        _, middleware = make_app()
+        response = await get(middleware, "/encoded")
+        assert response.text == BODY
+
+    async def test_compressed_bytes_reused(self) -> None:
+        """Проверяем повторное использование сжатых байтов одинаковых ответов"""
+        _, middleware = make_app()
+        calls = 0
+        compress = middleware.compress
+
+        def counting(body: bytes, encoding: str) -> bytes:
+            nonlocal calls
+            calls += 1
+            return compress(body, encoding)
+
+        middleware.compress = counting
+        first = await get(middleware, "/large")
+        second = await get(middleware, "/large")
+        assert first.content == second.content
+        assert calls == 1
+
+    async def test_stream_compressed_incrementally(self) -> None:
+        """Проверяем потоковое сжатие без Content-Length"""
+        _, middleware = make_app(gzip_level=1)
+        response = await get(middleware, "/stream")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text == BODY * 3
+
+    async def test_compression_level(self) -> None:
+        """Проверяем, что уровень сжатия настраивается"""
+        _, fast = make_app(gzip_level=1, cache_bytes=0)
+        _, best = make_app(gzip_level=9, cache_bytes=0)
+        fast_size = int((await get(fast, "/large")).headers["content-length"])
+        best_size = int((await get(best, "/large")).headers["content-length"])
+        assert best_size <= fast_size
+
+    @pytest.mark.parametrize(
+        "accept, expected",
+        (
+            ("gzip, br", "br"),
+            ("gzip;q=1, br;q=0.1", "gzip"),
+            ("gzip;q=0.5, br;q=0.8", "br"),
+            ("*", "br"),
+            ("br;q=0, *", "gzip"),
+            ("identity", None),
+        ),
+    )
+    def test_choose_encoding(self, accept: str, expected: str | None) -> None:
+        """Проверяем выбор кодировки с наибольшим q и br при равенстве"""
+        if brotli is None and expected == "br":
+            expected = "gzip"
+        _, middleware = make_app()
+        scope = {"type": "http", "headers": [(b"accept-encoding", accept.encode())]}
+        assert middleware.choose_encoding(scope) == expected
+
+    def test_accept_encoding_parsing(self) -> None:
+        """Проверяем разбор Accept-Encoding"""
+        assert accepted_encodings("gzip;q=0.5, br , *;q=0") == {
+            "gzip": 0.5,
+            "br": 1.0,
+            "*": 0.0,
+        }
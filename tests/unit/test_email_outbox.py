@@ -0,0 +1,147 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.dtos.emails import EmailDTO
+from src.init_db import init_db
+from src.models.outbox import EmailOutbox, OutboxStatus
+from src.repositories.outbox_repo import OutboxRepository
+from src.workers.email_outbox import EmailOutboxWorker
+
+
+@pytest_asyncio.fixture
+async def outbox_engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+    await init_db(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(outbox_engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(outbox_engine, expire_on_commit=False)
+
+
+def make_email(to_email: str = "user@example.com") -> EmailDTO:
+    return EmailDTO(to_email, "Тема", "confirmation_email.html", {"token": "t"})
+
+
+async def enqueue(
+    session_factory: async_sessionmaker[AsyncSession], *emails: EmailDTO
+) -> None:
+    async with session_factory() as session:
+        repo = OutboxRepository(session)
+        for email in emails:
+            await repo.enqueue(email)
+        await session.commit()
+
+
+async def all_items(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> list[EmailOutbox]:
+    async with session_factory() as session:
+        result = await session.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+        return list(result.scalars())
+
+
+@pytest.mark.unit
+class TestEmailOutbox:
+    async def test_enqueue_dedupes(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Проверяем, что одинаковое письмо ставится в очередь один раз"""
+        await enqueue(session_factory, make_email(), make_email())
+        items = await all_items(session_factory)
+        assert len(items) == 1
+        assert items[0].status == OutboxStatus.PENDING
+
+    async def test_enqueue_rolled_back_with_transaction(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Проверяем, что письмо не остаётся в очереди при откате транзакции"""
+        async with session_factory() as session:
+            await OutboxRepository(session).enqueue(make_email())
+            await session.rollback()
+        assert await all_items(session_factory) == []
+
+    async def test_worker_sends_batch(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Проверяем отправку порции писем и пометку SENT"""
+        sent: list[EmailDTO] = []
+
+        async def send(email: EmailDTO) -> None:
+            sent.append(email)
+
+        await enqueue(session_factory, make_email("a@example.com"), make_email())
+        worker = EmailOutboxWorker(session_factory, send)
+        assert await worker.run_once() == 2
+        assert await worker.run_once() == 0
+        assert {e.to_email for e in sent} == {"a@example.com", "user@example.com"}
+        items = await all_items(session_factory)
+        assert all(i.status == OutboxStatus.SENT and i.sent_at for i in items)
+
+    async def test_worker_retries_then_dead_letters(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Проверяем повтор с задержкой и перевод в DEAD после max_attempts"""
+
+        async def send(email: EmailDTO) -> None:
+            raise ConnectionError("smtp down")
+
+        await enqueue(session_factory, make_email())
+        worker = EmailOutboxWorker(session_factory, send, max_attempts=2, backoff=0)
+        assert await worker.run_once() == 1
+        (item,) = await all_items(session_factory)
+        assert item.status == OutboxStatus.PENDING
+        assert item.attempts == 1
+        assert "smtp down" in item.last_error
+
+        assert await worker.run_once() == 1
+        (item,) = await all_items(session_factory)
+        assert item.status == OutboxStatus.DEAD
+        assert item.attempts == 2
+        assert await worker.run_once() == 0
+
+    async def test_retry_waits_for_backoff(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Проверяем, что письмо не берётся повторно до истечения задержки"""
+
+        async def send(email: EmailDTO) -> None:
+            raise ConnectionError("smtp down")
+
+        await enqueue(session_factory, make_email())
+        worker = EmailOutboxWorker(session_factory, send, backoff=60)
+        assert await worker.run_once() == 1
+        assert await worker.run_once() == 0
+        assert worker.retry_delay(3) == 240
+
+    async def test_resend_after_delivery(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Проверяем, что такое же письмо ставится снова после отправки первого"""
+        sent: list[EmailDTO] = []
+
+        async def send(email: EmailDTO) -> None:
+            sent.append(email)
+
+        worker = EmailOutboxWorker(session_factory, send, retention=0)
+        await enqueue(session_factory, make_email())
+        assert await worker.run_once() == 1
+        await enqueue(session_factory, make_email(), make_email())
+
+        items = await all_items(session_factory)
+        assert [i.status for i in items] == [OutboxStatus.SENT, OutboxStatus.PENDING]
+        assert await worker.purge() == 1
+        assert await worker.run_once() == 1
+        assert len(sent) == 2
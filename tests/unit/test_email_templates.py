@@ -0,0 +1,60 @@
+import email
+from pathlib import Path
+
+import pytest
+
+from src.auth.templates import EmailTemplates
+from src.dtos.emails import EmailDTO
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "templates"
+SENDER = "noreply@example.com"
+
+
+@pytest.fixture
+def registry(tmp_path: Path) -> EmailTemplates:
+    return EmailTemplates(TEMPLATES_DIR, SENDER, cache_dir=tmp_path / "bytecode")
+
+
+@pytest.mark.unit
+class TestEmailTemplates:
+    def test_template_compiled_once(
+        self, registry: EmailTemplates, tmp_path: Path
+    ) -> None:
+        """Проверяем, что шаблон компилируется один раз и кэшируется на диске"""
+        template = registry.get("reset_password.html")
+        assert registry.get("reset_password.html") is template
+        assert any((tmp_path / "bytecode").iterdir())
+
+    def test_build_message(self, registry: EmailTemplates) -> None:
+        """Проверяем заголовки и тело собранного письма"""
+        message = registry.build(
+            EmailDTO(
+                "user@example.com",
+                "Сброс пароля",
+                "reset_password.html",
+                {"token": "<abc>"},
+            )
+        )
+        parsed = email.message_from_bytes(message.as_bytes())
+        assert parsed["From"] == SENDER
+        assert parsed["To"] == "user@example.com"
+        (part,) = parsed.get_payload()
+        assert part.get_content_type() == "text/html"
+        html = part.get_payload(decode=True).decode("utf-8")
+        # autoescape включён для html
+        assert "&lt;abc&gt;" in html
+
+    def test_build_many_shares_identical_parts(
+        self, registry: EmailTemplates
+    ) -> None:
+        """Проверяем, что одинаковое тело кодируется в MIME-часть один раз"""
+        recipients = [
+            ("a@example.com", {"token": "same"}),
+            ("b@example.com", {"token": "same"}),
+            ("c@example.com", {"token": "other"}),
+        ]
+        messages = registry.build_many("reset_password.html", "Тема", recipients)
+        assert [m["To"] for m in messages] == [r[0] for r in recipients]
+        parts = [m.get_payload()[0] for m in messages]
+        assert parts[0] is parts[1]
+        assert parts[0] is not parts[2]
@@ -0,0 +1,57 @@
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.actions.generate_data import generate_data
+from src.models.base import Base
+from src.models.posts import Post
+from src.models.users import User
+
+
+async def generate(path: Path, seed: int) -> tuple[list, list]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await generate_data(engine, 200, 2000, "hash", seed=seed, batch_size=300)
+        async with engine.connect() as conn:
+            users = (
+                await conn.execute(select(User.id, User.email, User.create_at))
+            ).all()
+            posts = (
+                await conn.execute(
+                    select(Post.author_id, Post.title, Post.content, Post.pub_date)
+                )
+            ).all()
+    finally:
+        await engine.dispose()
+    return users, posts
+
+
+@pytest.mark.unit
+class TestGenerateData:
+    async def test_dataset(self, tmp_path: Path) -> None:
+        """Проверяем объём данных, даты публикаций и степенное распределение"""
+        users, posts = await generate(tmp_path / "db.sqlite3", seed=1)
+
+        assert len(users) == 200
+        assert len(posts) == 2000
+        joined = {id_: create_at for id_, _, create_at in users}
+        assert all(pub_date >= joined[author_id] for author_id, *_, pub_date in posts)
+        per_author = Counter(author_id for author_id, *_ in posts)
+        # Десятая часть авторов пишет больше половины постов
+        top = sum(count for _, count in per_author.most_common(20))
+        assert top > len(posts) / 2
+        assert len({len(content) for *_, content, _ in posts}) > 100
+
+    async def test_deterministic(self, tmp_path: Path) -> None:
+        """Проверяем, что один seed даёт одинаковые данные"""
+        first = await generate(tmp_path / "a.sqlite3", seed=7)
+        second = await generate(tmp_path / "b.sqlite3", seed=7)
+        other = await generate(tmp_path / "c.sqlite3", seed=8)
+
+        assert first == second
+        assert first[1] != other[1]
@@ -0,0 +1,51 @@
+import pytest
+from benchmarks.http_load import compare, summarize
+
+
+def result(rps: float, p95_ms: float, errors: int = 0, requests: int = 100) -> dict:
+    stats = {
+        "requests": requests,
+        "errors": errors,
+        "error_statuses": {"503": errors} if errors else {},
+        "rps": rps,
+        "p95_ms": p95_ms,
+    }
+    return {"total": stats, "scenarios": {"post_detail": stats}}
+
+
+@pytest.mark.unit
+class TestHttpLoadReport:
+    def test_summarize(self) -> None:
+        """Проверяем подсчёт ошибок и перцентилей задержки"""
+        samples = [(200, i / 1000) for i in range(1, 100)] + [(503, 0.1)]
+
+        stats = summarize(samples, seconds=2.0)
+
+        assert stats["requests"] == 100
+        assert stats["errors"] == 1
+        assert stats["error_statuses"] == {"503": 1}
+        assert stats["rps"] == 50.0
+        assert stats["p50_ms"] == 50.0
+        assert stats["p95_ms"] == 95.0
+
+    def test_no_regression_within_tolerance(self) -> None:
+        """Проверяем, что отклонения в пределах допуска не считаются регрессией"""
+        assert compare(result(90, 110), result(100, 100), tolerance=0.2) == []
+
+    @pytest.mark.parametrize(
+        "current", (result(70, 100), result(100, 150), result(100, 100, errors=10))
+    )
+    def test_regression(self, current: dict) -> None:
+        """Проверяем обнаружение падения rps, роста p95 и доли ошибок"""
+        regressions = compare(current, result(100, 100), tolerance=0.2)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("total:")
+        assert regressions[1].startswith("post_detail:")
+
+    def test_small_scenarios_skipped(self) -> None:
+        """Проверяем, что сценарии с малым числом запросов не сравниваются"""
+        current = result(10, 500, requests=10)
+        current["total"] = result(100, 100)["total"]
+
+        assert compare(current, result(100, 100), tolerance=0.2) == []
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from benchmarks.import_time import measure_import
+
+# Бюджет на холодный импорт приложения; переопределяется для медленных машин
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 1500))
+
+# Тяжёлые зависимости, которые должны загружаться только при первом использовании
+LAZY_MODULES = ("pwdlib", "argon2", "bcrypt", "jinja2", "aiosmtplib")
+
+
+@pytest.mark.unit
+class TestImportTime:
+    def test_app_import_within_budget(self) -> None:
+        """Проверяем время импорта src.main"""
+        profile = measure_import("src.main")
+        assert profile.total_us / 1000 < IMPORT_BUDGET_MS
+
+    @pytest.mark.parametrize("module", ("src.main", "src.actions.create_superuser"))
+    def test_heavy_modules_are_lazy(self, module: str) -> None:
+        """
+        Проверяем, что импорт не тянет хэширование и почту и не читает настройки:
+        модуль импортируется без переменных окружения
+        """
+        profile = measure_import(module)
+        assert not profile.loaded & set(LAZY_MODULES)
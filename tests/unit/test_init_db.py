@@ -0,0 +1,34 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.db.warmup import warm_up_pool
+from src.init_db import init_db
+from src.repositories.user_repo import WARMUP_STATEMENTS
+
+
+@pytest_asyncio.fixture
+async def sqlite_engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.unit
+class TestInitDB:
+    async def test_ddl_skipped_when_schema_current(
+        self, sqlite_engine: AsyncEngine
+    ) -> None:
+        """Проверяем, что повторный запуск не выполняет DDL"""
+        assert await init_db(sqlite_engine) is True
+        assert await init_db(sqlite_engine) is False
+
+    async def test_warm_up_pool(self, sqlite_engine: AsyncEngine) -> None:
+        """Проверяем прогрев всех соединений пула горячими запросами"""
+        await init_db(sqlite_engine)
+        opened = await warm_up_pool(sqlite_engine, WARMUP_STATEMENTS, size=3)
+        assert opened == 3
+        assert sqlite_engine.pool.checkedin() == 3
@@ -0,0 +1,104 @@
+import io
+import json
+import logging
+import queue
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.core.log import (
+    NonBlockingQueueHandler,
+    configure_logging,
+    log_records_dropped,
+    request_id,
+    stop_logging,
+)
+from src.middleware import RequestIdMiddleware
+
+
+@pytest.fixture
+def restore_logging() -> Iterator[None]:
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def records(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("restore_logging")
+class TestLogging:
+    def test_json_with_request_id(self) -> None:
+        """Проверяем JSON-записи с request_id и traceback"""
+        stream = io.StringIO()
+        configure_logging(stream=stream)
+        logger = logging.getLogger("test.json")
+        token = request_id.set("req-1")
+        try:
+            logger.info("user %s", 42, extra={"route": "/users"})
+            try:
+                1 / 0
+            except ZeroDivisionError:
+                logger.exception("failed")
+        finally:
+            request_id.reset(token)
+        stop_logging()
+
+        info, error = records(stream)
+        assert info["msg"] == "user 42"
+        assert info["request_id"] == "req-1"
+        assert info["logger"] == "test.json"
+        assert info["route"] == "/users"
+        assert error["level"] == "ERROR"
+        assert "ZeroDivisionError" in error["exc"]
+
+    def test_sampling(self) -> None:
+        """Проверяем, что сэмплирование не отбрасывает предупреждения"""
+        stream = io.StringIO()
+        configure_logging(stream=stream, sampling={"noisy": 0.0})
+        logging.getLogger("noisy.child").info("dropped")
+        logging.getLogger("noisy").warning("kept")
+        logging.getLogger("quiet").info("kept too")
+        stop_logging()
+        assert [r["msg"] for r in records(stream)] == ["kept", "kept too"]
+
+    def test_full_queue_drops_records(self) -> None:
+        """Проверяем, что при переполнении очереди запись отбрасывается"""
+        records: queue.Queue = queue.Queue(1)
+        logger = logging.getLogger("test.full")
+        logger.propagate = False
+        logger.addHandler(NonBlockingQueueHandler(records))
+        before = log_records_dropped.get()
+        try:
+            logger.warning("first %s", 1)
+            logger.warning("second")
+        finally:
+            logger.handlers.clear()
+            logger.propagate = True
+        assert log_records_dropped.get() == before + 1
+        record = records.get_nowait()
+        assert record.msg == "first 1"
+        assert record.args is None
+
+    async def test_request_id_middleware(self) -> None:
+        """Проверяем передачу и генерацию X-Request-ID"""
+        app = FastAPI()
+
+        @app.get("/id")
+        async def current_id() -> dict[str, str | None]:
+            return {"id": request_id.get()}
+
+        transport = ASGITransport(RequestIdMiddleware(app))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            given = await client.get("/id", headers={"X-Request-ID": "abc-1"})
+            generated = await client.get("/id", headers={"X-Request-ID": "bad id!"})
+        assert given.json()["id"] == given.headers["x-request-id"] == "abc-1"
+        assert generated.json()["id"] == generated.headers["x-request-id"]
+        assert len(generated.headers["x-request-id"]) == 32
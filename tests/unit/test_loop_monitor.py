@@ -0,0 +1,119 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.auth.hashing_password import PasswordHelper
+from src.core.loopmonitor import (
+    BlockingDetected,
+    LoopMonitor,
+    assert_no_blocking,
+    event_loop_blocked,
+    event_loop_lag,
+)
+from src.db.database import get_db
+from src.init_db import init_db
+from src.main import app
+from src.models.users import User
+
+EMAIL = "user@example.com"
+
+
+def blocking_handler() -> None:
+    time.sleep(0.2)
+
+
+@pytest_asyncio.fixture
+async def db_client(tmp_path: Path) -> AsyncGenerator[AsyncClient, None]:
+    """Клиент приложения с настоящей БД SQLite"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+    await init_db(engine)
+    async with AsyncSession(engine) as session:
+        session.add(User(email=EMAIL, hashed_password=PasswordHelper().hash("old")))
+        await session.commit()
+
+    async def get_test_db() -> AsyncGenerator[AsyncSession, None]:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://test"
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+@pytest.mark.unit
+class TestLoopMonitor:
+    async def test_lag_measured(self) -> None:
+        """Проверяем замер задержки event loop"""
+        monitor = LoopMonitor(interval=0.01, threshold=1.0)
+        before = event_loop_lag.samples()
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        after = event_loop_lag.samples()
+        count = next(v for (name, _), v in after.items() if name.endswith("_count"))
+        assert count > sum(
+            v for (name, _), v in before.items() if name.endswith("_count")
+        )
+
+    async def test_blocking_call_captured(self) -> None:
+        """Проверяем, что блокирующий вызов попадает в лог со стеком и задачей"""
+        monitor = LoopMonitor(interval=0.01, threshold=0.05)
+        before = event_loop_blocked.get()
+        monitor.start()
+
+        async def handler() -> None:
+            blocking_handler()
+
+        await asyncio.create_task(handler(), name="blocking-request")
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        [block] = monitor.blocks
+        assert block.duration == pytest.approx(0.2, abs=0.05)
+        assert block.task == "blocking-request"
+        assert "blocking_handler" in block.stack
+        assert event_loop_blocked.get() == before + 1
+
+    async def test_no_false_positives(self) -> None:
+        """Проверяем, что асинхронное ожидание не считается блокировкой"""
+        # Бюджет заведомо больше пауз планировщика и GC на нагруженном CI
+        async with assert_no_blocking(budget=1.0):
+            await asyncio.sleep(0.2)
+
+    async def test_endpoint_over_budget_fails(self) -> None:
+        """Проверяем падение теста, если эндпоинт блокирует loop дольше бюджета"""
+        app = FastAPI()
+
+        @app.get("/blocking")
+        async def blocking() -> dict[str, bool]:
+            blocking_handler()
+            return {"ok": True}
+
+        transport = ASGITransport(app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            with pytest.raises(BlockingDetected, match="blocking_handler"):
+                async with assert_no_blocking(budget=0.05):
+                    await client.get("/blocking")
+
+    async def test_login_does_not_block(self, db_client: AsyncClient) -> None:
+        """Проверяем, что вход (хэш пароля и запросы в БД) не блокирует loop"""
+        # Первый запрос прогревает соединение с БД и ленивые импорты
+        await db_client.post("/auth/login", data={"username": EMAIL, "password": "x"})
+        async with assert_no_blocking(budget=0.1):
+            response = await db_client.post(
+                "/auth/login", data={"username": EMAIL, "password": "old"}
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["access_token"]
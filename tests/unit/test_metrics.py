@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from httpx import ASGITransport, AsyncClient
+from tests.utils.fake_user import fake_superuser, fake_user
+
+from src.api.dependencies import get_current_user, get_user_or_404
+from src.auth.hashing_password import PasswordHelper, hash_queue_depth
+from src.core.metrics import MetricsRegistry, http_in_flight, http_requests
+from src.main import app
+from src.middleware import MetricsMiddleware
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+@pytest.mark.unit
+class TestMetrics:
+    def test_histogram_render(self) -> None:
+        """Проверяем формат экспозиции гистограммы"""
+        registry = MetricsRegistry()
+        latency = registry.histogram(
+            "latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)
+        )
+        latency.observe(0.05, "/a")
+        latency.observe(0.5, "/a")
+        latency.observe(5, "/a")
+        text = registry.render()
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1.0' in text
+        assert 'latency_seconds_bucket{route="/a",le="1.0"} 2.0' in text
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3.0' in text
+        assert 'latency_seconds_count{route="/a"} 3.0' in text
+        assert 'latency_seconds_sum{route="/a"} 5.55' in text
+
+    def test_locked_counter_from_threads(self) -> None:
+        """Проверяем, что счётчик с locked=True не теряет увеличения из потоков"""
+        registry = MetricsRegistry()
+        dropped = registry.counter("dropped", "Dropped", locked=True)
+
+        def work() -> None:
+            for _ in range(10_000):
+                dropped.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert dropped.get() == 80_000
+
+    def test_multiprocess_merge(self, tmp_path: Path) -> None:
+        """Проверяем суммирование снимков воркеров и пропуск gauge мёртвых"""
+        registry = MetricsRegistry()
+        registry.multiprocess_dir = tmp_path
+        requests = registry.counter("requests", "Requests", ("route",))
+        in_flight = registry.gauge("in_flight", "In flight")
+        requests.inc("/a")
+        in_flight.inc()
+        for pid in (os.getppid(), dead_pid()):
+            (tmp_path / f"{pid}.json").write_text(
+                json.dumps(
+                    {
+                        "requests": [["requests_total", [["route", "/a"]], 2.0]],
+                        "in_flight": [["in_flight", [], 5.0]],
+                    }
+                )
+            )
+        text = registry.render()
+        assert 'requests_total{route="/a"} 5.0' in text
+        assert "in_flight 6.0" in text
+
+    async def test_route_metrics(self) -> None:
+        """Проверяем метрики по шаблону маршрута и эндпоинт /metrics"""
+        app.dependency_overrides[get_current_user] = fake_superuser
+        app.dependency_overrides[get_user_or_404] = fake_user
+        before = http_requests.get("GET", "/users/me", "200")
+        async with AsyncClient(
+            transport=ASGITransport(app), base_url="http://test"
+        ) as client:
+            await client.get("/users/me")
+            response = await client.get("/metrics")
+        app.dependency_overrides.clear()
+        assert http_requests.get("GET", "/users/me", "200") == before + 1
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_requests_in_flight{method="GET",route="/users/me"} 0.0' in (
+            response.text
+        )
+        assert "http_request_duration_seconds_bucket" in response.text
+        assert 'db_pool_connections{state="size"} 5.0' in response.text
+
+    async def test_background_task_excluded(self) -> None:
+        """Проверяем, что фоновая задача не входит в запрос в метриках"""
+        background_app = FastAPI()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def background() -> None:
+            started.set()
+            await release.wait()
+
+        @background_app.get("/background")
+        async def endpoint(tasks: BackgroundTasks) -> dict[str, bool]:
+            tasks.add_task(background)
+            return {"ok": True}
+
+        before = http_requests.get("GET", "/background", "200")
+        transport = ASGITransport(
+            MetricsMiddleware(background_app, background_app.routes)
+        )
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            request = asyncio.create_task(client.get("/background"))
+            await started.wait()
+            in_flight = http_in_flight.get("GET", "/background")
+            counted = http_requests.get("GET", "/background", "200")
+            release.set()
+            await request
+
+        assert in_flight == 0
+        assert counted == before + 1
+        assert http_requests.get("GET", "/background", "200") == before + 1
+
+    async def test_hash_in_executor(self) -> None:
+        """Проверяем хэширование в пуле потоков и глубину очереди"""
+        helper = PasswordHelper()
+        hashed = await helper.hash_async("secret")
+        assert await helper.verify_async("secret", hashed)
+        assert hash_queue_depth.get() == 0
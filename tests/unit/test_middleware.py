@@ -0,0 +1,110 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+from starlette.responses import StreamingResponse
+from starlette.types import Message
+
+from src.middleware import ExceptionMiddleware
+
+
+class Item(BaseModel):
+    id: int
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ExceptionMiddleware)
+
+    @app.get("/validation")
+    async def validation() -> None:
+        Item.model_validate({"id": "x"})
+
+    @app.get("/value")
+    async def value() -> None:
+        raise ValueError("bad value")
+
+    @app.get("/error")
+    async def error() -> None:
+        raise RuntimeError("boom")
+
+    return app
+
+
+@pytest.mark.unit
+class TestExceptionMiddleware:
+    @pytest.mark.parametrize(
+        "path, status_code",
+        (("/validation", 422), ("/value", 422), ("/error", 500)),
+    )
+    async def test_error_mapping(self, path: str, status_code: int) -> None:
+        """Проверяем преобразование исключений в 422/500"""
+        transport = ASGITransport(make_app(), raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(path)
+        assert response.status_code == status_code
+        assert "detail" in response.json()
+
+    async def test_streaming_not_buffered(self) -> None:
+        """Проверяем, что фрагменты потокового ответа уходят клиенту сразу"""
+        release = asyncio.Event()
+        app = make_app()
+
+        @app.get("/stream")
+        async def stream() -> StreamingResponse:
+            async def chunks() -> AsyncIterator[bytes]:
+                yield b"first"
+                await release.wait()
+                yield b"second"
+
+            return StreamingResponse(chunks())
+
+        received: list[Message] = []
+        first_chunk = asyncio.Event()
+
+        async def receive() -> Message:
+            await asyncio.Event().wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            received.append(message)
+            if message.get("body") == b"first":
+                first_chunk.set()
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/stream",
+            "raw_path": b"/stream",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+        }
+        task = asyncio.create_task(app(scope, receive, send))
+        # Первый фрагмент доставлен, пока генератор ещё ждёт
+        await asyncio.wait_for(first_chunk.wait(), 1)
+        assert not task.done()
+        release.set()
+        await asyncio.wait_for(task, 1)
+        bodies = [m.get("body") for m in received if m["type"] == "http.response.body"]
+        assert bodies[:2] == [b"first", b"second"]
+
+    async def test_error_after_response_started_is_reraised(self) -> None:
+        """Проверяем, что после начала ответа исключение не подменяет ответ"""
+        app = make_app()
+
+        @app.get("/broken-stream")
+        async def broken_stream() -> StreamingResponse:
+            async def chunks() -> AsyncIterator[bytes]:
+                yield b"first"
+                raise RuntimeError("boom")
+
+            return StreamingResponse(chunks())
+
+        transport = ASGITransport(app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            with pytest.raises(RuntimeError):
+                await client.get("/broken-stream")
@@ -0,0 +1,240 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+from pydantic import TypeAdapter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.profiling import (
+    DB_WAIT,
+    EVENT_LOOP,
+    SERIALIZATION,
+    WAIT,
+    ProfileStore,
+    RequestProfiler,
+)
+from src.middleware import ProfilingMiddleware, RequestIdMiddleware
+
+ROWS_ADAPTER = TypeAdapter(list[dict[str, int]])
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 3000000)"
+    " SELECT count(*) FROM c"
+)
+
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def serialize(seconds: float) -> None:
+    rows = [{"id": i, "value": i * 2} for i in range(1000)]
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        ROWS_ADAPTER.dump_json(ROWS_ADAPTER.validate_python(rows))
+
+
+async def profile(coro_fn) -> RequestProfiler:
+    profiler = RequestProfiler(interval=0.001)
+
+    async def run() -> None:
+        profiler.start()
+        try:
+            await coro_fn()
+        finally:
+            profiler.stop()
+
+    await asyncio.create_task(run())
+    return profiler
+
+
+@pytest.mark.unit
+class TestRequestProfiler:
+    async def test_breakdown(self) -> None:
+        """Проверяем разделение времени на работу в loop, сериализацию и ожидание"""
+
+        async def handler() -> None:
+            busy(0.1)
+            serialize(0.1)
+            await asyncio.sleep(0.1)
+
+        profiler = await profile(handler)
+        breakdown = profiler.breakdown()
+
+        for category in (EVENT_LOOP, SERIALIZATION, WAIT):
+            assert breakdown[category] == pytest.approx(0.1, abs=0.05)
+        assert profiler.samples > 0
+        assert "test_profiling:busy" in profiler.collapsed()
+
+    async def test_db_wait(self) -> None:
+        """Проверяем учёт ожидания запроса к БД"""
+        engine = create_async_engine("sqlite+aiosqlite://")
+
+        async def handler() -> None:
+            async with engine.connect() as conn:
+                await conn.execute(SLOW_QUERY)
+
+        try:
+            profiler = await profile(handler)
+        finally:
+            await engine.dispose()
+
+        breakdown = profiler.breakdown()
+        assert max(breakdown, key=breakdown.get) == DB_WAIT
+
+    async def test_collapsed_format(self) -> None:
+        """Проверяем формат collapsed stacks: стек и вес в микросекундах"""
+
+        async def handler() -> None:
+            busy(0.02)
+
+        profiler = await profile(handler)
+        for line in profiler.collapsed().splitlines():
+            stack, weight = line.rsplit(" ", 1)
+            assert stack.split(";")[0] in profiler.breakdown()
+            assert int(weight) >= 0
+
+
+@pytest.mark.unit
+class TestProfilingMiddleware:
+    async def request(
+        self, store: ProfileStore, headers: dict[str, str], sample_rate: float = 0.0
+    ) -> dict:
+        app = FastAPI()
+
+        @app.get("/work")
+        async def work() -> dict[str, bool]:
+            busy(0.01)
+            return {"ok": True}
+
+        async def authorize(token: str) -> bool:
+            return token == "superuser"
+
+        middleware = ProfilingMiddleware(
+            app, store, authorize, sample_rate=sample_rate, interval=0.001
+        )
+        transport = ASGITransport(middleware)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/work", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        return dict(response.headers)
+
+    async def test_superuser_header(self, tmp_path: Path) -> None:
+        """Проверяем профилирование по X-Profile с токеном суперпользователя"""
+        store = ProfileStore(tmp_path)
+
+        headers = await self.request(
+            store, {"X-Profile": "1", "Authorization": "Bearer superuser"}
+        )
+
+        report = store.load(headers["x-profile-id"])
+        assert report["path"] == "/work"
+        assert report["status"] == 200
+        assert report["breakdown"][EVENT_LOOP] > 0
+
+    @pytest.mark.parametrize(
+        "headers",
+        ({"X-Profile": "1", "Authorization": "Bearer user"}, {"X-Profile": "1"}, {}),
+    )
+    async def test_not_profiled(self, tmp_path: Path, headers: dict) -> None:
+        """Проверяем, что без прав суперпользователя запрос не профилируется"""
+        store = ProfileStore(tmp_path)
+
+        response_headers = await self.request(store, headers)
+
+        assert "x-profile-id" not in response_headers
+        assert store.list() == []
+
+    async def test_sampling(self, tmp_path: Path) -> None:
+        """Проверяем профилирование случайной выборки запросов"""
+        store = ProfileStore(tmp_path)
+
+        headers = await self.request(store, {}, sample_rate=1.0)
+
+        assert store.load(headers["x-profile-id"]) is not None
+
+    async def test_profile_id_not_from_client(self, tmp_path: Path) -> None:
+        """Проверяем, что X-Request-ID клиента не становится именем отчёта"""
+        store = ProfileStore(tmp_path)
+        app = FastAPI()
+
+        @app.get("/work")
+        async def work() -> dict[str, bool]:
+            return {"ok": True}
+
+        middleware = RequestIdMiddleware(
+            ProfilingMiddleware(app, store, sample_rate=1.0, interval=0.001)
+        )
+        transport = ASGITransport(middleware)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/work", headers={"X-Request-ID": "victim"})
+
+        assert response.headers["x-request-id"] == "victim"
+        assert response.headers["x-profile-id"] != "victim"
+        assert store.load("victim") is None
+
+    async def test_concurrent_requests_limited(self, tmp_path: Path) -> None:
+        """Проверяем, что ожидание авторизации не позволяет превысить max_active"""
+        store = ProfileStore(tmp_path)
+        app = FastAPI()
+
+        @app.get("/work")
+        async def work() -> dict[str, bool]:
+            return {"ok": True}
+
+        async def authorize(token: str) -> bool:
+            # Запрос в БД: остальные запросы успевают дойти до проверки лимита
+            await asyncio.sleep(0.01)
+            return True
+
+        middleware = ProfilingMiddleware(
+            app, store, authorize, interval=0.001, max_active=1
+        )
+        headers = {"X-Profile": "1", "Authorization": "Bearer superuser"}
+        transport = ASGITransport(middleware)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(
+                *(client.get("/work", headers=headers) for _ in range(5))
+            )
+
+        assert sum("x-profile-id" in r.headers for r in responses) == 1
+        assert middleware.active == 0
+
+    def test_store_keeps_latest(self, tmp_path: Path) -> None:
+        """Проверяем удаление старых отчётов сверх keep"""
+        store = ProfileStore(tmp_path, keep=2)
+        for i in range(3):
+            store.save(f"p{i}", {"id": i})
+            time.sleep(0.01)
+
+        assert [path.stem for path in store.list()] == ["p2", "p1"]
+        assert store.load("p0") is None
+
+
+@pytest.mark.unit
+class TestProfilingAPI:
+    async def test_get_reports(
+        self,
+        superuser_client: AsyncClient,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Проверяем чтение отчётов суперпользователем"""
+        store = ProfileStore(tmp_path)
+        store.save("abc", {"id": "abc", "collapsed": "wait;main 10\n"})
+        monkeypatch.setattr("src.api.profiling.get_profile_store", lambda: store)
+
+        listing = await superuser_client.get("/profiling/")
+        report = await superuser_client.get("/profiling/abc")
+        collapsed = await superuser_client.get("/profiling/abc/collapsed")
+        missing = await superuser_client.get("/profiling/missing")
+
+        assert listing.json() == [{"id": "abc"}]
+        assert report.json()["id"] == "abc"
+        assert collapsed.text == "wait;main 10\n"
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
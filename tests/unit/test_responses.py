@@ -0,0 +1,63 @@
+from datetime import UTC, date, datetime, timedelta, timezone
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.api.posts import POSTS_ADAPTER
+from src.api.responses import FastJSONResponse, ModelResponse
+from src.main import app
+from src.models.posts import Post
+from src.models.users import User
+
+
+def make_posts() -> list[Post]:
+    author = User(
+        id=1,
+        email="Author@EXAMPLE.com",
+        first_name="Иван",
+        last_name=None,
+        birth_date=date(1990, 5, 17),
+        is_active=True,
+        is_superuser=False,
+        is_verified=True,
+    )
+    pub_dates = (
+        datetime(2024, 1, 1, 12, 30, tzinfo=UTC),
+        datetime(2024, 1, 1, 12, 30, 0, 123456, tzinfo=timezone(timedelta(hours=3))),
+        datetime(2024, 1, 1, 12, 30),
+    )
+    return [
+        Post(
+            id=i,
+            title="Заголовок «1»",
+            content='Текст\n"escape" \\   😀',
+            pub_date=pub_date,
+            author=author,
+        )
+        for i, pub_date in enumerate(pub_dates)
+    ]
+
+
+@pytest.mark.unit
+class TestResponses:
+    def test_fast_json_matches_json_response(self) -> None:
+        """Проверяем, что FastJSONResponse и JSONResponse дают одинаковые байты"""
+        content = POSTS_ADAPTER.dump_python(
+            POSTS_ADAPTER.validate_python(make_posts(), from_attributes=True),
+            mode="json",
+        )
+        assert FastJSONResponse(content).body == JSONResponse(content).body
+
+    def test_model_response_matches_response_model(self) -> None:
+        """Проверяем, что ModelResponse совпадает с сериализацией response_model"""
+        posts = make_posts()
+        value = POSTS_ADAPTER.validate_python(posts, from_attributes=True)
+        expected = JSONResponse(jsonable_encoder(value)).body
+        assert ModelResponse(POSTS_ADAPTER, posts).body == expected
+        assert b'"email":"Author@example.com"' in expected
+
+    def test_default_response_class(self) -> None:
+        """Проверяем, что маршруты API используют FastJSONResponse"""
+        route = next(r for r in app.routes if getattr(r, "path", "") == "/users/me")
+        assert route.response_class is FastJSONResponse
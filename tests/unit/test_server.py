@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pytest
+
+from src.server import pool_sizes, prepare_metrics_dir
+
+
+@pytest.mark.unit
+class TestServer:
+    @pytest.mark.parametrize(
+        "workers, max_connections, expected",
+        (
+            (1, 90, (5, 10)),
+            (6, 90, (5, 10)),
+            (16, 90, (1, 4)),
+            (4, 20, (1, 4)),
+            (10, 10, (1, 0)),
+        ),
+    )
+    def test_pool_sizes(
+        self, workers: int, max_connections: int, expected: tuple[int, int]
+    ) -> None:
+        """Проверяем, что пулы всех воркеров укладываются в лимит соединений"""
+        pool_size, max_overflow = pool_sizes(workers, max_connections)
+        assert (pool_size, max_overflow) == expected
+        assert workers * (pool_size + max_overflow) <= max_connections
+
+    def test_not_enough_connections(self) -> None:
+        """Проверяем ошибку, если соединений меньше, чем воркеров"""
+        with pytest.raises(ValueError):
+            pool_sizes(16, 8)
+
+    def test_prepare_metrics_dir(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Проверяем удаление снимков метрик прошлого запуска"""
+        monkeypatch.setenv("METRICS_MULTIPROC_DIR", str(tmp_path))
+        (tmp_path / "123.json").write_text("{}")
+
+        prepare_metrics_dir()
+
+        assert list(tmp_path.iterdir()) == []
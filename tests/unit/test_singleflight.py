@@ -0,0 +1,173 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from datetime import UTC, date, datetime
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from src.core.singleflight import SingleFlight, singleflight_requests
+from src.db.database import get_db
+from src.main import app
+from src.managers.post_manager import PostManager
+from src.models.posts import Post
+from src.models.users import User
+
+
+def make_post(id: int) -> Post:
+    author = User(
+        id=1,
+        email="author@example.com",
+        first_name="Иван",
+        last_name=None,
+        birth_date=date(1990, 5, 17),
+        is_active=True,
+        is_superuser=False,
+        is_verified=True,
+    )
+    return Post(
+        id=id,
+        title="Заголовок",
+        content="Текст",
+        pub_date=datetime(2024, 1, 1, tzinfo=UTC),
+        author=author,
+    )
+
+
+@pytest_asyncio.fixture
+async def posts_client() -> AsyncGenerator[AsyncClient, None]:
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://test"
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    async def test_concurrent_calls_share_fetch(self) -> None:
+        """Проверяем, что одновременные вызовы выполняют fetch один раз"""
+        flight = SingleFlight("test_share")
+        calls = 0
+
+        async def fetch() -> bytes:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return b"result"
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+        assert results == [b"result"] * 5
+        assert calls == 1
+        assert flight.in_flight == 0
+        assert singleflight_requests.get("test_share", "leader") == 1
+        assert singleflight_requests.get("test_share", "coalesced") == 4
+
+    async def test_sequential_calls_not_cached(self) -> None:
+        """Проверяем, что результат не переживает завершение запроса"""
+        flight = SingleFlight("test_sequential")
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("key", fetch) == 1
+        assert await flight.do("key", fetch) == 2
+
+    async def test_error_shared(self) -> None:
+        """Проверяем, что ошибку fetch получают все ожидающие"""
+        flight = SingleFlight("test_error")
+
+        async def fetch() -> None:
+            await asyncio.sleep(0.01)
+            raise ValueError("db down")
+
+        results = await asyncio.gather(
+            *(flight.do("key", fetch) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.in_flight == 0
+
+    async def test_leader_cancelled(self) -> None:
+        """Проверяем, что после отмены первого запроса ожидающий выполняет fetch"""
+        flight = SingleFlight("test_cancel")
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        leader = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == 2
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    async def test_follower_cancelled(self) -> None:
+        """Проверяем, что отмена ожидающего не прерывает общий fetch"""
+        flight = SingleFlight("test_follower")
+
+        async def fetch() -> str:
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        leader = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        follower.cancel()
+
+        assert await leader == "ok"
+
+
+@pytest.mark.unit
+class TestPostsCoalescing:
+    async def test_concurrent_reads_query_once(
+        self, posts_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Проверяем, что одновременные GET /posts/{id} делают один запрос в БД"""
+        calls = 0
+
+        async def get_post(self, id: int) -> Post:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return make_post(id)
+
+        monkeypatch.setattr(PostManager, "get_post", get_post)
+
+        responses = await asyncio.gather(
+            *(posts_client.get("/posts/7") for _ in range(10))
+        )
+
+        assert calls == 1
+        assert {r.status_code for r in responses} == {status.HTTP_200_OK}
+        assert {r.content for r in responses} == {responses[0].content}
+        assert responses[0].json()["id"] == 7
+
+    async def test_missing_post(
+        self, posts_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Проверяем 404 для несуществующего поста"""
+
+        async def get_post(self, id: int) -> None:
+            return None
+
+        monkeypatch.setattr(PostManager, "get_post", get_post)
+
+        response = await posts_client.get("/posts/404")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
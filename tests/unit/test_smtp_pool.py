@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from aiosmtplib import SMTPConnectError
+from tests.utils.smtp_server import (
+    free_port,
+    local_smtp_server,
+    make_message,
+    smtp_factory,
+)
+
+from src.auth.smtp import SMTPPool
+
+
+@pytest.mark.unit
+class TestSMTPPool:
+    async def test_connection_reused(self) -> None:
+        """Проверяем, что письма идут через одно соединение"""
+        with local_smtp_server() as (handler, port):
+            pool = SMTPPool(lambda: smtp_factory(port), max_size=2, keepalive=0)
+            for i in range(5):
+                await pool.send(make_message(f"user{i}@example.com"))
+            await pool.close()
+        assert len(handler.messages) == 5
+        assert handler.sessions == 1
+
+    async def test_concurrency_bounded(self) -> None:
+        """Проверяем ограничение числа одновременных соединений"""
+        with local_smtp_server() as (handler, port):
+            pool = SMTPPool(lambda: smtp_factory(port), max_size=2)
+            await asyncio.gather(
+                *(pool.send(make_message(f"user{i}@example.com")) for i in range(20))
+            )
+            assert pool.idle <= 2
+            await pool.close()
+        assert len(handler.messages) == 20
+        assert handler.sessions <= 2
+
+    async def test_reconnect_after_disconnect(self) -> None:
+        """Проверяем переподключение, если соединение в пуле оборвалось"""
+        with local_smtp_server() as (handler, port):
+            pool = SMTPPool(lambda: smtp_factory(port), max_size=1)
+            await pool.send(make_message("first@example.com"))
+            async with pool.connection() as client:
+                client.close()
+            await pool.send(make_message("second@example.com"))
+            await pool.close()
+        assert len(handler.messages) == 2
+        assert handler.sessions == 2
+
+    async def test_connect_retries_with_backoff(self) -> None:
+        """Проверяем повторные попытки подключения к недоступному серверу"""
+        attempts = 0
+        port = free_port()
+
+        def factory():
+            nonlocal attempts
+            attempts += 1
+            return smtp_factory(port)
+
+        pool = SMTPPool(factory, connect_attempts=3, backoff=0.01)
+        with pytest.raises(SMTPConnectError):
+            await pool.send(make_message("user@example.com"))
+        assert attempts == 3
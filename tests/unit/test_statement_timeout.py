@@ -0,0 +1,159 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.api.dependencies import StatementTimeout, list_query_timeout
+from src.api.posts import posts_flight
+from src.db.database import get_db
+from src.db.timeouts import (
+    enable_statement_timeouts,
+    interrupt_queries,
+    is_query_timeout,
+    query_timeouts,
+    set_query_deadline,
+)
+from src.main import app
+from src.models.base import Base
+
+# Рекурсивный CTE, который считает до 10^8 — десятки секунд без прерывания
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+    "WHERE x < 100000000) SELECT count(*) FROM c"
+)
+
+
+@pytest_asyncio.fixture
+async def sqlite_engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+    enable_statement_timeouts(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.unit
+class TestStatementTimeout:
+    async def test_slow_query_interrupted(self, sqlite_engine: AsyncEngine) -> None:
+        """Проверяем прерывание запроса SQLite после дедлайна"""
+        async with async_sessionmaker(sqlite_engine)() as session:
+            set_query_deadline(session, 0.05)
+            started = time.monotonic()
+            with pytest.raises(DBAPIError) as exc_info:
+                await session.execute(SLOW_QUERY)
+        assert is_query_timeout(exc_info.value)
+        assert time.monotonic() - started < 2
+
+    async def test_deadline_released_with_connection(
+        self, sqlite_engine: AsyncEngine
+    ) -> None:
+        """Проверяем, что истёкший дедлайн не переходит к следующей сессии"""
+        session_factory = async_sessionmaker(sqlite_engine)
+        async with session_factory() as session:
+            set_query_deadline(session, 0.0)
+            with pytest.raises(DBAPIError):
+                await session.execute(SLOW_QUERY)
+        async with session_factory() as session:
+            result = await session.execute(text("SELECT count(*) FROM (VALUES (1))"))
+            assert result.scalar() == 1
+
+    async def test_interrupt_from_another_task(
+        self, sqlite_engine: AsyncEngine
+    ) -> None:
+        """Проверяем прерывание выполняющегося запроса (отключение клиента)"""
+        async with async_sessionmaker(sqlite_engine)() as session:
+            set_query_deadline(session, 60)
+            query = asyncio.create_task(session.execute(SLOW_QUERY))
+            await asyncio.sleep(0.1)
+            await interrupt_queries(session)
+            with pytest.raises(DBAPIError) as exc_info:
+                await query
+        assert is_query_timeout(exc_info.value)
+
+    async def test_coalesced_reads_survive_leader_disconnect(
+        self, sqlite_engine: AsyncEngine
+    ) -> None:
+        """Проверяем, что ожидающие повторяют выборку после отключения первого"""
+        session_factory = async_sessionmaker(sqlite_engine)
+        async with session_factory() as leader_db, session_factory() as follower_db:
+            set_query_deadline(leader_db, 60)
+            set_query_deadline(follower_db, 60)
+
+            async def leader_fetch() -> bytes:
+                await leader_db.execute(SLOW_QUERY)
+                return b"leader"
+
+            async def follower_fetch() -> bytes:
+                result = await follower_db.execute(text("SELECT 'follower'"))
+                return result.scalar().encode()
+
+            key = ("list", "disconnect@example.com")
+            leader = asyncio.create_task(posts_flight.do(key, leader_fetch))
+            await asyncio.sleep(0.05)
+            followers = [
+                asyncio.create_task(posts_flight.do(key, follower_fetch))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0.05)
+            # То же, что делает watch_disconnect первого запроса
+            await interrupt_queries(leader_db)
+
+            assert await asyncio.gather(*followers) == [b"follower"] * 3
+            with pytest.raises(DBAPIError):
+                await leader
+        assert posts_flight.in_flight == 0
+
+    async def test_interrupt_error_logged(
+        self, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Проверяем, что ошибка прерывания запросов пишется в лог"""
+
+        async def interrupt_queries(session) -> None:
+            raise ConnectionError("pg_cancel_backend failed")
+
+        class DisconnectedRequest:
+            async def is_disconnected(self) -> bool:
+                return True
+
+        monkeypatch.setattr("src.api.dependencies.interrupt_queries", interrupt_queries)
+        session = SimpleNamespace(info={})
+        dependency = StatementTimeout(5.0)(DisconnectedRequest(), session)
+        await anext(dependency)
+        await asyncio.sleep(0.01)
+        await dependency.aclose()
+
+        assert "Interrupting queries on disconnect failed" in caplog.text
+        assert session.info == {}
+
+    async def test_timeout_returns_503(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Проверяем ответ 503 и счётчик таймаутов для списка постов"""
+        # Обработчик прогресса на каждой инструкции: прерывается даже пустая выборка
+        monkeypatch.setattr("src.db.timeouts.SQLITE_PROGRESS_STEPS", 1)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+        enable_statement_timeouts(engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine)() as session:
+            app.dependency_overrides[get_db] = lambda: session
+            app.dependency_overrides[list_query_timeout] = StatementTimeout(0.0)
+            before = query_timeouts.get("/posts/")
+            try:
+                async with AsyncClient(
+                    transport=ASGITransport(app), base_url="http://test"
+                ) as client:
+                    response = await client.get("/posts/")
+            finally:
+                app.dependency_overrides.clear()
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert query_timeouts.get("/posts/") == before + 1
+        await engine.dispose()
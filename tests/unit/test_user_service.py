@@ -1,12 +1,23 @@
+from dataclasses import asdict
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from tests.utils.fake_user import fake_user, password
 
 from src.dtos.users import UserCreateDTO, UserReadDTO, UserUpdateDTO
 from src.exceptions.users import UserAlreadyExists, UserNotExists
-from src.services.user_service import UserService
+from src.init_db import init_db
+from src.models.posts import Post
+from src.models.users import User
+from src.repositories.deletion_repo import UserDeletionRepository
+from src.repositories.user_repo import UserRepository
+from src.services.user_service import UserService, resume_user_deletions
 
 
 @pytest.mark.unit
@@ -36,25 +47,29 @@ class TestUserService:
     async def test_get_users(self) -> None:
         """Проверяем получение списка пользователей"""
         users = [fake_user()]
+        rows = [
+            SimpleNamespace(_mapping=asdict(UserService.to_dto(user)))
+            for user in users
+        ]
         mock_repo = AsyncMock()
         mock_session = AsyncMock()
-        mock_repo.list.return_value = users
+        mock_repo.list_read.return_value = rows
         service = UserService(mock_session, mock_repo)
         result = await service.get_users()
         assert len(result) == len(users)
         assert result[0].id == users[0].id
-        mock_repo.list.assert_called_once()
+        mock_repo.list_read.assert_called_once()
         assert isinstance(result[0], UserReadDTO)
 
     async def test_get_users_return_empty_list(self) -> None:
         """Проверяем получение пустого списка пользователей"""
         mock_repo = AsyncMock()
         mock_session = AsyncMock()
-        mock_repo.list.return_value = []
+        mock_repo.list_read.return_value = []
         service = UserService(mock_session, mock_repo)
         result = await service.get_users()
         assert len(result) == 0
-        mock_repo.list.assert_called_once()
+        mock_repo.list_read.assert_called_once()
 
     async def test_create_user_success(self) -> None:
         """Проверяем создание нового пользователя"""
@@ -128,16 +143,48 @@ class TestUserService:
             await service.update_user(user.id, user_update_dto)
 
     async def test_delete_user_success(self) -> None:
-        """Проверяем удаление пользователя"""
+        """Проверяем, что удаление сразу деактивирует пользователя"""
         mock_repo = AsyncMock()
         mock_session = AsyncMock()
         user = fake_user()
+        mock_deletions = AsyncMock()
         mock_repo.exists.return_value = True
-        mock_repo.delete.return_value = None
-        service = UserService(mock_session, mock_repo)
+        service = UserService(mock_session, mock_repo, mock_deletions)
         await service.delete_user(user.id)
         mock_repo.exists.assert_called_once_with(id=user.id)
+        mock_repo.update.assert_called_once_with(user.id, is_active=False)
+        mock_repo.delete.assert_not_called()
+        assert mock_deletions.request.call_args.args[0] == user.id
+
+    async def test_purge_user(self) -> None:
+        """Проверяем удаление постов порциями и затем самого пользователя"""
+        mock_repo = AsyncMock()
+        mock_session = AsyncMock()
+        user = fake_user()
+        mock_deletions = AsyncMock()
+        mock_deletions.claim.return_value = True
+        mock_deletions.get.return_value = SimpleNamespace(deleted_posts=0)
+        mock_repo.count_posts.return_value = 5
+        mock_repo.delete_posts_chunk.side_effect = [2, 2, 1]
+        service = UserService(mock_session, mock_repo, mock_deletions)
+        await service.purge_user(user.id, chunk_size=2)
+        assert mock_repo.delete_posts_chunk.call_count == 3
+        mock_repo.delete_posts_chunk.assert_called_with(user.id, 2)
         mock_repo.delete.assert_called_once_with(user.id)
+        updates = [c.kwargs for c in mock_deletions.update.call_args_list]
+        assert updates[0] == {"total_posts": 5}
+        assert [u["deleted_posts"] for u in updates[1:4]] == [2, 4, 5]
+        assert updates[-1]["status"] == "finished"
+
+    async def test_purge_user_already_running(self) -> None:
+        """Проверяем, что удаление, выполняемое другим процессом, не дублируется"""
+        mock_repo = AsyncMock()
+        mock_deletions = AsyncMock()
+        mock_deletions.claim.return_value = False
+        service = UserService(AsyncMock(), mock_repo, mock_deletions)
+        await service.purge_user(1)
+        mock_repo.delete_posts_chunk.assert_not_called()
+        mock_repo.delete.assert_not_called()
 
     async def test_delete_user_not_exists(self) -> None:
         """Проверяем ошибку при удалении пользователя, которого нет в базе"""
@@ -149,3 +196,40 @@ class TestUserService:
         with pytest.raises(UserNotExists):
             await service.delete_user(user.id)
         mock_repo.exists.assert_called_once_with(id=user.id)
+
+
+@pytest.mark.unit
+class TestUserDeletionRecovery:
+    async def test_resume_after_crash(self, tmp_path: Path) -> None:
+        """Проверяем, что удаление, прерванное падением процесса, продолжается"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+        await init_db(engine)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as session:
+            user = User(email="gone@example.com", hashed_password="x")
+            user.posts = [Post(title=f"{i}", content="текст") for i in range(7)]
+            session.add(user)
+            await session.commit()
+            await UserService(session, UserRepository(session)).delete_user(user.id)
+            # Процесс удалил 3 поста и упал: отметка жизни устарела
+            await UserRepository(session).delete_posts_chunk(user.id, 3)
+            await UserDeletionRepository(session).update(
+                user.id,
+                status="running",
+                deleted_posts=3,
+                updated_at=datetime.now(UTC) - timedelta(hours=1),
+            )
+            await session.commit()
+
+        assert await resume_user_deletions(session_factory) == [user.id]
+        assert await resume_user_deletions(session_factory) == []
+
+        async with session_factory() as session:
+            deletion = await UserService(
+                session, UserRepository(session)
+            ).get_deletion(user.id)
+            assert await session.get(User, user.id) is None
+            assert await session.scalar(select(func.count()).select_from(Post)) == 0
+        assert deletion.finished
+        assert (deletion.total_posts, deletion.deleted_posts) == (7, 7)
+        await engine.dispose()
@@ -4,9 +4,14 @@ from unittest.mock import AsyncMock
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from pydantic import TypeAdapter
 from tests.utils.fake_user import fake_user
 
+from src.api.responses import DTOResponse
+from src.api.users import USER_ADAPTER, USER_EXCLUDE, USERS_ADAPTER, USERS_EXCLUDE
 from src.exceptions.users import UserNotExists
+from src.schemas.users import UserRead
+from src.services.user_service import UserService
 
 
 @pytest.mark.unit
@@ -17,7 +22,7 @@ class TestInitUserAPI:
         self, superuser_client: AsyncClient, mock_user_service: AsyncMock
     ) -> None:
         """Проверяем получение списка пользователей"""
-        fake_users = [fake_user()]
+        fake_users = [UserService.to_dto(fake_user())]
         mock_user_service.get_users.return_value = fake_users
 
         response = await superuser_client.get("/users/")
@@ -44,6 +49,21 @@ class TestInitUserAPI:
         assert response.status_code == status.HTTP_200_OK
         assert response.json()["email"] == fake_user().email
 
+    def test_read_response_matches_schema(self) -> None:
+        """Проверяем, что ответ из DTO совпадает с сериализацией UserRead"""
+        users = [UserService.to_dto(fake_user()), UserService.to_dto(fake_user())]
+        users[1].birth_date = users[1].last_name = None
+
+        for user in users:
+            expected = UserRead.model_validate(user, from_attributes=True)
+            response = DTOResponse(USER_ADAPTER, user, exclude=USER_EXCLUDE)
+            assert response.body == expected.model_dump_json().encode()
+        assert DTOResponse(
+            USERS_ADAPTER, users, exclude=USERS_EXCLUDE
+        ).body == TypeAdapter(list[UserRead]).dump_json(
+            TypeAdapter(list[UserRead]).validate_python(users, from_attributes=True)
+        )
+
     @pytest.mark.parametrize(
         "upd_field, value",
         (
@@ -100,6 +120,7 @@ class TestInitUserAPI:
         response = await superuser_client.delete(f"/users/{user_id}")
         assert response.status_code == status.HTTP_204_NO_CONTENT
         mock_user_service.delete_user.assert_called_once_with(user_id)
+        mock_user_service.purge_user.assert_called_once_with(user_id)
 
     async def test_delete_not_exists(
         self, superuser_client: AsyncClient, mock_user_service: AsyncMock
@@ -109,12 +130,13 @@ class TestInitUserAPI:
         response = await superuser_client.delete("/users/1")
         assert response.status_code == status.HTTP_404_NOT_FOUND
         mock_user_service.delete_user.assert_called_once_with(1)
+        mock_user_service.purge_user.assert_not_called()
 
     async def test_get_user(
         self, superuser_client: AsyncClient, mock_user_service: AsyncMock
     ) -> None:
         """Проверяем получение одного пользователя по его id"""
-        user = fake_user()
+        user = UserService.to_dto(fake_user())
         mock_user_service.get_user.return_value = user
         response = await superuser_client.get(f"/users/{user.id}")
         assert response.status_code == status.HTTP_200_OK
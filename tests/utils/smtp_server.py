@@ -0,0 +1,56 @@
+import socket
+from collections.abc import Iterator
+from contextlib import contextmanager
+from email.mime.text import MIMEText
+
+import aiosmtplib
+from aiosmtpd.controller import Controller
+
+
+class SinkHandler:
+    """Принимает письма и считает SMTP-сессии (по EHLO)."""
+
+    def __init__(self) -> None:
+        self.sessions = 0
+        self.messages: list[bytes] = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        self.messages.append(envelope.content)
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_smtp_server(
+    handler: SinkHandler | None = None,
+) -> Iterator[tuple[SinkHandler, int]]:
+    handler = handler or SinkHandler()
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        yield handler, port
+    finally:
+        controller.stop()
+
+
+def smtp_factory(port: int) -> aiosmtplib.SMTP:
+    return aiosmtplib.SMTP(hostname="127.0.0.1", port=port, start_tls=False)
+
+
+def make_message(to_email: str) -> MIMEText:
+    message = MIMEText("<p>test</p>", "html", "utf-8")
+    message["From"] = "noreply@example.com"
+    message["To"] = to_email
+    message["Subject"] = "test"
+    return message